@@ -0,0 +1,224 @@
+"""复习事件分析：记忆保持率曲线、最难的单词、每个单词的作答耗时
+
+数据来自 events.py 写入的复习事件日志。安装了NumPy时整个日志一次读入、
+按列向量化统计（百万条事件在1秒内完成），否则逐条读取的纯Python实现。
+
+每次复习的结果以第一次作答为准：第一次就答对算"记住"，
+答错或直接查看答案算"忘记"（播放语音不算作答）。
+
+用法：
+    python analytics.py [日志文件]
+"""
+
+from events import CORRECT, HINT, NO_ANSWER, NUMPY_FIELDS, REPLAY, WRONG, \
+    event_count, iter_events, read_vocab
+
+# 记忆保持率曲线按复习间隔（天）分组的区间起点
+RETENTION_BINS = (0, 1, 2, 4, 7, 15, 30, 60, 90)
+
+
+def load_events(path, use_numpy=True):
+    """读取事件日志，返回 (各列, 词表)；安装了NumPy时各列为数组，否则为列表"""
+    vocab = read_vocab(path + '.vocab')
+    np = _numpy() if use_numpy else None
+    if np is not None:
+        count = event_count(path)
+        data = np.fromfile(path, dtype=np.dtype(NUMPY_FIELDS), count=count) if count else \
+            np.zeros(0, dtype=np.dtype(NUMPY_FIELDS))
+        return {name: data[name] for name, _ in NUMPY_FIELDS if not name.startswith('_')}, vocab
+
+    names = [name for name, _ in NUMPY_FIELDS if not name.startswith('_')]
+    rows = list(iter_events(path))
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return {name: list(column) for name, column in zip(names, columns)}, vocab
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
+
+
+def _is_numpy(columns):
+    return not isinstance(columns['kind'], list)
+
+
+def retention_curve(columns, bins=RETENTION_BINS):
+    """按复习间隔分组的记忆保持率
+
+    返回 [(间隔起点, 间隔终点或None, 复习次数, 记住次数)]
+    """
+    if _is_numpy(columns):
+        np = _numpy()
+        first = (columns['attempt'] == 0) & (columns['kind'] != REPLAY)
+        group = np.searchsorted(np.asarray(bins), columns['interval'][first], side='right') - 1
+        recalled = columns['kind'][first] == CORRECT
+        reviews = np.bincount(group, minlength=len(bins)).tolist()
+        hits = np.bincount(group[recalled], minlength=len(bins)).tolist()
+    else:
+        reviews, hits = [0] * len(bins), [0] * len(bins)
+        for kind, attempt, interval in zip(columns['kind'], columns['attempt'], columns['interval']):
+            if attempt or kind == REPLAY:
+                continue
+            group = next(i for i in range(len(bins) - 1, -1, -1) if bins[i] <= interval)
+            reviews[group] += 1
+            hits[group] += kind == CORRECT
+
+    ends = list(bins[1:]) + [None]
+    return [(start, end, reviews[i], hits[i]) for i, (start, end) in enumerate(zip(bins, ends))]
+
+
+def _per_word_counts(columns, size):
+    """每个单词的 复习次数、忘记次数、答错次数、查看答案次数、作答总耗时"""
+    if _is_numpy(columns):
+        np = _numpy()
+        word, kind = columns['word'], columns['kind']
+        first = (columns['attempt'] == 0) & (kind != REPLAY)
+        answered = kind != REPLAY
+        counts = [
+            np.bincount(word[first], minlength=size),
+            np.bincount(word[first & (kind != CORRECT)], minlength=size),
+            np.bincount(word[kind == WRONG], minlength=size),
+            np.bincount(word[kind == HINT], minlength=size),
+            np.bincount(word[answered], weights=columns['latency_ms'][answered], minlength=size),
+        ]
+        return [c.tolist() for c in counts]
+
+    counts = [[0] * size for _ in range(5)]
+    reviews, lapses, wrong, hints, latency = counts
+    for word, kind, attempt, ms in zip(columns['word'], columns['kind'], columns['attempt'],
+                                       columns['latency_ms']):
+        if kind == REPLAY:
+            continue
+        latency[word] += ms
+        if attempt == 0:
+            reviews[word] += 1
+            lapses[word] += kind != CORRECT
+        if kind == WRONG:
+            wrong[word] += 1
+        elif kind == HINT:
+            hints[word] += 1
+    return counts
+
+
+def _common_mistake(columns, word_id, vocab):
+    """某个单词最常见的错误拼写"""
+    if _is_numpy(columns):
+        np = _numpy()
+        answers = columns['answer'][(columns['word'] == word_id) & (columns['kind'] == WRONG)]
+        answers = answers[answers != NO_ANSWER]
+        if not answers.size:
+            return None
+        values, counts = np.unique(answers, return_counts=True)
+        return vocab[int(values[counts.argmax()])]
+
+    tally = {}
+    for word, kind, answer in zip(columns['word'], columns['kind'], columns['answer']):
+        if word == word_id and kind == WRONG and answer != NO_ANSWER:
+            tally[answer] = tally.get(answer, 0) + 1
+    return vocab[max(tally, key=tally.get)] if tally else None
+
+
+def hardest_words(columns, vocab, limit=20, min_reviews=3):
+    """忘记比例最高的单词（至少复习过min_reviews次）
+
+    返回 [{'word', 'reviews', 'lapses', 'lapse_rate', 'wrong', 'hints', 'mistake'}]，
+    mistake为最常见的错误拼写
+    """
+    reviews, lapses, wrong, hints, _ = _per_word_counts(columns, len(vocab))
+    candidates = [i for i in range(len(vocab)) if reviews[i] >= min_reviews]
+    candidates.sort(key=lambda i: (-lapses[i] / reviews[i], -reviews[i], vocab[i]))
+    return [{
+        'word': vocab[i],
+        'reviews': reviews[i],
+        'lapses': lapses[i],
+        'lapse_rate': lapses[i] / reviews[i],
+        'wrong': wrong[i],
+        'hints': hints[i],
+        'mistake': _common_mistake(columns, i, vocab),
+    } for i in candidates[:limit]]
+
+
+def time_per_word(columns, vocab, limit=20):
+    """作答耗时：所有作答的中位数/95分位数，以及平均每次复习耗时最长的单词
+
+    返回 {'median_ms', 'p95_ms', 'first_key_median_ms', 'words': [{'word', 'reviews', 'avg_ms'}]}
+    """
+    kind = columns['kind']
+    if _is_numpy(columns):
+        np = _numpy()
+        answered = kind != REPLAY
+        latency = columns['latency_ms'][answered]
+        first_key = columns['first_key_ms'][answered]
+        if latency.size:
+            median, p95 = np.percentile(latency, [50, 95]).tolist()
+            first_key_median = float(np.median(first_key))
+        else:
+            median = p95 = first_key_median = 0.0
+    else:
+        latency = sorted(ms for k, ms in zip(kind, columns['latency_ms']) if k != REPLAY)
+        first_key = sorted(ms for k, ms in zip(kind, columns['first_key_ms']) if k != REPLAY)
+        median, p95 = _percentile(latency, 50), _percentile(latency, 95)
+        first_key_median = _percentile(first_key, 50)
+
+    reviews, _, _, _, total_ms = _per_word_counts(columns, len(vocab))
+    words = [i for i in range(len(vocab)) if reviews[i]]
+    words.sort(key=lambda i: (-total_ms[i] / reviews[i], vocab[i]))
+    return {
+        'median_ms': median,
+        'p95_ms': p95,
+        'first_key_median_ms': first_key_median,
+        'words': [{'word': vocab[i], 'reviews': reviews[i], 'avg_ms': total_ms[i] / reviews[i]}
+                  for i in words[:limit]],
+    }
+
+
+def _percentile(values, q):
+    """已排序列表的百分位数（线性插值，与numpy.percentile一致）"""
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def print_report(path, limit=20):
+    """打印分析报告"""
+    from prettytable import PrettyTable
+
+    columns, vocab = load_events(path)
+    print(f"📈 {path}: {len(columns['kind'])} 条复习事件")
+
+    curve = PrettyTable()
+    curve.title = "记忆保持率曲线"
+    curve.field_names = ["复习间隔", "复习次数", "记住", "保持率"]
+    for start, end, reviews, hits in retention_curve(columns):
+        if reviews:
+            label = f"{start}天+" if end is None else (f"{start}天" if end == start + 1 else f"{start}-{end - 1}天")
+            curve.add_row([label, reviews, hits, f"{hits / reviews:.1%}"])
+    print(curve)
+
+    hardest = PrettyTable()
+    hardest.title = "最难的单词"
+    hardest.field_names = ["单词", "复习次数", "忘记次数", "忘记比例", "答错", "查看答案", "常见错误拼写"]
+    for row in hardest_words(columns, vocab, limit):
+        hardest.add_row([row['word'], row['reviews'], row['lapses'], f"{row['lapse_rate']:.0%}",
+                         row['wrong'], row['hints'], row['mistake'] or '-'])
+    print(hardest)
+
+    timing = time_per_word(columns, vocab, limit)
+    slow = PrettyTable()
+    slow.title = (f"作答耗时：中位数 {timing['median_ms'] / 1000:.1f}秒，95分位 {timing['p95_ms'] / 1000:.1f}秒，"
+                  f"首次按键中位数 {timing['first_key_median_ms'] / 1000:.1f}秒")
+    slow.field_names = ["单词", "复习次数", "平均每次复习耗时"]
+    for row in timing['words']:
+        slow.add_row([row['word'], row['reviews'], f"{row['avg_ms'] / 1000:.1f}秒"])
+    print(slow)
+
+
+if __name__ == "__main__":
+    import sys
+    print_report(sys.argv[1] if len(sys.argv) > 1 else "review_events.bin")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""启动耗时基准：导入reciter、创建ReciterCLI的耗时，超出预算时返回非零退出码
+
+用法: python bench_startup.py [重复次数]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_BUDGET_MS = 60   # import reciter 的累计耗时预算（python -X importtime）
+STARTUP_BUDGET_MS = 10  # 导入后创建 ReciterCLI（显示菜单前）的耗时预算
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STARTUP_SNIPPET = (
+    "import time; t = time.perf_counter(); import reciter; t1 = time.perf_counter(); "
+    "cli = reciter.ReciterCLI(); t2 = time.perf_counter(); "
+    "print((t1 - t) * 1000, (t2 - t1) * 1000)"
+)
+
+
+def measure_import_ms():
+    """用 -X importtime 测量 import reciter 的累计耗时（毫秒）"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import reciter"],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == 'reciter':
+            return int(parts[1]) / 1000
+    raise RuntimeError("未找到 reciter 的导入耗时")
+
+
+def measure_construct_ms():
+    """在新进程中测量导入后创建ReciterCLI的耗时（毫秒）"""
+    result = subprocess.run([sys.executable, "-c", STARTUP_SNIPPET],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1].split()[1])
+
+
+def heavy_modules_loaded():
+    """检查启动后是否导入了应当延迟加载的重量级模块"""
+    snippet = ("import sys, reciter; reciter.ReciterCLI(); "
+               "print(','.join(m for m in ('prettytable', 'readchar', 'tencentcloud', 'nltk', "
+               "'gtts', 'playsound', 'concurrent.futures') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=HERE, capture_output=True, text=True, check=True)
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+    return [m for m in loaded.split(',') if m]
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    import_ms = statistics.median(measure_import_ms() for _ in range(repeat))
+    construct_ms = statistics.median(measure_construct_ms() for _ in range(repeat))
+    heavy = heavy_modules_loaded()
+
+    print(f"📊 import reciter: {import_ms:.1f}ms（预算 {IMPORT_BUDGET_MS}ms）")
+    print(f"📊 创建ReciterCLI: {construct_ms:.2f}ms（预算 {STARTUP_BUDGET_MS}ms）")
+    print(f"📊 启动时导入的重量级模块: {', '.join(heavy) or '无'}")
+
+    ok = import_ms <= IMPORT_BUDGET_MS and construct_ms <= STARTUP_BUDGET_MS and not heavy
+    print("✅ 启动耗时在预算内" if ok else "❌ 启动耗时超出预算")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""离线性能基准：用合成词库测量各主要操作的耗时，结果写入JSON便于版本间比较
+
+测量项（每个 存储后端 × 词库规模 各测一次，每项都从新建的WordReciter开始）：
+- construct_ms：创建WordReciter
+- load_ms / save_ms：_load_data / _save_data
+- today_list_ms：_get_today_review_list（含该路径需要的按需加载）
+- status_ms：show_status 显示第一页
+- daily_review_ms / per_review_ms：完整的每日复习，由脚本前端代替键盘作答
+- mastered_review_ms：复习一批已掌握词汇（含选择单词和写入）
+- import_words_per_s：把同样规模的CSV词表导入空的存储
+
+全程离线：语音使用静音后端，例句由本地生成，不读写用户的学习数据。
+
+用法:
+    python bench_suite.py [--sizes 1000,10000,100000,1000000] [--backends json,sqlite,binary]
+                          [--output bench_results.json] [--baseline 上次的结果.json]
+"""
+
+import argparse
+import builtins
+import contextlib
+import csv
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from reciter import Config, WordReciter
+from storage import open_storage
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+DEFAULT_BACKENDS = ('json', 'sqlite', 'binary')
+DUE_TODAY = 200          # 合成词库中今天到期的单词数（每日复习的规模）
+REVIEW_ACCURACY = 0.85   # 模拟作答的正确率
+REGRESSION_RATIO = 1.2   # 与基准相比变慢超过该比例时标记
+
+# 耗时类指标越小越好，其余（吞吐量）越大越好
+TIME_METRICS = ('construct_ms', 'load_ms', 'save_ms', 'today_list_ms', 'status_ms',
+                'daily_review_ms', 'per_review_ms', 'mastered_review_ms')
+THROUGHPUT_METRICS = ('import_words_per_s',)
+
+_SYLLABLES = ('ba', 'ce', 'di', 'fo', 'gu', 'ka', 'le', 'mi', 'no', 'pu', 'ra', 'se', 'ti', 'vo', 'zu')
+
+
+def synthetic_word(index):
+    """由序号生成唯一的、像单词的字符串"""
+    letters = []
+    while True:
+        index, rest = divmod(index, len(_SYLLABLES))
+        letters.append(_SYLLABLES[rest])
+        if not index:
+            break
+    return ''.join(letters) + 'x'
+
+
+def make_deck(size, today, seed=0, due_today=DUE_TODAY, mastered_ratio=0.3):
+    """生成合成词库，返回 (待复习单词, 已掌握单词) 的字典列表
+
+    待复习单词中有due_today个今天到期（部分已过期），其余分布在未来120天内。
+    """
+    rng = random.Random(seed)
+    mastered_count = int(size * mastered_ratio)
+    all_words, mastered_words = [], []
+    for index in range(size):
+        data = {
+            'english': synthetic_word(index),
+            'chinese': f"释义{index}",
+            'review_round': 0,
+        }
+        if index < mastered_count:
+            data.update(success_count=Config.MAX_SUCCESS_COUNT, review_count=rng.randint(8, 20),
+                        next_review_date=(today - timedelta(days=rng.randint(0, 365))).isoformat())
+            mastered_words.append(data)
+            continue
+        pending_index = index - mastered_count
+        offset = -rng.randint(0, 5) if pending_index < due_today else rng.randint(1, 120)
+        data.update(success_count=rng.randint(0, Config.MAX_SUCCESS_COUNT - 1),
+                    review_count=rng.randint(0, 10),
+                    next_review_date=(today + timedelta(days=offset)).isoformat())
+        all_words.append(data)
+    return all_words, mastered_words
+
+
+class FakeExamples:
+    """离线例句来源：按单词生成固定格式的例句"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, word):
+        self.calls += 1
+        return f"We practised the word {word.english} today._我们今天练习了{word.chinese}"
+
+
+class ScriptedFrontend:
+    """代替终端界面的复习前端：按设定的正确率输入正确答案或错误答案，不输出"""
+
+    def __init__(self, accuracy=REVIEW_ACCURACY, seed=0):
+        self.accuracy = accuracy
+        self.rng = random.Random(seed)
+        self.events = 0
+        self._correct = True
+
+    def show(self, event):
+        from session import Prompt
+        if isinstance(event, Prompt):
+            # 新单词：答对时输入单词，答错时三次都输入错误拼写
+            self._correct = self.rng.random() < self.accuracy
+        self.events += 1
+
+    async def answer(self, prompt):
+        return prompt.word.english if self._correct else prompt.word.english[::-1] + 'q'
+
+
+@contextlib.contextmanager
+def isolated_config(workdir, backend):
+    """把所有文件路径指向临时目录，并使用静音语音后端"""
+    overrides = {
+        'STORAGE_BACKEND': backend,
+        'DATA_FILE': os.path.join(workdir, 'learning_data.json'),
+        'SQLITE_FILE': os.path.join(workdir, 'learning_data.db'),
+        'BINARY_FILE': os.path.join(workdir, 'learning_data.bin'),
+        'EXAMPLE_DB': os.path.join(workdir, 'word_examples.json'),
+        'WORDNET_INDEX': os.path.join(workdir, 'wordnet_examples.db'),
+        'EXAMPLE_CACHE': os.path.join(workdir, 'example_cache.json'),
+        'EVENT_LOG': os.path.join(workdir, 'review_events.bin'),
+        'TTS_BACKEND': 'null',
+        'TTS_CACHE_DIR': os.path.join(workdir, 'tts_cache'),
+    }
+    saved = {name: getattr(Config, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(Config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+
+
+@contextlib.contextmanager
+def quiet():
+    """屏蔽输出，菜单式的input()直接返回（回车）"""
+    original_input = builtins.input
+    builtins.input = lambda prompt='': ''
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        builtins.input = original_input
+
+
+def new_reciter(today):
+    """在当前（已隔离的）配置下创建使用离线例句的WordReciter"""
+    instance = WordReciter()
+    instance.today = today
+    instance._get_example = FakeExamples()
+    return instance
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def _close(instance):
+    instance.storage.close()
+    if instance._tts is not None:
+        instance._tts.close()
+    if instance._event_log is not None:
+        instance._event_log.close()
+
+
+def _clear(workdir):
+    for name in os.listdir(workdir):
+        path = os.path.join(workdir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def _restore(pristine, workdir):
+    """用生成好的原始数据覆盖工作目录（每项测量前调用，复习会修改数据）"""
+    _clear(workdir)
+    for name in os.listdir(pristine):
+        shutil.copy(os.path.join(pristine, name), os.path.join(workdir, name))
+
+
+def bench_deck(backend, size, today, seed=0):
+    """对一个 存储后端 × 词库规模 运行全部测量，返回指标字典"""
+    all_words, mastered_words = make_deck(size, today, seed)
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        pristine, workdir = os.path.join(tmp, 'pristine'), os.path.join(tmp, 'work')
+        os.makedirs(pristine)
+        os.makedirs(workdir)
+        with isolated_config(pristine, backend):
+            storage = open_storage(backend, Config.DATA_FILE, Config.SQLITE_FILE, Config.BINARY_FILE)
+            storage.save_all(all_words, mastered_words)
+            storage.close()
+        csv_path = os.path.join(tmp, 'import.csv')
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['english', 'chinese'])
+            writer.writerows((w['english'], w['chinese']) for w in all_words + mastered_words)
+        del all_words, mastered_words
+
+        with isolated_config(workdir, backend), quiet():
+            _restore(pristine, workdir)
+            metrics['construct_ms'], instance = _timed(lambda: new_reciter(today))
+            metrics['load_ms'], _ = _timed(instance._load_data)
+            metrics['save_ms'], _ = _timed(instance._save_data)
+            _close(instance)
+
+            _restore(pristine, workdir)
+            instance = new_reciter(today)
+            metrics['today_list_ms'], due = _timed(instance._get_today_review_list)
+            metrics['due_today'] = len(due)
+            _close(instance)
+
+            _restore(pristine, workdir)
+            instance = new_reciter(today)
+            metrics['status_ms'], _ = _timed(instance.show_status)
+            _close(instance)
+
+            _restore(pristine, workdir)
+            instance = new_reciter(today)
+            frontend = ScriptedFrontend(seed=seed)
+            metrics['daily_review_ms'], _ = _timed(lambda: instance.daily_review(frontend))
+            metrics['per_review_ms'] = metrics['daily_review_ms'] / max(metrics['due_today'], 1)
+            _close(instance)
+
+            _restore(pristine, workdir)
+            instance = new_reciter(today)
+            frontend = ScriptedFrontend(seed=seed)
+            metrics['mastered_review_ms'], _ = _timed(lambda: instance.review_mastered_words(frontend))
+            _close(instance)
+
+            _clear(workdir)  # 导入到空的存储
+            instance = new_reciter(today)
+            import_ms, _ = _timed(lambda: instance.import_file(csv_path))
+            metrics['import_words_per_s'] = size / (import_ms / 1000) if import_ms else 0.0
+            _close(instance)
+    return metrics
+
+
+def _git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_suite(sizes=DEFAULT_SIZES, backends=DEFAULT_BACKENDS, today=None, progress=print):
+    """运行全部基准，返回可写入JSON的结果"""
+    today = today or date.today()
+    results = []
+    for backend in backends:
+        for size in sizes:
+            started = time.perf_counter()
+            metrics = bench_deck(backend, size, today)
+            results.append({'backend': backend, 'size': size, 'metrics': metrics})
+            if progress:
+                progress(f"✅ {backend:<7}{size:>9} 个单词  用时 {time.perf_counter() - started:.1f}s")
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(report, baseline, ratio=REGRESSION_RATIO):
+    """与基准结果对比，返回 [(后端, 规模, 指标, 基准值, 当前值, 是否退化)]"""
+    previous = {(r['backend'], r['size']): r['metrics'] for r in baseline.get('results', [])}
+    rows = []
+    for result in report['results']:
+        old = previous.get((result['backend'], result['size']))
+        if old is None:
+            continue
+        for name in TIME_METRICS + THROUGHPUT_METRICS:
+            if name not in old or name not in result['metrics']:
+                continue
+            before, after = old[name], result['metrics'][name]
+            if name in TIME_METRICS:
+                regressed = after > before * ratio
+            else:
+                regressed = after * ratio < before
+            rows.append((result['backend'], result['size'], name, before, after, regressed))
+    return rows
+
+
+def print_report(report):
+    from prettytable import PrettyTable
+
+    table = PrettyTable()
+    table.field_names = ["后端", "单词数", "创建", "加载", "保存", "今日列表", "看板",
+                         "每日复习", "每个单词", "已掌握复习", "导入(词/秒)"]
+    for result in report['results']:
+        m = result['metrics']
+        table.add_row([result['backend'], result['size']] +
+                      [f"{m[name]:.1f}ms" for name in TIME_METRICS] +
+                      [f"{m['import_words_per_s']:.0f}"])
+    print(table)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="离线性能基准")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="词库规模，逗号分隔")
+    parser.add_argument('--backends', default=','.join(DEFAULT_BACKENDS), help="存储后端，逗号分隔")
+    parser.add_argument('--output', default='bench_results.json', help="结果JSON文件")
+    parser.add_argument('--baseline', help="上次的结果JSON文件，变慢超过20%%时返回非零退出码")
+    args = parser.parse_args(argv)
+
+    report = run_suite([int(s) for s in args.sizes.split(',')], args.backends.split(','))
+    print_report(report)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📄 结果已写入 {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        rows = compare(report, json.load(f))
+    regressions = [row for row in rows if row[5]]
+    for backend, size, name, before, after, _ in regressions:
+        print(f"❌ {backend} {size} {name}: {before:.1f} → {after:.1f}")
+    print("✅ 没有性能退化" if not regressions else f"❌ {len(regressions)} 项性能退化")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""例句挖空模板
+
+例句格式为"英文例句_中文翻译"。每个例句只在首次使用（或导入、缓存）时解析一次，
+得到挖空模板（挖空位置之前的文本、之后的文本、答案长度、中文翻译），
+之后每次出题只需拼接字符串。
+
+匹配规则（按优先级）：
+1. 与单词完全相同的整词（忽略大小写），不会把 camp 从 camped 中间挖掉
+2. 常见的屈折变化：复数/第三人称单数、过去式、进行时、比较级（camped、studies、stopping……）
+3. 包含该单词的整个词（如 unhappy 中的 happy），避免答案露出一部分
+都没有找到时不挖空。普通单词不需要编译正则：例句切分为词后逐个比较，
+只有词组（如 ice cream）才按词组编译一次匹配模式。
+"""
+
+import functools
+import re
+from collections import namedtuple
+
+TEMPLATE_CACHE_SIZE = 4096
+_SEPARATOR = '\x1f'  # 序列化模板时的字段分隔符
+_VOWELS = 'aeiou'
+_TOKEN = re.compile(r'\w+')
+
+
+def normalize_example(example):
+    """例句格式为"英文例句_中文翻译"：保留第一个下划线，后续所有下划线删除"""
+    if '_' in example:
+        first_occurrence = example.index('_')
+        example = example[:first_occurrence+1] + example[first_occurrence+1:].replace('_', '')
+    return example
+
+
+def split_example(example):
+    """返回 (英文例句, 中文翻译)"""
+    example = normalize_example(example)
+    if '_' in example:
+        en_example, zh_example = example.split('_')
+        return en_example, zh_example
+    return example, ""
+
+
+def inflections(english):
+    """单词的常见屈折变化形式（小写，不含原形）"""
+    word = english.lower()
+    if not word.isalpha() or len(word) < 2:
+        return set()
+    forms = {word + 's', word + 'ed', word + 'ing', word + 'er', word + 'est'}
+    last, before_last = word[-1], word[-2]
+    if word.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')):
+        forms.add(word + 'es')
+    if last == 'e':
+        stem = word[:-1]
+        forms.update((word + 'd', stem + 'ing', word + 'r', word + 'st'))
+        if word.endswith('ie'):
+            forms.add(word[:-2] + 'ying')  # die -> dying
+    if last == 'y' and before_last not in _VOWELS:
+        stem = word[:-1]
+        forms.update((stem + 'ies', stem + 'ied', stem + 'ier', stem + 'iest'))
+    if last not in _VOWELS + 'wxy' and before_last in _VOWELS and \
+            (len(word) < 3 or word[-3] not in _VOWELS):
+        # 重读闭音节双写末尾辅音：stop -> stopped / stopping
+        forms.update(word + last + suffix for suffix in ('ed', 'ing', 'er', 'est'))
+    return forms
+
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def phrase_patterns(english):
+    """词组、带连字符或撇号的单词的匹配模式（按优先级排列），每个词组只编译一次"""
+    escaped = r'\s+'.join(re.escape(part) for part in english.split())
+    return (re.compile(rf'(?<!\w){escaped}(?!\w)', re.IGNORECASE),
+            re.compile(rf'\w*{escaped}\w*', re.IGNORECASE))
+
+
+def find_answer(text, english, partial=True):
+    """在英文例句中查找答案，返回 (开始, 结束) 或None
+
+    partial=False 时只接受完整的单词或词组及其屈折变化，不回退到包含该单词的更长的词
+    （如 unhappy 不算 happy）。
+    """
+    word = english.lower()
+    if not _TOKEN.fullmatch(word):
+        patterns = phrase_patterns(english)
+        for pattern in patterns if partial else patterns[:1]:
+            match = pattern.search(text)
+            if match:
+                return match.span()
+        return None
+    # 普通单词：例句只切分一次，按优先级比较每个词
+    tokens = [(match.start(), match.end(), match.group().lower()) for match in _TOKEN.finditer(text)]
+    for start, end, token in tokens:
+        if token == word:
+            return start, end
+    forms = inflections(word)
+    for start, end, token in tokens:
+        if token in forms:
+            return start, end
+    if partial:
+        for start, end, token in tokens:
+            if word in token:
+                return start, end
+    return None
+
+
+class ClozeTemplate(namedtuple('ClozeTemplate', 'before after length translation')):
+    """挖空模板：length为0表示例句中没有找到单词（不挖空）"""
+
+    __slots__ = ()
+
+    def render(self):
+        """挖空后的英文例句，空格后标注答案的字母数"""
+        if not self.length:
+            return self.before
+        return f"{self.before}{'_' * self.length}({self.length}){self.after}"
+
+    def dumps(self):
+        """序列化为字符串（用于保存到数据库）"""
+        return _SEPARATOR.join((self.before, self.after, str(self.length), self.translation))
+
+    @classmethod
+    def loads(cls, text):
+        before, after, length, translation = text.split(_SEPARATOR)
+        return cls(before, after, int(length), translation)
+
+
+def build_template(example, english):
+    """解析例句，生成挖空模板"""
+    en_example, zh_example = split_example(example)
+    english = english.strip()
+    span = find_answer(en_example, english) if english else None
+    if span is None:
+        return ClozeTemplate(en_example, '', 0, zh_example)
+    return ClozeTemplate(en_example[:span[0]], en_example[span[1]:], len(english), zh_example)
+
+
+# 复习时使用：同一例句只解析一次
+cached_template = functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(build_template)
+
+
+def build_templates(pairs):
+    """批量生成模板：pairs为 (例句, 单词) 序列，返回模板列表"""
+    return [build_template(example, english) for example, english in pairs]
@@ -0,0 +1,105 @@
+"""本地语料例句：由WordNet预先生成的 词元 -> 例句 索引（SQLite文件）
+
+生成索引（只需运行一次，需要安装nltk）：
+    python corpus.py build [索引文件]
+复习时只查询索引文件，不再导入NLTK。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+# 常见词形变化：查不到原词时依次尝试去掉这些后缀
+_SUFFIXES = (('ies', 'y'), ('es', ''), ('s', ''), ('ed', ''), ('ed', 'e'), ('ing', ''), ('ing', 'e'))
+
+
+def build_index(path, entries):
+    """由 (词元, [例句...]) 序列生成索引文件，返回写入的词元数"""
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    count = 0
+    try:
+        with conn:
+            conn.execute('CREATE TABLE examples (lemma TEXT PRIMARY KEY, examples TEXT NOT NULL) WITHOUT ROWID')
+            for lemma, examples in entries:
+                if examples:
+                    conn.execute('INSERT OR IGNORE INTO examples VALUES (?, ?)',
+                                 (lemma.lower(), json.dumps(examples, ensure_ascii=False)))
+                    count += 1
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return count
+
+
+def wordnet_entries():
+    """遍历WordNet，按义项顺序收集每个词元的例句（优先包含该词元本身的例句）"""
+    import nltk
+    nltk.download('wordnet', quiet=True)
+    from nltk.corpus import wordnet as wn
+
+    for name in wn.all_lemma_names():
+        lemma = name.replace('_', ' ')
+        examples = [e for synset in wn.synsets(name) for e in synset.examples()]
+        examples.sort(key=lambda e: lemma.lower() not in e.lower())  # 稳定排序，保持义项顺序
+        yield lemma, examples[:5]
+
+
+class WordNetExampleIndex:
+    """只读例句索引，首次查询时打开，可在多个线程中使用"""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._checked = False  # 只检查一次索引文件是否存在
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if not self._checked:
+            self._checked = True
+            if os.path.exists(self.path):
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            else:
+                print(f"⚠️ 未找到例句索引 {self.path}，可运行 python corpus.py build 生成")
+        return self._conn
+
+    @property
+    def available(self):
+        with self._lock:
+            return self._connect() is not None
+
+    def lookup(self, word):
+        """返回包含该单词的第一条例句；查不到返回空字符串，索引不可用返回None"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            candidates = [word.lower()]
+            for suffix, replacement in _SUFFIXES:
+                if candidates[0].endswith(suffix) and len(candidates[0]) > len(suffix) + 2:
+                    candidates.append(candidates[0][:-len(suffix)] + replacement)
+            for lemma in candidates:
+                row = conn.execute('SELECT examples FROM examples WHERE lemma = ?', (lemma,)).fetchone()
+                if row:
+                    return json.loads(row[0])[0]
+        return ''
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        print("用法: python corpus.py build [索引文件]")
+        sys.exit(1)
+    index_path = sys.argv[2] if len(sys.argv) > 2 else "wordnet_examples.db"
+    print("⏳ 正在从WordNet生成例句索引...")
+    total = build_index(index_path, wordnet_entries())
+    print(f"✅ 已写入 {total} 个词元 -> {index_path}")
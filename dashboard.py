@@ -0,0 +1,146 @@
+"""学习进度看板：增量维护的统计计数 + 分页、可筛选的单词列表"""
+
+import heapq
+from datetime import timedelta
+from itertools import islice
+
+
+class DeckStats:
+    """单词统计计数，每次复习结果写入时增量更新，不再全量扫描"""
+
+    def __init__(self, pending=0, mastered=0, pending_reviews=0, mastered_reviews=0):
+        self.pending = pending                    # 待复习单词数
+        self.mastered = mastered                  # 已掌握单词数
+        self.pending_reviews = pending_reviews    # 待复习单词的复习次数之和
+        self.mastered_reviews = mastered_reviews  # 已掌握单词的复习次数之和
+
+    @classmethod
+    def from_words(cls, all_words, mastered_words):
+        return cls(len(all_words), len(mastered_words),
+                   sum(w.review_count for w in all_words),
+                   sum(w.review_count for w in mastered_words))
+
+    @classmethod
+    def from_storage(cls, storage):
+        """由存储的聚合查询构建（不加载单词）"""
+        return cls(**storage.aggregate())
+
+    @property
+    def total(self):
+        return self.pending + self.mastered
+
+    @property
+    def avg_review_count(self):
+        """待复习单词的平均复习次数"""
+        return self.pending_reviews / self.pending if self.pending else 0.0
+
+    def add(self, word, mastered=False):
+        if mastered:
+            self.mastered += 1
+            self.mastered_reviews += word.review_count
+        else:
+            self.pending += 1
+            self.pending_reviews += word.review_count
+
+    def reviewed(self, word, mastered=False):
+        """单词复习次数加1之后调用"""
+        if mastered:
+            self.mastered_reviews += 1
+        else:
+            self.pending_reviews += 1
+
+    def graduate(self, word):
+        """单词由待复习转入已掌握"""
+        self.pending -= 1
+        self.pending_reviews -= word.review_count
+        self.add(word, mastered=True)
+
+
+class StatusFilter:
+    """看板筛选条件，由空格分隔的关键字组成：
+
+    - r<N>：第N轮的单词
+    - d<N>：N天内到期的单词（d0 为今天到期）
+    - 其他文本：英文或中文包含该文本
+    """
+
+    def __init__(self, review_round=None, due_days=None, text=None):
+        self.review_round = review_round  # 从0开始的复习轮次
+        self.due_days = due_days
+        self.text = text
+
+    @classmethod
+    def parse(cls, spec):
+        review_round = due_days = None
+        texts = []
+        for token in spec.split():
+            lower = token.lower()
+            if lower[0] in 'rd' and lower[1:].isdigit():
+                if lower[0] == 'r':
+                    review_round = max(int(lower[1:]) - 1, 0)
+                else:
+                    due_days = int(lower[1:])
+            else:
+                texts.append(lower)
+        return cls(review_round, due_days, ' '.join(texts) or None)
+
+    def __bool__(self):
+        return self.review_round is not None or self.due_days is not None or self.text is not None
+
+    def describe(self):
+        parts = []
+        if self.review_round is not None:
+            parts.append(f"第{self.review_round + 1}轮")
+        if self.due_days is not None:
+            parts.append(f"{self.due_days}天内到期")
+        if self.text:
+            parts.append(f"包含\"{self.text}\"")
+        return "，".join(parts) or "全部"
+
+    def due_before(self, today):
+        """到期日期上限（含），没有到期条件时返回None"""
+        return None if self.due_days is None else today + timedelta(days=self.due_days)
+
+    def matcher(self, today):
+        """返回对单词对象的判断函数"""
+        due_day = None if self.due_days is None else self.due_before(today).toordinal()
+        text = self.text
+
+        def match(word):
+            if self.review_round is not None and word.review_round != self.review_round:
+                return False
+            if due_day is not None and word.review_day > due_day:
+                return False
+            if text and text not in word.english.lower() and text not in (word.chinese or ''):
+                return False
+            return True
+        return match
+
+
+def paginate(words, key, page, page_size, predicate=None):
+    """返回 (第page页的单词, 符合条件的总数)
+
+    只对前 (page+1)*page_size 个元素做部分排序，不对整个列表排序；
+    key为None时保持原有顺序。
+    """
+    matched = 0
+
+    def matching():
+        nonlocal matched
+        for word in words:
+            if predicate is None or predicate(word):
+                matched += 1
+                yield word
+
+    if key is None:
+        items = matching()
+        visible = list(islice(items, page * page_size, (page + 1) * page_size))
+        for _ in items:  # 继续计数
+            pass
+        return visible, matched
+    top = heapq.nsmallest((page + 1) * page_size, matching(), key=key)
+    return top[page * page_size:], matched
+
+
+def page_count(total, page_size):
+    return max((total + page_size - 1) // page_size, 1)
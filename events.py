@@ -0,0 +1,116 @@
+"""复习事件日志：每次作答追加一条定长二进制记录
+
+记录格式（小端，32字节）：
+    时间戳(毫秒, int64) | 单词编号(uint32) | 答错时输入的内容编号(uint32) |
+    事件类型(uint8) | 第几次尝试(uint8) | 作答前成功次数(uint8) | 填充 |
+    首次按键耗时(毫秒, uint32) | 作答耗时(毫秒, uint32) | 本次复习间隔(天, uint16) | 填充
+编号对应 <日志文件>.vocab 中的行号（每行一个单词或输入内容）。
+写入只追加到内存缓冲区，定期批量刷入文件，不会拖慢输入；
+崩溃时末尾不完整的记录在读取时被忽略。
+"""
+
+import os
+import struct
+import time
+
+# 事件类型
+CORRECT, WRONG, HINT, REPLAY = 1, 2, 3, 4
+EVENT_NAMES = {CORRECT: '答对', WRONG: '答错', HINT: '查看答案', REPLAY: '播放语音'}
+
+RECORD = struct.Struct('<qIIBBBxIIHxx')
+NO_ANSWER = 0xFFFFFFFF
+
+# 与RECORD布局相同的NumPy结构化类型（供analytics向量化读取）
+NUMPY_FIELDS = [('timestamp', '<i8'), ('word', '<u4'), ('answer', '<u4'), ('kind', 'u1'), ('attempt', 'u1'),
+                ('success_count', 'u1'), ('_pad', 'u1'), ('first_key_ms', '<u4'),
+                ('latency_ms', '<u4'), ('interval', '<u2'), ('_pad2', '<u2')]
+
+
+class EventLog:
+    """追加写的复习事件日志"""
+
+    def __init__(self, path, flush_every=64):
+        self.path = path
+        self.vocab_path = path + '.vocab'
+        self.flush_every = flush_every
+        self._ids = None      # 单词/输入内容 -> 编号（首次写入时读取词表）
+        self._file = None
+        self._vocab_file = None
+        self._pending = 0
+
+    def _string_id(self, key):
+        key = key.replace('\r', ' ').replace('\n', ' ')  # 词表每行一条
+        if self._ids is None:
+            self._ids = {word: index for index, word in enumerate(read_vocab(self.vocab_path))}
+        word_id = self._ids.get(key)
+        if word_id is None:
+            if self._vocab_file is None:
+                self._vocab_file = open(self.vocab_path, 'a', encoding='utf-8')
+            word_id = self._ids[key] = len(self._ids)
+            self._vocab_file.write(key + '\n')  # 与记录一起刷入文件（见flush）
+        return word_id
+
+    def log(self, key, kind, attempt=0, success_count=0, first_key_ms=0, latency_ms=0, interval=0,
+            answer=None):
+        """追加一条事件（key为单词的去重键，answer为答错时输入的内容）"""
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+            # 上次崩溃留下的不完整记录会使后续记录错位，先截掉
+            size = self._file.tell()
+            if size % RECORD.size:
+                self._file.truncate(size - size % RECORD.size)
+        self._file.write(RECORD.pack(
+            int(time.time() * 1000), self._string_id(key),
+            NO_ANSWER if answer is None else self._string_id(answer), kind, min(attempt, 255),
+            min(success_count, 255), min(int(first_key_ms), 0xFFFFFFFF),
+            min(int(latency_ms), 0xFFFFFFFF), min(max(int(interval), 0), 0xFFFF)
+        ))
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._file is not None and self._pending:
+            if self._vocab_file is not None:
+                self._vocab_file.flush()  # 先写词表，保证文件中的记录引用的编号都已存在
+            self._file.flush()
+            self._pending = 0
+
+    def close(self):
+        self.flush()
+        for f in (self._file, self._vocab_file):
+            if f is not None:
+                f.close()
+        self._file = self._vocab_file = None
+
+
+def read_vocab(vocab_path):
+    """读取词表，返回按编号排列的字符串列表"""
+    try:
+        with open(vocab_path, encoding='utf-8') as f:
+            return [line.rstrip('\n') for line in f]
+    except FileNotFoundError:
+        return []
+
+
+def iter_events(path):
+    """逐条读取事件（纯Python），产生RECORD字段元组"""
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        while True:
+            chunk = f.read(RECORD.size * 4096)
+            usable = len(chunk) - len(chunk) % RECORD.size
+            yield from RECORD.iter_unpack(chunk[:usable])
+            if len(chunk) < RECORD.size * 4096:
+                return
+
+
+def event_count(path):
+    """日志中完整记录的条数"""
+    try:
+        return os.path.getsize(path) // RECORD.size
+    except FileNotFoundError:
+        return 0
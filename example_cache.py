@@ -0,0 +1,141 @@
+"""例句缓存：磁盘持久化，按 (词元, 来源) 索引，LRU淘汰 + 过期刷新
+
+同一文件中还保存每个单词当前例句的挖空模板（写入例句、导入单词时生成），
+复习时直接读取模板，不必在每次运行时重新解析例句。
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from cloze import ClozeTemplate, build_template, build_templates, normalize_example
+from storage import atomic_write_json
+
+
+class ExampleCache:
+    """NLTK、腾讯混元等来源生成的例句缓存
+
+    - 以小写单词作为词元，与来源组合为键，不同词库之间共享
+    - 条目数超过上限时淘汰最久未使用的条目
+    - 条目超过有效期后视为未命中，由调用方重新获取并写回
+    - 空字符串表示"该来源没有例句"，同样会被缓存，避免重复查询
+    - 挖空模板按词元保存（同时记录生成模板的例句，例句变化后重新生成），条目数上限相同
+    - 读写加锁，可在预取线程中使用
+    """
+
+    def __init__(self, path, max_entries=10000, ttl_days=90):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl_days * 86400
+        self.entries = OrderedDict()  # "来源:词元" -> [例句, 写入时间]
+        self.templates = OrderedDict()  # 词元 -> [例句, 序列化的挖空模板]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self):
+        """首次读写时才读取缓存文件"""
+        self._loaded = True
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        # 文件按最近使用顺序保存
+        for key, entry in data.get('entries', []):
+            self.entries[key] = entry
+        for lemma, entry in data.get('templates', []):
+            self.templates[lemma] = entry
+
+    @staticmethod
+    def _key(lemma, source):
+        return f"{source}:{lemma.strip().lower()}"
+
+    def get(self, lemma, source):
+        """返回缓存的例句；未命中或已过期时返回None"""
+        key = self._key(lemma, source)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self.entries.get(key)
+            if entry is None or time.time() - entry[1] > self.ttl:
+                if entry is not None:
+                    del self.entries[key]
+                    self._dirty = True
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, lemma, source, example):
+        """写入例句（空字符串表示该来源没有例句）"""
+        key = self._key(lemma, source)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self.entries[key] = [example, time.time()]
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+        if example:
+            self.template(lemma, example)  # 缓存例句时即生成挖空模板
+
+    def template(self, english, example):
+        """单词在该例句上的挖空模板：已保存且例句相同时直接读取，否则生成并保存"""
+        example = normalize_example(example)
+        lemma = english.strip().lower()
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self.templates.get(lemma)
+            if entry is not None and entry[0] == example:
+                self.templates.move_to_end(lemma)
+                return ClozeTemplate.loads(entry[1])
+        template = build_template(example, english)
+        with self._lock:
+            self.templates[lemma] = [example, template.dumps()]
+            self.templates.move_to_end(lemma)
+            while len(self.templates) > self.max_entries:
+                self.templates.popitem(last=False)
+            self._dirty = True
+        return template
+
+    def retemplate(self):
+        """按当前的匹配规则批量重新生成所有保存的模板，返回模板数"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            lemmas = list(self.templates)
+            examples = [self.templates[lemma][0] for lemma in lemmas]
+            for lemma, example, template in zip(lemmas, examples, build_templates(zip(examples, lemmas))):
+                self.templates[lemma][1] = template.dumps()
+            self._dirty = bool(lemmas) or self._dirty
+        return len(lemmas)
+
+    def stats(self):
+        """返回命中统计"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def save(self):
+        """有改动时原子写回磁盘"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = list(self.entries.items())
+            templates = list(self.templates.items())
+            self._dirty = False
+        atomic_write_json(self.path, {'entries': entries, 'templates': templates}, ensure_ascii=False)
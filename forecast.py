@@ -0,0 +1,158 @@
+"""复习量预测：按复习间隔推演未来每天到期的单词数
+
+固定间隔表（艾宾浩斯）：安装了NumPy时按天对整个词库做向量化推演，否则使用按天分桶的纯Python实现。
+SM-2、FSRS等按单词记忆状态安排间隔的算法：forecast_algorithm 逐个单词调用算法推演。
+推演规则与每日复习一致：
+- 答对：success_count加1，达到掌握次数后不再复习，否则按间隔表（或复习算法）安排下次复习
+- 答错：间隔表保持原复习计划，第二天作为过期单词再次复习；其他算法由算法安排
+- 过期单词视为今天到期
+（按到期日期统计，不考虑轮次限制）
+"""
+
+import random
+from datetime import timedelta
+
+
+def forecast_due(due_offsets, success_counts, days, intervals, max_success, accuracy=1.0, seed=0):
+    """推演未来days天每天到期的单词数
+
+    due_offsets: 每个单词距离今天的到期天数（负数为已过期）
+    accuracy: 每次复习答对的概率，1.0为"完全记住"
+    返回 {'due': [第0天..第days-1天的到期数], 'graduated': 期间掌握的单词数}
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return _forecast_python(due_offsets, success_counts, days, intervals, max_success, accuracy, seed)
+    return _forecast_numpy(np, due_offsets, success_counts, days, intervals, max_success, accuracy, seed)
+
+
+def _forecast_numpy(np, due_offsets, success_counts, days, intervals, max_success, accuracy, seed):
+    due = np.maximum(np.asarray(due_offsets, dtype=np.int64), 0)
+    success = np.asarray(success_counts, dtype=np.int64).copy()
+    intervals = np.maximum(np.asarray(intervals, dtype=np.int64), 1)
+    last = len(intervals) - 1
+    counts = np.zeros(days, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    graduated = 0
+
+    for day in range(days):
+        index = np.flatnonzero(due == day)
+        if not index.size:
+            continue
+        counts[day] = index.size
+        if accuracy < 1.0:
+            correct = rng.random(index.size) < accuracy
+            due[index[~correct]] = day + 1
+            index = index[correct]
+        success[index] += 1
+        done = success[index] >= max_success
+        due[index[done]] = -1  # 已掌握，不再到期
+        graduated += int(done.sum())
+        index = index[~done]
+        due[index] = day + intervals[np.minimum(success[index] - 1, last)]
+
+    return {'due': counts.tolist(), 'graduated': graduated}
+
+
+def _forecast_python(due_offsets, success_counts, days, intervals, max_success, accuracy, seed):
+    buckets = {}  # 天 -> 当天到期的单词序号
+    for index, offset in enumerate(due_offsets):
+        offset = max(offset, 0)
+        if offset < days:
+            buckets.setdefault(offset, []).append(index)
+    success = list(success_counts)
+    intervals = [max(i, 1) for i in intervals]
+    last = len(intervals) - 1
+    counts = [0] * days
+    rng = random.Random(seed)
+    graduated = 0
+
+    for day in range(days):
+        due = buckets.pop(day, ())
+        counts[day] = len(due)
+        for index in due:
+            if accuracy < 1.0 and rng.random() >= accuracy:
+                next_day = day + 1
+            else:
+                success[index] += 1
+                if success[index] >= max_success:
+                    graduated += 1
+                    continue
+                next_day = day + intervals[min(success[index] - 1, last)]
+            if next_day < days:
+                buckets.setdefault(next_day, []).append(index)
+
+    return {'due': counts, 'graduated': graduated}
+
+
+class _ForecastWord:
+    """推演用的单词副本：复习算法需要的字段（review_day 为相对今天的天数）"""
+
+    __slots__ = ('review_day', 'success_count', 'ease', 'interval', 'stability', 'difficulty')
+
+    def __init__(self, review_day, success_count, ease=None, interval=None, stability=None, difficulty=None):
+        self.review_day = review_day
+        self.success_count = success_count
+        self.ease = ease
+        self.interval = interval
+        self.stability = stability
+        self.difficulty = difficulty
+
+
+def forecast_algorithm(algorithm, words, days, max_success, accuracy=1.0, seed=0):
+    """按复习算法（srs.py）逐个单词推演未来days天每天到期的单词数
+
+    words: [(距今天的到期天数, 成功次数, ease, interval, stability, difficulty)]，记忆状态可省略或为None；
+    推演使用副本，不修改传入的数据。返回值与 forecast_due 相同。
+    """
+    buckets = {}
+    state = []
+    for index, (offset, *fields) in enumerate(words):
+        state.append(_ForecastWord(offset, *fields))  # 保留原到期日，算法据此计算实际间隔
+        offset = max(offset, 0)
+        if offset < days:
+            buckets.setdefault(offset, []).append(index)
+    counts = [0] * days
+    rng = random.Random(seed)
+    graduated = 0
+
+    for day in range(days):
+        due = buckets.pop(day, ())
+        counts[day] = len(due)
+        for index in due:
+            word = state[index]
+            correct = accuracy >= 1.0 or rng.random() < accuracy
+            if correct:
+                word.success_count += 1
+                if word.success_count >= max_success:
+                    graduated += 1
+                    continue
+            delta = algorithm.review(word, correct, day)
+            next_day = day + (1 if delta is None else max(delta, 1))
+            word.review_day = next_day
+            if next_day < days:
+                buckets.setdefault(next_day, []).append(index)
+
+    return {'due': counts, 'graduated': graduated}
+
+
+def render_histogram(counts, start, width=40):
+    """文本直方图：30天以内按天显示，更长的时间按周汇总"""
+    step = 1 if len(counts) <= 31 else 7
+    rows = []
+    for offset in range(0, len(counts), step):
+        total = sum(counts[offset:offset + step])
+        day = start + timedelta(days=offset)
+        if step == 1:
+            label = f"{day:%m-%d} 周{'一二三四五六日'[day.weekday()]}"
+        else:
+            label = f"{day:%m-%d}起一周"
+        rows.append((label, total))
+
+    peak = max((total for _, total in rows), default=0)
+    lines = []
+    for label, total in rows:
+        bar = '█' * (round(total / peak * width) if peak else 0)
+        lines.append(f"{label} | {bar} {total}")
+    return '\n'.join(lines)
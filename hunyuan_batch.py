@@ -0,0 +1,129 @@
+"""批量例句生成：多个单词合并为一次大模型请求"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RateLimiter:
+    """限制每秒请求数（多个线程共享）"""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """等待到允许发出下一个请求"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def estimate_tokens(word, output_tokens_per_word):
+    """粗略估计一个单词占用的token数（输入约4个字符1个token，加上输出例句）"""
+    return len(word) // 4 + 1 + output_tokens_per_word
+
+
+def pack_batches(words, token_budget, output_tokens_per_word=60, max_words=50):
+    """按token预算将单词打包为多个批次，保持原有顺序"""
+    batches = []
+    batch, used = [], 0
+    for word in words:
+        cost = estimate_tokens(word, output_tokens_per_word)
+        if batch and (used + cost > token_budget or len(batch) >= max_words):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(word)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def build_batch_prompt(words):
+    """构造批量生成例句的提示词，要求以JSON对象返回"""
+    word_list = json.dumps(words, ensure_ascii=False)
+    return (
+        f"请为以下每个英文单词各生成一个包含该单词的例句，全部小写字母，带中文翻译。"
+        f"单词列表: {word_list}。"
+        f"只输出一个JSON对象，键为单词，值为\"英文例句_中文翻译\"，不要其他多余的输出"
+    )
+
+
+def parse_batch_response(content, words):
+    """解析批量响应，返回 {单词: 例句}；缺失或不含该单词的例句不会出现在结果中"""
+    if not content:
+        return {}
+    start, end = content.find('{'), content.rfind('}')
+    if start == -1 or end <= start:
+        return {}
+    try:
+        data = json.loads(content[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    replies = {str(key).strip().lower(): value for key, value in data.items()}
+    results = {}
+    for word in words:
+        example = replies.get(word.lower())
+        if not isinstance(example, str):
+            continue
+        example = example.strip()
+        if word.lower() in example.split('_')[0].lower():
+            results[word] = example
+    return results
+
+
+class BatchExampleGenerator:
+    """批量生成例句
+
+    - 按token预算把单词打包，一个批次一次请求
+    - 多个批次并发发送，由RateLimiter限制请求速率
+    - 只对失败（缺失或无效）的单词重新打包重试
+    chat: 接收提示词、返回模型回复文本的函数（失败时返回None）
+    """
+
+    def __init__(self, chat, token_budget=2000, max_concurrency=4, requests_per_second=5,
+                 max_retries=2, output_tokens_per_word=60):
+        self.chat = chat
+        self.token_budget = token_budget
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.max_retries = max_retries
+        self.output_tokens_per_word = output_tokens_per_word
+        self.requests = 0  # 实际发出的请求数（线程池中的多个线程同时更新，加锁计数）
+        self._lock = threading.Lock()
+
+    def _run_batch(self, batch):
+        self.rate_limiter.acquire()
+        with self._lock:
+            self.requests += 1
+        try:
+            content = self.chat(build_batch_prompt(batch))
+        except Exception as e:
+            print(f"⚠️ 批量获取例句失败: {str(e)}")
+            return {}
+        return parse_batch_response(content, batch)
+
+    def generate(self, words):
+        """返回 {单词: 例句}，重试后仍失败的单词不在结果中"""
+        pending = list(dict.fromkeys(w for w in words if w))
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for _ in range(self.max_retries + 1):
+                if not pending:
+                    break
+                batches = pack_batches(pending, self.token_budget, self.output_tokens_per_word)
+                for batch_results in executor.map(self._run_batch, batches):
+                    results.update(batch_results)
+                pending = [w for w in pending if w not in results]
+        return results
@@ -0,0 +1,299 @@
+"""单词导入：流式读取 CSV / TSV / JSON词库，逐批去重合并
+
+整个流程基于生成器，任意时刻只在内存中保留一个批次，
+导入几十万行的词典时内存占用保持有界。
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from storage import word_key
+
+# 词库文件中可以带入的学习进度字段
+PROGRESS_FIELDS = ('success_count', 'next_review_date', 'review_round', 'review_count',
+                   'ease', 'interval', 'stability', 'difficulty')
+# CSV / TSV 首行为这些列名时视为表头
+_HEADER_NAMES = {'english', 'word', 'en', '单词', '英文'}
+
+
+def detect_format(path):
+    """根据文件内容判断格式：'json'、'tsv' 或 'csv'"""
+    with open(path, encoding='utf-8-sig') as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped[0] in '[{':
+                return 'json'
+            return 'tsv' if '\t' in line else 'csv'
+    return 'csv'
+
+
+def iter_records(path, fmt=None):
+    """逐条产生 (单词数据, 是否已掌握)，fmt为None时自动判断格式"""
+    fmt = fmt or detect_format(path)
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        if fmt == 'json':
+            yield from _iter_json_deck(f)
+        else:
+            yield from _iter_delimited(f, '\t' if fmt == 'tsv' else ',')
+
+
+def _iter_delimited(f, delimiter):
+    """CSV / TSV：英文,中文[,例句]
+
+    没有表头的CSV按第一个逗号拆分（与原来的文本词库相同），之后的逗号属于中文释义，
+    例如 run,跑,奔跑；带表头时第三列为例句。TSV的第三列总是例句。
+    """
+    has_examples = delimiter != ','
+    for line_no, row in enumerate(csv.reader(f, delimiter=delimiter)):
+        if len(row) < 2:
+            yield None, False  # 无效行，由调用方计数
+            continue
+        if line_no == 0 and row[0].strip().lower() in _HEADER_NAMES:
+            has_examples = True
+            continue
+        if not has_examples:
+            row = [row[0], delimiter.join(row[1:])]
+        word_data = {'english': row[0], 'chinese': row[1]}
+        if len(row) > 2 and row[2].strip():
+            word_data['example'] = row[2]
+        yield word_data, False
+
+
+class _JsonStream:
+    """分块读取JSON文本，每次解码一个值，缓冲区只保留尚未解码的部分"""
+
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _read_more(self):
+        data = self.f.read(self.chunk_size)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """跳过空白，返回下一个字符（文件结束时返回空字符串）"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._read_more():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON格式错误：期望 '{char}'")
+        self.pos += 1
+
+    def value(self):
+        """解码下一个完整的JSON值"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._read_more():
+                    raise
+                continue
+            # 位于缓冲区末尾的数字可能被截断，读入更多内容后重新解码
+            if end == len(self.buf) and self._read_more():
+                continue
+            self.pos = end
+            return value
+
+    def array(self):
+        """逐个产生数组中的元素"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError("JSON格式错误：数组元素之间缺少 ','")
+
+
+def _iter_json_deck(f, chunk_size=1 << 16):
+    """JSON词库：{"all_words": [...], "mastered_words": [...]}，或单词对象的数组"""
+    stream = _JsonStream(f, chunk_size)
+    if stream.peek() == '[':
+        for item in stream.array():
+            yield _deck_item(item), False
+        return
+
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        key = stream.value()
+        stream.expect(':')
+        if key in ('all_words', 'mastered_words') and stream.peek() == '[':
+            for item in stream.array():
+                yield _deck_item(item), key == 'mastered_words'
+        else:
+            stream.value()  # 其他字段（如generation）跳过
+        char = stream.peek()
+        stream.pos += 1
+        if char == '}':
+            return
+        if char != ',':
+            raise ValueError("JSON格式错误：字段之间缺少 ','")
+
+
+def _deck_item(item):
+    if not isinstance(item, dict) or not isinstance(item.get('english'), str):
+        return None
+    word_data = {'english': item['english'], 'chinese': item.get('chinese') or ''}
+    if item.get('example'):
+        word_data['example'] = item['example']
+    for field in PROGRESS_FIELDS:
+        if field in item:
+            word_data[field] = item[field]
+    return word_data
+
+
+def iter_batches(records, batch_size, stats):
+    """将记录流按批次切分为 {去重键: (单词数据, 是否已掌握)}
+
+    批内重复的单词合并为一条（后出现的释义、例句覆盖先出现的），计入跳过；
+    无效记录计入 stats.invalid。
+    """
+    batch = {}
+    for word_data, mastered in records:
+        english = (word_data or {}).get('english', '').strip()
+        if not english:
+            stats.invalid += 1
+            continue
+        word_data['english'] = english
+        word_data['chinese'] = word_data.get('chinese', '').strip()
+        key = word_key(english)
+        if key in batch:
+            merge_word_data(batch[key][0], word_data)
+            stats.skipped += 1
+            continue
+        batch[key] = (word_data, mastered)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = {}
+    if batch:
+        yield batch
+
+
+def merge_word_data(existing, incoming):
+    """用新导入的释义和例句更新已有单词（不改变学习进度），返回是否有改动"""
+    changed = False
+    for field in ('chinese', 'example'):
+        value = incoming.get(field)
+        if value and value != existing.get(field):
+            existing[field] = value
+            changed = True
+    return changed
+
+
+class ImportStats:
+    """导入进度：读取行数、新增、更新、跳过、无效，以及吞吐量"""
+
+    def __init__(self):
+        self.added = 0
+        self.updated = 0
+        self.skipped = 0   # 已存在且没有变化
+        self.invalid = 0   # 无法解析的行
+        self.started = time.perf_counter()
+
+    @property
+    def processed(self):
+        return self.added + self.updated + self.skipped + self.invalid
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"已处理 {self.processed} 条 | 新增 {self.added} | 更新 {self.updated} | "
+                f"跳过 {self.skipped} | 无效 {self.invalid} | {self.rate:.0f} 条/秒")
+
+
+class DeckWriter:
+    """流式写出JSON词库 {"all_words": [...], "mastered_words": [...]}，完成后原子替换目标文件
+
+    单词可以按任意顺序写入：已掌握单词先写入旁路临时文件，关闭时接在待复习单词之后。
+    """
+
+    SEPARATOR = ',\n    '
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        self._out = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False,
+                                                prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+        self._mastered_out = tempfile.TemporaryFile('w+', encoding='utf-8', dir=directory)
+        self.counts = {False: 0, True: 0}
+        self._out.write('{\n  "all_words": [')
+
+    def write(self, word_data, mastered=False):
+        self.write_text(json.dumps(word_data, ensure_ascii=False), 1, mastered)
+
+    def write_text(self, text, count, mastered=False):
+        """写入已序列化的单词（count个，以 SEPARATOR 连接）"""
+        if not count:
+            return
+        f = self._mastered_out if mastered else self._out
+        f.write(('\n    ' if self.counts[mastered] == 0 else self.SEPARATOR) + text)
+        self.counts[mastered] += count
+
+    def close(self):
+        out = self._out
+        try:
+            out.write('\n  ],\n  "mastered_words": [' if self.counts[False] else '],\n  "mastered_words": [')
+            self._mastered_out.seek(0)
+            shutil.copyfileobj(self._mastered_out, out, 1 << 20)
+            out.write('\n  ]\n}\n' if self.counts[True] else ']\n}\n')
+            out.flush()
+            os.fsync(out.fileno())
+            out.close()
+            os.replace(out.name, self.path)
+        except BaseException:
+            self.discard()
+            raise
+        finally:
+            self._mastered_out.close()
+
+    def discard(self):
+        """放弃写入，删除临时文件"""
+        self._out.close()
+        self._mastered_out.close()
+        try:
+            os.unlink(self._out.name)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -0,0 +1,205 @@
+"""拼写输入的单行编辑器：每次按键只输出屏幕上变化的部分
+
+- 维护输入内容和光标位置，支持退格、Delete、左右方向键、Home/End（以及Ctrl-A/Ctrl-E）
+- 每次按键后与上一次显示的内容比较，只把光标移到第一个不同的位置重写后面的部分，
+  内容变短时清除行尾；在末尾输入一个字母只输出这一个字母，退格只输出 "\\b\\x1b[K"
+- 一次按键的全部输出合并为一次写入和一次flush，慢速SSH连接上不会出现闪烁和残留字符
+
+终端由一个提供 readkey() / write(text) / flush() 的对象表示：
+ConsoleTerminal 使用readchar和标准输出；HeadlessTerminal 按脚本提供按键、在内存中还原屏幕内容，
+用于测试和测量每次按键的处理延迟。
+"""
+
+import sys
+import time
+import unicodedata
+
+ENTER = ('\r', '\n')
+BACKSPACE = ('\x7f', '\x08')
+LEFT, RIGHT = '\x1b[D', '\x1b[C'
+HOME = ('\x1b[H', '\x1b[1~', '\x1bOH', '\x01')
+END = ('\x1b[F', '\x1b[4~', '\x1bOF', '\x05')
+DELETE = '\x1b[3~'
+CLEAR_TO_END = '\x1b[K'
+
+
+def cell_width(text):
+    """文本在终端中占的列数（全角字符占两列）"""
+    return sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+
+
+def _move(columns):
+    """光标左移（负数）或右移的控制序列，短距离用退格更省字节"""
+    if columns < 0:
+        return '\b' * -columns if columns >= -3 else f'\x1b[{-columns}D'
+    if columns > 0:
+        return f'\x1b[{columns}C'
+    return ''
+
+
+class LineEditor:
+    """单行输入：feed(按键) 更新内容并返回需要输出的文本，回车后 submitted 为输入的内容"""
+
+    def __init__(self):
+        self.chars = []
+        self.cursor = 0        # 光标在输入内容中的位置（字符）
+        self.submitted = None
+        self._shown = ''       # 屏幕上当前显示的输入内容
+        self._column = 0       # 屏幕上光标的位置（字符，相对于输入开头）
+
+    @property
+    def text(self):
+        return ''.join(self.chars)
+
+    def feed(self, key):
+        """处理一个按键（readchar.readkey 的返回值），返回需要输出到终端的文本"""
+        if key in ENTER:
+            self.submitted = self.text
+            return ''
+        if key in BACKSPACE:
+            if self.cursor:
+                self.cursor -= 1
+                del self.chars[self.cursor]
+        elif key == DELETE:
+            if self.cursor < len(self.chars):
+                del self.chars[self.cursor]
+        elif key == LEFT:
+            self.cursor = max(self.cursor - 1, 0)
+        elif key == RIGHT:
+            self.cursor = min(self.cursor + 1, len(self.chars))
+        elif key in HOME:
+            self.cursor = 0
+        elif key in END:
+            self.cursor = len(self.chars)
+        elif len(key) == 1 and key.isprintable():
+            self.chars.insert(self.cursor, key)
+            self.cursor += 1
+        # 其他控制字符和无法识别的转义序列忽略
+        return self._render()
+
+    def _render(self):
+        """与上次显示的内容比较，生成最少的输出"""
+        new, shown = self.text, self._shown
+        same = 0
+        limit = min(len(new), len(shown))
+        while same < limit and new[same] == shown[same]:
+            same += 1
+        out = []
+        if same < len(new) or same < len(shown):
+            out.append(self._step(self._column, same))
+            out.append(new[same:])
+            if cell_width(shown) > cell_width(new):
+                out.append(CLEAR_TO_END)
+            column = len(new)
+        else:
+            column = self._column
+        out.append(self._step(column, self.cursor, new))
+        self._shown, self._column = new, self.cursor
+        return ''.join(out)
+
+    def _step(self, start, end, text=None):
+        """光标从输入中的位置start移到end"""
+        text = self._shown if text is None else text
+        if end < start:
+            return _move(-cell_width(text[end:start]))
+        return _move(cell_width(text[start:end]))
+
+
+def read_line(prompt, terminal, latencies=None):
+    """显示提示并读取一行输入，返回 (输入内容, 首次按键的 perf_counter 时刻)
+
+    latencies: 传入列表时记录每次按键从读到到输出完成的秒数。
+    """
+    editor = LineEditor()
+    terminal.write(prompt)
+    terminal.flush()
+    first_key = None
+    while True:
+        key = terminal.readkey()
+        started = time.perf_counter()
+        if first_key is None:
+            first_key = started
+        output = editor.feed(key)
+        if output:
+            terminal.write(output)
+            terminal.flush()
+        if latencies is not None:
+            latencies.append(time.perf_counter() - started)
+        if editor.submitted is not None:
+            return editor.submitted, first_key
+
+
+class ConsoleTerminal:
+    """真实终端：readchar逐键读取（方向键等作为完整的转义序列返回），输出到标准输出"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def readkey(self):
+        from readchar import readkey
+        return readkey()
+
+    def write(self, text):
+        self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class HeadlessTerminal:
+    """无终端运行：按脚本提供按键，记录全部输出，并在内存中还原当前行的显示内容"""
+
+    def __init__(self, keys=()):
+        self.keys = list(keys)
+        self.output = []       # 每次flush输出的文本
+        self.latencies = []
+        self._pending = []
+
+    def send(self, *keys):
+        self.keys.extend(keys)
+
+    def readkey(self):
+        if not self.keys:
+            raise EOFError("按键脚本已用完")
+        return self.keys.pop(0)
+
+    def write(self, text):
+        self._pending.append(text)
+
+    def flush(self):
+        if self._pending:
+            self.output.append(''.join(self._pending))
+            self._pending = []
+
+    def screen(self):
+        """按输出的控制序列还原最后一行的显示内容（只支持本模块使用的序列），返回 (内容, 光标列)"""
+        cells, column = [], 0
+        text = ''.join(self.output)
+        i = 0
+        while i < len(text):
+            char = text[i]
+            if char == '\n':
+                cells, column = [], 0
+            elif char == '\r':
+                column = 0
+            elif char == '\b':
+                column = max(column - 1, 0)
+            elif char == '\x1b':
+                end = i + 2
+                while not text[end].isalpha():
+                    end += 1
+                count, command = int(text[i + 2:end] or 1), text[end]
+                if command == 'D':
+                    column = max(column - count, 0)
+                elif command == 'C':
+                    column += count
+                elif command == 'K':
+                    del cells[column:]
+                i = end
+            else:
+                width = cell_width(char)
+                cells.extend([''] * (column + width - len(cells)))
+                cells[column:column + width] = [char] + [''] * (width - 1)
+                column += width
+            i += 1
+        return ''.join(cells), column
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""词库离线清洗：拆分多条例句、去除引用标记、统一标点和分隔符，多进程并行处理
+
+整理前的词库中，例句字段常见的问题：
+- 多条"英文_中文"例句用 " | " 连在一起
+- 生成时残留的引用标记，如 "[9,10](@ref)"
+- 英文部分混入全角标点（，。！？）或全角字母，中英文之间用全角下划线或空格分隔
+- 例句中根本没有这个单词
+
+清洗后每个单词的 example 为第一条合格例句（"英文例句_中文翻译"，复习时直接使用）。
+数据文件（JSON、SQLite、二进制快照）每个单词只保存一条例句，其余合格例句以清洗后的形式
+写入报告（原因为 dropped_extra），不合格的例句也写入报告（JSON Lines，每行一条及原因）。
+
+流程：主进程流式读取词库（与导入相同，支持JSON/CSV/TSV），按块分发给进程池，
+子进程完成清洗并序列化为JSON文本，主进程按原顺序写出。任意时刻只有有限个块在内存中。
+
+用法：
+    python normalize.py words.txt words.clean.json [--rejects rejects.jsonl] [--workers N]
+    python normalize.py bench [--size 1000000] [--workers 1,2,4]     # 合成词库测量多核扩展
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from cloze import find_answer
+from importer import DeckWriter, iter_records
+
+CHUNK_SIZE = 2000  # 每个任务处理的单词数
+
+# 拒绝原因
+EMPTY, NO_TRANSLATION, NO_HEADWORD, DUPLICATE = 'empty', 'no_translation', 'no_headword', 'duplicate'
+# 合格但没有写入词库的例句（每个单词只保存一条），同样记入报告，不计为拒绝
+DROPPED_EXTRA = 'dropped_extra'
+
+_CITATION = re.compile(r'\s*\[\s*\d+(?:\s*[,，、\-–]\s*\d+)*\s*\]\(@ref\)')
+_EXAMPLE_SEPARATOR = re.compile(r'\s*[|｜]\s*')
+_TRANSLATION_SEPARATOR = re.compile(r'\s*[_＿]+\s*')
+_CJK = re.compile(r'[㐀-鿿豈-﫿]')
+_SPACES = re.compile(r'\s+')
+_SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+([,.!?;:])')
+_MISSING_SPACE = re.compile(r'([,!?;:])(?=[A-Za-z])')  # 全角逗号后通常没有空格
+# 英文部分的全角标点（全角字母和数字由NFKC处理）
+_ENGLISH_PUNCTUATION = str.maketrans({
+    '，': ',', '。': '.', '！': '!', '？': '?', '；': ';', '：': ':',
+    '“': '"', '”': '"', '‘': "'", '’': "'", '（': '(', '）': ')', '、': ',',
+})
+
+
+def strip_citations(text):
+    """删除 "[9,10](@ref)" 形式的引用标记"""
+    return _CITATION.sub('', text)
+
+
+def clean_english(text):
+    """英文例句：全角字符转半角，统一空白"""
+    text = unicodedata.normalize('NFKC', text).translate(_ENGLISH_PUNCTUATION)
+    text = _SPACE_BEFORE_PUNCTUATION.sub(r'\1', _SPACES.sub(' ', text))
+    text = _MISSING_SPACE.sub(r'\1 ', text)
+    return text.strip()
+
+
+def clean_chinese(text):
+    """中文翻译：删除多余的下划线，统一空白"""
+    return _SPACES.sub(' ', _TRANSLATION_SEPARATOR.sub('', text)).strip()
+
+
+def split_pair(text):
+    """一条例句拆分为 (英文, 中文)：以第一个下划线分隔，没有下划线时从第一个汉字处分开"""
+    parts = _TRANSLATION_SEPARATOR.split(text, maxsplit=1)
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    match = _CJK.search(text)
+    if match is None:
+        return text, ''
+    return text[:match.start()], text[match.start():]
+
+
+def normalize_examples(english, field):
+    """清洗一个例句字段，返回 (合格例句 [(英文, 中文)], 拒绝 [(原文, 原因)])"""
+    examples, rejects, seen = [], [], set()
+    for raw in _EXAMPLE_SEPARATOR.split(strip_citations(field or '')):
+        if not raw.strip():
+            continue
+        en, zh = split_pair(raw)
+        en, zh = clean_english(en), clean_chinese(zh)
+        if not en:
+            rejects.append((raw, EMPTY))
+        elif not zh:
+            rejects.append((raw, NO_TRANSLATION))
+        elif find_answer(en, english, partial=False) is None:
+            rejects.append((raw, NO_HEADWORD))
+        elif en.casefold() in seen:
+            rejects.append((raw, DUPLICATE))
+        else:
+            seen.add(en.casefold())
+            examples.append((en, zh))
+    return examples, rejects
+
+
+def normalize_record(word_data):
+    """清洗一个单词，返回 (清洗后的单词数据, 报告 [(例句, 原因)])
+
+    第一条合格例句写入 example，其余合格例句以 "英文_中文" 形式记入报告（DROPPED_EXTRA）。
+    """
+    english = word_data['english'].strip()
+    cleaned = {**word_data, 'english': english, 'chinese': (word_data.get('chinese') or '').strip()}
+    examples, rejects = normalize_examples(english, word_data.get('example'))
+    cleaned.pop('example', None)
+    if examples:
+        cleaned['example'], *extra = [f"{en}_{zh}" for en, zh in examples]
+        rejects += [(example, DROPPED_EXTRA) for example in extra]
+    return cleaned, rejects
+
+
+def normalize_chunk(records):
+    """子进程任务：清洗一块 (单词数据, 是否已掌握)，结果在子进程中序列化并拼接为整段文本，
+    主进程只需原样写出（传回主进程的是几个长字符串，而不是大量小对象）
+
+    返回 ({是否已掌握: (单词JSON文本, 单词数)}, 报告文本, 合格例句数, 各原因的条数（含DROPPED_EXTRA）)
+    """
+    words = {False: [], True: []}
+    reject_lines, kept, reasons = [], 0, Counter()
+    for word_data, mastered in records:
+        cleaned, rejects = normalize_record(word_data)
+        words[mastered].append(json.dumps(cleaned, ensure_ascii=False))
+        kept += 'example' in cleaned
+        for raw, reason in rejects:
+            kept += reason == DROPPED_EXTRA
+            reasons[reason] += 1
+            reject_lines.append(json.dumps({'english': cleaned['english'], 'example': raw, 'reason': reason},
+                                           ensure_ascii=False) + '\n')
+    sections = {mastered: (DeckWriter.SEPARATOR.join(lines), len(lines)) for mastered, lines in words.items()}
+    return sections, ''.join(reject_lines), kept, reasons
+
+
+def iter_chunks(records, chunk_size, stats):
+    """把记录流切分为列表；无效记录（没有英文单词）跳过并计入 stats.invalid"""
+    chunk = []
+    for word_data, mastered in records:
+        if not word_data or not str(word_data.get('english', '')).strip():
+            stats.invalid += 1
+            continue
+        chunk.append((word_data, mastered))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class NormalizeStats:
+    """清洗结果：单词数、合格/未写入词库/拒绝的例句数（按原因）、无效记录数和吞吐量"""
+
+    def __init__(self):
+        self.words = 0
+        self.examples = 0  # 全部合格例句（包括只写入报告的）
+        self.invalid = 0
+        self.rejects = Counter()
+        self.seconds = 0.0
+
+    @property
+    def extra(self):
+        """合格但没有写入词库、只记入报告的例句数"""
+        return self.rejects[DROPPED_EXTRA]
+
+    @property
+    def rejected(self):
+        return sum(self.rejects.values()) - self.extra
+
+    @property
+    def words_per_s(self):
+        return self.words / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        reasons = '，'.join(f"{reason} {count}" for reason, count in self.rejects.most_common()
+                           if reason != DROPPED_EXTRA)
+        return (f"单词 {self.words} 个 | 合格例句 {self.examples} 条（{self.extra} 条只写入报告） | "
+                f"拒绝 {self.rejected} 条"
+                f"{f'（{reasons}）' if reasons else ''} | 无效记录 {self.invalid} 条 | "
+                f"{self.words_per_s:.0f} 个/秒")
+
+
+def _map_chunks(chunks, workers):
+    """按原顺序产生每块的结果；并行时最多同时提交 workers*2 块，内存占用有界"""
+    if workers <= 1:
+        yield from map(normalize_chunk, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(normalize_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def normalize_deck(source, target, rejects_path=None, workers=None, chunk_size=CHUNK_SIZE, fmt=None):
+    """流式清洗词库文件，原子写入与 words.txt 相同格式的新词库
+
+    workers: 进程数（默认为CPU核数，1表示在当前进程中处理）
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = NormalizeStats()
+    start = time.perf_counter()
+    reject_out = open(rejects_path, 'w', encoding='utf-8') if rejects_path else None
+    try:
+        with DeckWriter(target) as writer:
+            chunks = iter_chunks(iter_records(source, fmt), chunk_size, stats)
+            for sections, reject_text, kept, reasons in _map_chunks(chunks, workers):
+                for mastered, (text, count) in sections.items():
+                    writer.write_text(text, count, mastered)
+                    stats.words += count
+                if reject_out is not None:
+                    reject_out.write(reject_text)
+                stats.examples += kept
+                stats.rejects.update(reasons)
+    finally:
+        if reject_out is not None:
+            reject_out.close()
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def make_messy_deck(path, size, seed=0):
+    """合成带有各种问题的词库（基准用）：多条例句、引用标记、全角标点、缺少单词的例句"""
+    import random
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"all_words": [')
+        for i in range(size):
+            english = f"word{i}"
+            parts = [f"We saw the {english} near the lake today_我们今天在湖边看到了{i}",
+                     f"The {english} was here，really_它真的在这里 [{i % 9},{i % 7}](@ref)",
+                     f"Nothing to see here_这里什么都没有"]
+            rng.shuffle(parts)
+            data = {'english': english, 'chinese': f"释义{i}", 'success_count': i % 8,
+                    'next_review_date': '2025-01-01', 'example': ' | '.join(parts)}
+            f.write((',' if i else '') + json.dumps(data, ensure_ascii=False))
+        f.write(']}')
+
+
+def bench(size, worker_counts, progress=print):
+    """在合成词库上测量不同进程数的吞吐量，返回 [(进程数, 单词/秒)]"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'messy.json')
+        make_messy_deck(source, size)
+        for workers in worker_counts:
+            stats = normalize_deck(source, os.path.join(tmp, 'clean.json'), workers=workers)
+            results.append((workers, stats.words_per_s))
+            if progress:
+                speedup = stats.words_per_s / results[0][1]
+                progress(f"  {workers} 个进程: {stats.words_per_s:.0f} 个/秒（{speedup:.2f}x）")
+    return results
+
+
+def main(argv=None):
+    import argparse
+    import sys
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['bench']:
+        parser = argparse.ArgumentParser(description="测量词库清洗的多核扩展")
+        parser.add_argument('--size', type=int, default=1000000)
+        parser.add_argument('--workers', default=','.join(
+            str(n) for n in sorted({1, 2, 4, os.cpu_count() or 1})))
+        args = parser.parse_args(argv[1:])
+        print(f"⏱ 清洗 {args.size} 个单词:")
+        bench(args.size, [int(n) for n in args.workers.split(',')])
+        return
+
+    parser = argparse.ArgumentParser(description="清洗词库中的例句")
+    parser.add_argument('source', help="原词库（JSON/CSV/TSV）")
+    parser.add_argument('target', help="清洗后的词库（JSON）")
+    parser.add_argument('--rejects', help="报告：拒绝的例句和没有写入词库的合格例句（JSON Lines）")
+    parser.add_argument('--workers', type=int, help="进程数（默认为CPU核数）")
+    parser.add_argument('--format', choices=('json', 'csv', 'tsv'), help="原词库格式（默认自动判断）")
+    args = parser.parse_args(argv)
+    stats = normalize_deck(args.source, args.target, args.rejects, args.workers, fmt=args.format)
+    print(f"✅ 清洗完成: {stats.summary()}")
+    if args.rejects:
+        print(f"📄 报告已写入 {args.rejects}")
+    elif stats.extra:
+        print(f"⚠️ {stats.extra} 条合格例句没有写入词库，请使用 --rejects 保存报告")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""例句预取：复习时在后台线程中提前获取后续单词的例句"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class ExamplePrefetcher:
+    """按复习顺序在线程池中预取例句
+
+    - 最多只提交当前单词之后lookahead个单词的任务（有界队列）
+    - 用户在作答第k个单词时，第k+1个单词的例句已在后台获取
+    - close() 取消尚未开始的任务，可配合 with 语句使用
+    """
+
+    def __init__(self, fetch, words, lookahead=3, max_workers=2):
+        self._fetch = fetch
+        self._words = list(words)
+        self._lookahead = lookahead
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._futures = {}    # 序号 -> Future
+        self._submitted = 0   # 已提交到的序号
+        self._closed = False
+
+    def __enter__(self):
+        self._fill(0)
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _fill(self, current):
+        """提交 [current, current + lookahead] 范围内尚未提交的单词"""
+        end = min(len(self._words), current + self._lookahead + 1)
+        while not self._closed and self._submitted < end:
+            index = self._submitted
+            word = self._words[index]
+            if word.example:
+                # 已有例句（在当前线程读取，避免在工作线程中访问存储）
+                future = Future()
+                future.set_result(word.example)
+            else:
+                future = self._executor.submit(self._fetch, word)
+            self._futures[index] = future
+            self._submitted += 1
+
+    def take(self, index):
+        """取得第index个单词例句的Future（可用 asyncio.wrap_future 等待），并继续预取后续单词"""
+        self._fill(index)
+        future = self._futures.pop(index)
+        self._fill(index + 1)
+        return future
+
+    def get(self, index):
+        """取得第index个单词的例句（必要时等待），并继续预取后续单词"""
+        return self.take(index).result()
+
+    def close(self):
+        """取消未开始的预取任务，不等待正在进行的请求"""
+        self._closed = True
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._executor.shutdown(wait=False)
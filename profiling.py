@@ -0,0 +1,93 @@
+"""性能剖析：为复习流程中的关键调用计时，退出时输出各阶段耗时（p50/p95）
+
+未开启时不做任何事：只有调用 Profiler.instrument（python reciter.py --profile）
+才会把目标方法替换为计时版本，正常运行的代码路径上没有额外开销。
+开启后每次调用只多两次 perf_counter 和一次列表追加。
+
+可选输出 Chrome trace（chrome://tracing 或 https://ui.perfetto.dev 打开）。
+"""
+
+import functools
+import json
+import os
+import statistics
+import threading
+import time
+
+
+class Profiler:
+    """按名称收集调用耗时"""
+
+    def __init__(self, trace=False):
+        self.durations = {}  # 名称 -> [耗时(秒)]
+        self.events = [] if trace else None  # Chrome trace：(名称, 开始, 结束, 线程)
+        self._origin = time.perf_counter()
+        self._patched = []   # (类, 属性名, 原始属性)，用于恢复
+
+    def _record(self, name, start, end):
+        self.durations.setdefault(name, []).append(end - start)
+        if self.events is not None:
+            self.events.append((name, start, end, threading.get_ident()))
+
+    def wrap(self, name, func):
+        """返回计时版本的func"""
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._record(name, start, time.perf_counter())
+        return timed
+
+    def instrument(self, cls, spans):
+        """把cls上的方法替换为计时版本（spans: {方法名: 阶段名}）"""
+        for attr, name in spans.items():
+            original = cls.__dict__[attr]
+            if isinstance(original, staticmethod):
+                patched = staticmethod(self.wrap(name, original.__func__))
+            else:
+                patched = self.wrap(name, original)
+            setattr(cls, attr, patched)
+            self._patched.append((cls, attr, original))
+
+    def uninstrument(self):
+        """恢复所有被替换的方法"""
+        while self._patched:
+            cls, attr, original = self._patched.pop()
+            setattr(cls, attr, original)
+
+    def summary(self):
+        """各阶段的 调用次数、总耗时、p50、p95、最大值（毫秒），按总耗时降序"""
+        rows = []
+        for name, values in self.durations.items():
+            values = sorted(values)
+            if len(values) > 1:
+                cuts = statistics.quantiles(values, n=100, method='inclusive')
+                p50, p95 = cuts[49], cuts[94]
+            else:
+                p50 = p95 = values[0]
+            rows.append({'name': name, 'calls': len(values), 'total_ms': sum(values) * 1000,
+                         'p50_ms': p50 * 1000, 'p95_ms': p95 * 1000, 'max_ms': values[-1] * 1000})
+        rows.sort(key=lambda row: -row['total_ms'])
+        return rows
+
+    def print_summary(self):
+        from prettytable import PrettyTable
+
+        table = PrettyTable()
+        table.title = "⏱ 各阶段耗时"
+        table.field_names = ["阶段", "调用次数", "总耗时", "p50", "p95", "最大"]
+        for row in self.summary():
+            table.add_row([row['name'], row['calls'], f"{row['total_ms']:.1f}ms", f"{row['p50_ms']:.2f}ms",
+                           f"{row['p95_ms']:.2f}ms", f"{row['max_ms']:.2f}ms"])
+        print(table)
+
+    def write_chrome_trace(self, path):
+        """写入Chrome trace格式的JSON（需要以trace=True创建）"""
+        pid = os.getpid()
+        events = [{'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                   'ts': (start - self._origin) * 1e6, 'dur': (end - start) * 1e6}
+                  for name, start, end, tid in self.events or ()]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
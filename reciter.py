@@ -1,15 +1,17 @@
 import os
+import sys
 import json
 import random
+import time
 from datetime import date, timedelta
-from pathlib import Path
-from gtts import gTTS
-from playsound import playsound
-from prettytable import PrettyTable
-from tencentcloud.hunyuan.v20230901 import hunyuan_client, models
-from tencentcloud.common import credential
 import re
-import readchar
+from storage import open_storage, word_key
+from scheduler import MasteredSelector, ReviewScheduler
+from example_cache import ExampleCache
+from corpus import WordNetExampleIndex
+from dashboard import DeckStats, StatusFilter, page_count, paginate
+from srs import EbbinghausAlgorithm, FSRSAlgorithm, create_algorithm
+# prettytable、readchar、腾讯云SDK、线程池等依赖在首次使用时才导入，保证启动速度
 
 
 # 配置项
@@ -17,12 +19,46 @@ class Config:
     WORD_FILE = "words.txt"
     DATA_FILE = "learning_data.json"
     EXAMPLE_DB = "word_examples.json"
+    WORDNET_INDEX = "wordnet_examples.db"  # WordNet例句索引（python corpus.py build 生成）
+    EXAMPLE_CACHE = "example_cache.json"  # 混元例句缓存
+    EXAMPLE_CACHE_MAX_ENTRIES = 10000     # 例句缓存最多条目数，超出后淘汰最久未使用的
+    EXAMPLE_CACHE_TTL_DAYS = 90           # 例句缓存有效期（天），过期后重新获取
+    PREFETCH_LOOKAHEAD = 3  # 复习时在后台提前获取后续几个单词的例句
+    PREFETCH_WORKERS = 2    # 例句预取线程数
+    HUNYUAN_BATCH_TOKEN_BUDGET = 2000   # 批量生成例句时每个请求的token预算
+    HUNYUAN_BATCH_CONCURRENCY = 4       # 批量生成例句的并发请求数
+    HUNYUAN_REQUESTS_PER_SECOND = 5     # 混元请求速率上限
+    HUNYUAN_BATCH_RETRIES = 2           # 批量生成失败的单词最多重试几轮
     MAX_SUCCESS_COUNT = 8  # 成功8次即掌握（基于艾宾浩斯遗忘曲线）
     TTS_ENABLED = True      # 是否启用语音功能
+    TTS_BACKEND = "auto"    # 语音后端：auto、say（macOS）、espeak（Linux）、null（静音）
+    TTS_CACHE_DIR = "tts_cache"  # 合成的例句音频缓存目录
+    TTS_PRERENDER_AHEAD = 5      # 复习时提前合成后续几个单词的例句音频
     MAX_REVIEW_ROUND = 8    # 最大复习轮次（基于艾宾浩斯遗忘曲线）
     # 艾宾浩斯遗忘曲线复习间隔：5分钟、30分钟、12小时、1天、2天、4天、7天、15天、30天
     # 这里简化为：1天、2天、4天、7天、15天、30天、60天、90天（更符合长期记忆规律）
     REVIEW_INTERVAL_DAYS = [1, 2, 4, 7, 15, 30, 60, 90]  # 基于艾宾浩斯遗忘曲线的复习间隔
+    SRS_ALGORITHM = "ebbinghaus"  # 复习间隔算法：ebbinghaus（上面的间隔表）、sm2、fsrs
+    MASTERED_REVIEW_POLICY = "count"  # 已掌握词汇的复习顺序：count（复习次数少、久未复习的优先）、decay（最可能遗忘的优先）
+    MASTERED_REVIEW_BATCH = 10        # 每次复习的已掌握单词数
+    FSRS_DESIRED_RETENTION = 0.9  # fsrs算法：在记忆保持率降到该值时安排复习
+    JOURNAL_COMPACT_THRESHOLD = 500  # 复习日志累计多少条后压缩为完整快照
+    STORAGE_BACKEND = "json"  # 存储后端：json（快照+复习日志）、sqlite（带索引的数据库）或 binary（内存映射的二进制快照+复习日志）
+    SQLITE_FILE = "learning_data.db"  # sqlite后端的数据库文件（可用 python storage.py migrate 从JSON迁移）
+    BINARY_FILE = "learning_data.bin"  # binary后端的快照文件（可用 python snapshot.py to-binary 从JSON转换）
+    IMPORT_BATCH_SIZE = 1000  # 导入单词时每批写入存储的单词数
+    STATUS_PAGE_SIZE = 20     # 学习进度看板每页显示的单词数
+    FORECAST_DAYS = 30        # 复习量预测的默认天数
+    FORECAST_ACCURACY = 0.85  # 复习量预测中"按正确率"情景的默认正确率
+    EVENT_LOG_ENABLED = True  # 是否记录每次作答的复习事件（python analytics.py 分析）
+    EVENT_LOG = "review_events.bin"  # 复习事件日志（词表保存在同名的.vocab文件中）
+    SERVER_DB = "classroom.db"    # 多用户模式的数据库（python server.py）
+    SERVER_HOST = "127.0.0.1"
+    SERVER_PORT = 8765
+    SERVER_POOL_SIZE = 8          # 多用户模式的数据库连接数
+
+# 中文字符及常见中文标点（范围包含大部分常用汉字和中文符号）
+_CHINESE_PATTERN = re.compile(r'[\u4e00-\u9fff\u3000-\u303f\uff00-\uffef]+')
 
 # 腾讯混元大模型集成（需自行实现）
 class HunyuanGenerator:
@@ -37,6 +73,8 @@ class HunyuanGenerator:
         # 初始化腾讯混元大模型（仅在提供了有效的secret_id和secret_key时）
         if secret_id and secret_key:
             try:
+                from tencentcloud.common import credential
+                from tencentcloud.hunyuan.v20230901 import hunyuan_client
                 cred = credential.Credential(secret_id, secret_key)
                 self.client = hunyuan_client.HunyuanClient(cred, "ap-beijing")
             except Exception as e:
@@ -44,12 +82,11 @@ class HunyuanGenerator:
                 self.client = None
         else:
             self.client = None
+    @staticmethod
     def split_ch_en(text):
-        # 匹配中文字符及常见中文标点（范围包含大部分常用汉字和中文符号）
-        ch_pattern = re.compile(r'[\u4e00-\u9fff\u3000-\u303f\uff00-\uffef]+')
-        
-        # 查找第一个中文字符的位置
-        match = ch_pattern.search(text)
+        """把"英文 中文"形式的文本拆分为 (英文, 中文)"""
+        # 从第一个中文字符或中文标点处拆分
+        match = _CHINESE_PATTERN.search(text)
         if not match:
             return text.strip(), ''
         
@@ -60,143 +97,399 @@ class HunyuanGenerator:
     
     def get_example(self, word):
         """获取包含指定单词的例句"""
+        # 验证输入
+        if not word or not isinstance(word, str):
+            print("⚠️ 无效的单词输入")
+            return None
+
+        example = self.generate_example(word)
+        if example:
+            return example
+
+        # 返回本地例句库中的例句
+        if word.lower() in self.local_db:
+            return random.choice(self.local_db[word.lower()])
+        
+        # 生成默认例句
+        return f"This is an example sentence with {word}_这是一个包含{word}的例句"
+
+    def generate_example(self, word):
+        """通过腾讯混元大模型生成例句，模型不可用或请求失败时返回None"""
         try:
-            # 验证输入
-            if not word or not isinstance(word, str):
-                print("⚠️ 无效的单词输入")
-                return None
-            
             # 如果腾讯混元大模型可用，优先使用
             if self.client:
-                # 准备请求
-                req = models.ChatCompletionsRequest()
-                req.Model = "hunyuan-lite"
-                req.Messages = [
-                    {
-                        "Role": "user",
-                        "Content": f"请生成一包含英文单词'{word}'的例句，全部小写字母, 带中文翻译。输出格式为英文例句_中文翻译, 不要其他多余的输出"
-                    }
-                ]
-            
-                # 设置超时时间
-                self.client.set_timeout(10)  # 10秒超时
-            
-                # 发送请求
-                resp = self.client.ChatCompletions(req)
-                
-                # 处理响应
-                if not resp or not resp.Choices:
-                    print("⚠️ 未获取到有效响应")
-                else:
+                content = self._chat(f"请生成一包含英文单词'{word}'的例句，全部小写字母, 带中文翻译。输出格式为英文例句_中文翻译, 不要其他多余的输出")
+                if content:
                     # 解析响应
-                    raw_list = resp.Choices[0].Message.Content.split('\n')
+                    raw_list = content.split('\n')
                     if raw_list:
                         # 返回随机例句
                         return random.choice(raw_list)
         
         except Exception as e:
             print(f"⚠️ 获取例句失败: {str(e)}")
-            
-        # 返回本地例句库中的例句
-        if word.lower() in self.local_db:
-            return random.choice(self.local_db[word.lower()])
-        
-        # 生成默认例句
-        return f"This is an example sentence with {word}_这是一个包含{word}的例句"
+        return None
+
+    def get_examples(self, words):
+        """批量获取例句：按token预算合并请求、并发发送、只重试失败的单词
+
+        返回 {单词: 例句}，模型不可用或重试后仍失败的单词不在结果中。
+        """
+        if not self.client:
+            return {}
+        from hunyuan_batch import BatchExampleGenerator
+        generator = BatchExampleGenerator(
+            self._chat,
+            token_budget=Config.HUNYUAN_BATCH_TOKEN_BUDGET,
+            max_concurrency=Config.HUNYUAN_BATCH_CONCURRENCY,
+            requests_per_second=Config.HUNYUAN_REQUESTS_PER_SECOND,
+            max_retries=Config.HUNYUAN_BATCH_RETRIES
+        )
+        return generator.generate(words)
+
+    def _chat(self, content):
+        """发送一轮对话请求，返回模型回复文本"""
+        from tencentcloud.hunyuan.v20230901 import models
+
+        # 准备请求
+        req = models.ChatCompletionsRequest()
+        req.Model = "hunyuan-lite"
+        req.Messages = [
+            {
+                "Role": "user",
+                "Content": content
+            }
+        ]
+
+        # 设置超时时间
+        self.client.set_timeout(10)  # 10秒超时
+
+        # 发送请求
+        resp = self.client.ChatCompletions(req)
+
+        # 处理响应
+        if not resp or not resp.Choices:
+            print("⚠️ 未获取到有效响应")
+            return None
+        return resp.Choices[0].Message.Content
 
 # 单词类
+_NOT_LOADED = object()  # 例句尚未从存储中读出
+
+
 class Word:
+    # 使用__slots__避免每个实例携带__dict__；日期以序数保存；例句可延迟加载
+    __slots__ = ('english', 'chinese', 'success_count', 'review_day', '_example',
+                 '_example_loader', 'review_round', 'review_count',
+                 'ease', 'interval', 'stability', 'difficulty')
+
+    # 复习算法的记忆状态（见srs.py），使用默认的间隔表时均为None
+    MEMORY_FIELDS = ('ease', 'interval', 'stability', 'difficulty')
+
     def __init__(self, english, chinese, success_count=0, next_review_date=None, example=None, 
-                 review_round=0, review_count=0):
+                 review_round=0, review_count=0, ease=None, interval=None, stability=None,
+                 difficulty=None):
         self.english = english
-        self.chinese = chinese
+        self.chinese = sys.intern(chinese) if isinstance(chinese, str) else chinese
         self.success_count = success_count
-        self.next_review_date = next_review_date or date.today()
-        self.example = example
+        self.review_day = (next_review_date or date.today()).toordinal()  # 下次复习日期（日期序数）
+        self._example = example
+        self._example_loader = None
         self.review_round = review_round  # 当前复习轮次
         self.review_count = review_count  # 总复习次数
+        self.ease = ease              # SM-2难度系数
+        self.interval = interval      # 上次安排的复习间隔（天）
+        self.stability = stability    # FSRS记忆稳定性（天）
+        self.difficulty = difficulty  # FSRS难度（1~10）
+
+    @property
+    def next_review_date(self):
+        return date.fromordinal(self.review_day)
+
+    @next_review_date.setter
+    def next_review_date(self, value):
+        self.review_day = value.toordinal()
+
+    @property
+    def example(self):
+        """例句：未加载时在首次访问时从存储中读取"""
+        if self._example is _NOT_LOADED:
+            self._example = self._example_loader(self.english)
+            self._example_loader = None
+        return self._example
+
+    @example.setter
+    def example(self, value):
+        self._example = value
+        self._example_loader = None
 
     def to_dict(self):
-        return {
+        data = {
             'english': self.english,
             'chinese': self.chinese,
             'success_count': self.success_count,
             'next_review_date': self.next_review_date.isoformat(),
-            'example': self.example,
+            'example': self._example,
             'review_round': self.review_round,
             'review_count': self.review_count
         }
+        if self._example is _NOT_LOADED:
+            # 例句仍保存在存储中，不为了序列化而读出
+            del data['example']
+        if any(getattr(self, field) is not None for field in self.MEMORY_FIELDS):
+            # 没有记忆状态时保持原有数据格式
+            for field in self.MEMORY_FIELDS:
+                data[field] = getattr(self, field)
+        return data
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, example_loader=None):
+        """example_loader: 数据中不含例句时，用于按英文单词延迟读取例句"""
         data['next_review_date'] = date.fromisoformat(data['next_review_date'])
         # 兼容旧版本数据
         data.setdefault('review_round', 0)
         data.setdefault('review_count', 0)
-        return cls(**data)
+        if 'example' in data or example_loader is None:
+            return cls(**data)
+        word = cls(**data)
+        word._example = _NOT_LOADED
+        word._example_loader = example_loader
+        return word
 
 # 核心背诵系统
 class WordReciter:
     def __init__(self):
         self.hunyuan = HunyuanGenerator("", "")
-        self.all_words = []        # 待复习单词
-        self.mastered_words = []   # 已掌握单词
+        self._all_words = None       # 待复习单词（首次访问时加载）
+        self._mastered_words = None  # 已掌握单词（首次访问时加载）
+        self._detached = {}          # 未加载全部数据时通过索引单独读出的到期单词
+        self._scheduler = None       # 复习调度器（按需构建）
+        self._graduated = set()      # 本次会话已掌握、尚未从待复习列表中移除的单词id
+        self._deck_stats = None      # 统计计数（按需构建，之后增量更新）
+        self._mastered_selector = None  # 已掌握单词的选择索引（按需构建，之后增量更新）
+        self.algorithm = self._create_algorithm()  # 复习间隔算法
         self.today = date.today()
-        self.current_review_round = 0  # 当前复习轮次
-        
-        # 初始化数据
-        self.example_db = self._load_example_db()
-        self._load_data()
-        self._process_overdue_words()
-        self._update_review_round()  # 更新复习轮次
+        self._current_review_round = None  # 当前复习轮次（首次使用时计算）
+        self._example_db = None            # 本地例句库（首次使用时加载）
+        self._tts = None                   # 语音引擎（首次朗读时创建）
+        self._event_log = None             # 复习事件日志（首次作答时打开）
+        self.storage = open_storage(Config.STORAGE_BACKEND, Config.DATA_FILE, Config.SQLITE_FILE,
+                                    Config.BINARY_FILE)
+
+        # 例句来源：各自在首次查询时才打开文件，单词数据也在菜单操作需要时才加载
+        self.corpus = WordNetExampleIndex(Config.WORDNET_INDEX)
+        self.example_cache = ExampleCache(Config.EXAMPLE_CACHE, Config.EXAMPLE_CACHE_MAX_ENTRIES,
+                                          Config.EXAMPLE_CACHE_TTL_DAYS)
+
+    @property
+    def current_review_round(self):
+        """当前复习轮次"""
+        if self._current_review_round is None:
+            self._update_review_round()
+        return self._current_review_round
+
+    @current_review_round.setter
+    def current_review_round(self, value):
+        self._current_review_round = value
+
+    @property
+    def max_success_count(self):
+        """掌握一个单词所需的答对次数"""
+        return Config.MAX_SUCCESS_COUNT
+
+    @property
+    def tts(self):
+        """语音引擎"""
+        if self._tts is None:
+            from tts import TTSEngine, create_backend
+            self._tts = TTSEngine(create_backend(Config.TTS_BACKEND), Config.TTS_CACHE_DIR)
+        return self._tts
+
+    @property
+    def event_log(self):
+        """复习事件日志"""
+        if self._event_log is None:
+            from events import EventLog
+            self._event_log = EventLog(Config.EVENT_LOG)
+        return self._event_log
+
+    @property
+    def example_db(self):
+        """本地例句库"""
+        if self._example_db is None:
+            self._example_db = self._load_example_db()
+        return self._example_db
+
+    @property
+    def all_words(self):
+        """待复习单词"""
+        if self._all_words is None:
+            self._load_data()
+        return self._all_words
+
+    @all_words.setter
+    def all_words(self, words):
+        self._all_words = words
+        self._scheduler = None
+        self._graduated = set()
+        self._deck_stats = None
+
+    @property
+    def mastered_words(self):
+        """已掌握单词"""
+        if self._mastered_words is None:
+            self._load_data()
+        return self._mastered_words
+
+    @mastered_words.setter
+    def mastered_words(self, words):
+        self._mastered_words = words
+        self._deck_stats = None
+        self._mastered_selector = None
+
+    @staticmethod
+    def _create_algorithm():
+        options = {}
+        if Config.SRS_ALGORITHM == 'fsrs':
+            options['desired_retention'] = Config.FSRS_DESIRED_RETENTION
+        return create_algorithm(Config.SRS_ALGORITHM, Config.REVIEW_INTERVAL_DAYS, **options)
+
+    def _use_index(self):
+        """数据尚未整体加载且存储支持索引查询"""
+        return self._all_words is None and self.storage.indexed
+
+    def _word_counts(self):
+        """返回 (待复习单词数, 已掌握单词数)"""
+        stats = self._get_deck_stats()
+        return stats.pending, stats.mastered
+
+    def _get_deck_stats(self):
+        """统计计数：首次使用时由存储聚合查询或已加载的列表构建，之后随复习结果增量更新"""
+        if self._deck_stats is None:
+            if self._use_index():
+                self._deck_stats = DeckStats.from_storage(self.storage)
+            else:
+                self._flush_graduated()
+                self._deck_stats = DeckStats.from_words(self.all_words, self.mastered_words)
+        return self._deck_stats
+
+    def _count_review(self, word, mastered=False):
+        """复习次数加1，同时更新统计计数"""
+        word.review_count += 1
+        if self._deck_stats is not None:
+            self._deck_stats.reviewed(word, mastered)
+
+    def _get_scheduler(self):
+        """复习调度器：首次使用时由待复习列表构建，之后增量更新"""
+        if self._scheduler is None:
+            self._flush_graduated()
+            self._scheduler = ReviewScheduler(self.all_words, self.today)
+        return self._scheduler
+
+    def _graduate(self, word):
+        """单词转入已掌握列表：调度器中O(1)移除，待复习列表在会话结束或保存时统一清理
+
+        未整体加载（索引模式）时不加载列表，由调用方以已掌握状态写入存储。
+        """
+        self._schedule_consolidation(word)
+        if self._mastered_words is not None:
+            self._mastered_words.append(word)
+            if self._mastered_selector is not None:
+                self._mastered_selector.add(word)
+        if self._use_index():
+            self._detached.pop(word_key(word.english), None)
+        else:
+            self._get_scheduler().remove(word)
+            self._graduated.add(id(word))
+        if self._deck_stats is not None:
+            self._deck_stats.graduate(word)
+
+    def _flush_graduated(self):
+        """从待复习列表中一次性移除已掌握的单词"""
+        if self._graduated:
+            self._all_words = [w for w in self._all_words if id(w) not in self._graduated]
+            self._graduated = set()
 
     def show_mastered_words(self):
-        """显示已掌握词汇"""
-        if not self.mastered_words:
+        """显示已掌握词汇（分页）"""
+        mastered_count = self._get_deck_stats().mastered
+        if not mastered_count:
             print("\n📚 您还没有掌握任何单词")
             return
-            
-        table = PrettyTable()
-        table.title = "🎓 已掌握词汇"
-        table.field_names = ["英文", "中文", "掌握日期", "复习次数"]
-        
-        for word in self.mastered_words:
-            table.add_row([
-                word.english,
-                word.chinese,
-                word.next_review_date.strftime("%Y-%m-%d"),
-                word.review_count
-            ])
-        
-        print(table)
-        print(f"\n📊 总计已掌握单词: {len(self.mastered_words)}")
 
-    def review_mastered_words(self):
-        """复习已掌握词汇：优先选择复习次数最少的单词，确保不遗漏"""
+        self._browse_words(mastered=True, title="🎓 已掌握词汇")
+        print(f"\n📊 总计已掌握单词: {mastered_count}")
+
+    def review_mastered_words(self, frontend=None):
+        """复习已掌握词汇：按 MASTERED_REVIEW_POLICY 选择单词，确保不遗漏（frontend默认为终端界面）"""
         if not self.mastered_words:
             print("\n📚 您还没有掌握任何单词")
             return
             
-        # 按复习次数排序，优先选择复习次数最少的单词
-        sorted_words = sorted(self.mastered_words, key=lambda w: w.review_count)
-        
-        # 选择前10个单词（复习次数最少的）
-        selected_words = sorted_words[:10]
+        # 从选择索引中取出优先级最高的单词，不再排序整个已掌握列表
+        selector = self._get_mastered_selector()
+        selected_words = selector.select(Config.MASTERED_REVIEW_BATCH)
         
-        print(f"\n📚 开始复习 {len(selected_words)} 个已掌握单词（按复习次数排序）")
+        order = "最可能遗忘的优先" if Config.MASTERED_REVIEW_POLICY == 'decay' else "按复习次数排序"
+        print(f"\n📚 开始复习 {len(selected_words)} 个已掌握单词（{order}）")
         
-        for word in selected_words:
-            self._practice_word(word)
-            # 更新复习次数
-            word.review_count += 1
-            self._save_data()  # 每次复习后立即保存
+        from session import ReviewSession, TerminalFrontend
+        ReviewSession(self, selected_words, mastered=True).run_sync(frontend or TerminalFrontend())
             
+        self.example_cache.save()
+        self._flush_events()
         print("\n📊 本次复习完成！")
         
         # 检查是否所有单词都已复习过至少一次
-        if all(word.review_count > 0 for word in self.mastered_words):
+        if selector.all_reviewed():
             print("🎉 所有已掌握单词已完成第一轮复习！")
-            print("📈 下一轮复习将按复习次数排序，确保公平复习")
+            if Config.MASTERED_REVIEW_POLICY == 'decay':
+                print("📈 下一轮复习将优先选择最可能遗忘的单词")
+            else:
+                print("📈 下一轮复习将按复习次数排序，确保公平复习")
+
+    def _get_mastered_selector(self):
+        """已掌握单词的选择索引：首次使用时建立（日期变化后重建），之后随复习和掌握增量更新"""
+        selector = self._mastered_selector
+        if selector is None or selector.today != self.today.toordinal():
+            selector = MasteredSelector(self.mastered_words, self.today, self._mastered_priority())
+            self._mastered_selector = selector
+        return selector
+
+    def _mastered_priority(self):
+        """已掌握单词的优先级函数（越小越优先）
+
+        已掌握单词复习后按当前间隔安排下次巩固复习，因此上次复习日期 = 下次复习日期 - 当前间隔。
+        只读取单词的记忆状态（estimated_interval），建立索引不会改变未复习单词的数据。
+        - count：复习次数少的优先，相同时距上次复习久的优先
+        - decay：按FSRS遗忘曲线估计今天的记忆保持率，最低的优先（稳定性未知时以当前间隔代替）
+        """
+        estimated_interval = self.algorithm.estimated_interval
+
+        def days_since_seen(word, today):
+            interval = estimated_interval(word)
+            return today - (word.review_day - interval), interval
+
+        if Config.MASTERED_REVIEW_POLICY == 'decay':
+            def priority(word, today):
+                elapsed, interval = days_since_seen(word, today)
+                stability = word.stability or max(interval, 1)
+                return FSRSAlgorithm.retrievability(max(elapsed, 0), stability), word.review_count
+        else:
+            def priority(word, today):
+                return word.review_count, -days_since_seen(word, today)[0]
+        return priority
+
+    def _schedule_consolidation(self, word):
+        """已掌握单词按当前间隔安排下次巩固复习"""
+        word.next_review_date = self.today + timedelta(days=self.algorithm.current_interval(word))
+
+    def _review_mastered(self, word):
+        """记录一次已掌握单词的复习（写入由会话结束时批量完成）"""
+        self._count_review(word, mastered=True)
+        self._schedule_consolidation(word)
+        if self._mastered_selector is not None:
+            self._mastered_selector.update(word)
 
     def _load_example_db(self):
         """加载本地例句库"""
@@ -206,16 +499,12 @@ class WordReciter:
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
 
-    def _process_overdue_words(self):
-        """处理过期单词"""
-        for word in self.all_words:
-            if word.next_review_date < self.today:
-                word.next_review_date = self.today
-
     def _update_review_round(self):
         """更新复习轮次"""
         # 计算当前复习轮次
-        if self.all_words:
+        if self._use_index():
+            self.current_review_round = self.storage.min_round() or 0
+        elif self.all_words:
             min_review_round = min(word.review_round for word in self.all_words)
             self.current_review_round = min_review_round
         else:
@@ -225,8 +514,17 @@ class WordReciter:
 
     def _get_today_review_list(self):
         """获取今日复习列表（轮次复习逻辑）"""
-        # 首先获取所有到期的单词
-        overdue_words = [w for w in self.all_words if w.next_review_date <= self.today]
+        # 已加载的数据由调度器直接给出到期单词
+        if not self._use_index():
+            return self._get_scheduler().due_words(self.current_review_round)
+
+        # 索引范围查询，只构造到期的单词
+        overdue_words = []
+        for data in self.storage.load_due(self.today):
+            key = word_key(data['english'])
+            if key not in self._detached:
+                self._detached[key] = Word.from_dict(data)
+            overdue_words.append(self._detached[key])
         
         if not overdue_words:
             return []
@@ -252,168 +550,256 @@ class WordReciter:
         return min_round_words
 
     def show_status(self):
-        """显示复习状态看板（包含轮次信息）"""
+        """显示复习状态看板（包含轮次信息，分页，可筛选）"""
+        from prettytable import PrettyTable
+
+        # 统计信息来自增量维护的计数，不扫描单词列表
+        deck_stats = self._get_deck_stats()
+        stats = PrettyTable()
+        stats.title = "📊 学习统计"
+        stats.field_names = ["统计项", "数量"]
+        stats.add_row(["当前复习轮次", f"第{self.current_review_round + 1}轮"])
+        stats.add_row(["待复习单词", deck_stats.pending])
+        stats.add_row(["已掌握单词", deck_stats.mastered])
+        stats.add_row(["总单词数", deck_stats.total])
+        if deck_stats.pending:
+            stats.add_row(["平均复习次数", f"{deck_stats.avg_review_count:.1f}"])
+        print(stats)
+
+        self._browse_words(mastered=False, title=f"📅 单词复习看板（第{self.current_review_round + 1}轮）")
+
+    def _browse_words(self, mastered, title):
+        """分页浏览单词，只格式化当前页"""
+        page, status_filter = 0, StatusFilter()
+        while True:
+            words, total = self._status_page(mastered, status_filter, page, Config.STATUS_PAGE_SIZE)
+            pages = page_count(total, Config.STATUS_PAGE_SIZE)
+            table = self._status_table(words, mastered)
+            table.title = f"{title} {status_filter.describe()} | 第{page + 1}/{pages}页 | 共{total}个"
+            print(table)
+
+            command = input("n=下一页 p=上一页 <页码>=跳转 f=筛选 回车=返回: ").strip().lower()
+            if command == 'n':
+                page = min(page + 1, pages - 1)
+            elif command == 'p':
+                page = max(page - 1, 0)
+            elif command.isdigit():
+                page = min(max(int(command) - 1, 0), pages - 1)
+            elif command == 'f':
+                spec = input("筛选条件（r<轮次> d<天数内到期> 关键字，留空清除）: ")
+                status_filter = StatusFilter.parse(spec)
+                page = 0
+            else:
+                return
+
+    def _status_page(self, mastered, status_filter, page, page_size):
+        """返回 (当前页的单词, 符合条件的总数)"""
+        if self._use_index():
+            rows, total = self.storage.page(
+                mastered, page_size, page * page_size, status_filter.review_round,
+                status_filter.due_before(self.today), status_filter.text
+            )
+            return [Word.from_dict(row) for row in rows], total
+
+        self._flush_graduated()
+        words = self.mastered_words if mastered else self.all_words
+        key = None if mastered else (lambda w: (w.review_round, w.review_count, w.review_day))
+        predicate = status_filter.matcher(self.today) if status_filter else None
+        return paginate(words, key, page, page_size, predicate)
+
+    def _status_table(self, words, mastered):
+        from prettytable import PrettyTable
+
         table = PrettyTable()
-        table.title = f"📅 单词复习看板（第{self.current_review_round + 1}轮）"
+        if mastered:
+            table.field_names = ["英文", "中文", "下次巩固复习", "复习次数"]
+            for word in words:
+                table.add_row([
+                    word.english,
+                    word.chinese,
+                    word.next_review_date.strftime("%Y-%m-%d"),
+                    word.review_count
+                ])
+            return table
+
         table.field_names = ["英文", "中文", "掌握进度", "复习轮次", "复习次数", "下次复习", "剩余天数"]
-        
-        for word in sorted(self.all_words, key=lambda x: (x.review_round, x.review_count, x.next_review_date)):
-            remaining_days = (word.next_review_date - self.today).days
+        for word in words:
+            # 过期的单词今天复习（未整体加载时数据库中仍是原日期）
+            next_review_date = max(word.next_review_date, self.today)
+            remaining_days = (next_review_date - self.today).days
             progress_bar = f"{word.success_count}/{Config.MAX_SUCCESS_COUNT} " + \
                           "★"*word.success_count + "☆"*(Config.MAX_SUCCESS_COUNT-word.success_count)
-            
+
             table.add_row([
                 word.english,
                 word.chinese,
                 progress_bar,
                 f"第{word.review_round + 1}轮",
                 word.review_count,
-                word.next_review_date.strftime("%Y-%m-%d"),
+                next_review_date.strftime("%Y-%m-%d"),
                 remaining_days if remaining_days > 0 else "今天"
             ])
-        
-        print(table)
-        
-        # 显示统计信息
-        stats = PrettyTable()
-        stats.title = "📊 学习统计"
-        stats.field_names = ["统计项", "数量"]
-        stats.add_row(["当前复习轮次", f"第{self.current_review_round + 1}轮"])
-        stats.add_row(["待复习单词", len(self.all_words)])
-        stats.add_row(["已掌握单词", len(self.mastered_words)])
-        stats.add_row(["总单词数", len(self.all_words) + len(self.mastered_words)])
-        
-        # 计算平均复习次数
-        if self.all_words:
-            avg_review_count = sum(w.review_count for w in self.all_words) / len(self.all_words)
-            stats.add_row(["平均复习次数", f"{avg_review_count:.1f}"])
-        
-        print(stats)
+        return table
+
+    def forecast(self, days=None, accuracy=None):
+        """预测未来每天到期的单词数，返回 {'perfect': 完全记住, 'accuracy': 按正确率}"""
+        from forecast import forecast_algorithm, forecast_due
+        days = days or Config.FORECAST_DAYS
+        accuracy = Config.FORECAST_ACCURACY if accuracy is None else accuracy
+        today = self.today.toordinal()
+        if isinstance(self.algorithm, EbbinghausAlgorithm):
+            # 固定间隔表只需要到期日和成功次数，可以向量化推演
+            if self._use_index():
+                rows = self.storage.pending_schedule()
+                due_offsets = [date.fromisoformat(d).toordinal() - today for d, _ in rows]
+                success_counts = [s for _, s in rows]
+            else:
+                self._flush_graduated()
+                due_offsets = [w.review_day - today for w in self.all_words]
+                success_counts = [w.success_count for w in self.all_words]
+            args = (due_offsets, success_counts, days, self.algorithm.intervals, Config.MAX_SUCCESS_COUNT)
+
+            def run(scenario_accuracy):
+                return forecast_due(*args, accuracy=scenario_accuracy)
+        else:
+            # SM-2、FSRS的间隔取决于每个单词的记忆状态，逐个单词推演
+            if self._use_index():
+                words = [(date.fromisoformat(d).toordinal() - today, *rest)
+                         for d, *rest in self.storage.pending_schedule(memory=True)]
+            else:
+                self._flush_graduated()
+                words = [(w.review_day - today, w.success_count, w.ease, w.interval, w.stability, w.difficulty)
+                         for w in self.all_words]
+
+            def run(scenario_accuracy):
+                return forecast_algorithm(self.algorithm, words, days, Config.MAX_SUCCESS_COUNT, scenario_accuracy)
+        return {
+            'perfect': run(1.0),
+            'accuracy': run(accuracy)
+        }
+
+    def show_forecast(self):
+        """显示未来的复习量预测直方图"""
+        from forecast import render_histogram
+        try:
+            days = int(input(f"预测天数（默认{Config.FORECAST_DAYS}）: ").strip() or Config.FORECAST_DAYS)
+            accuracy = float(input(f"预计正确率%（默认{Config.FORECAST_ACCURACY * 100:.0f}）: ").strip()
+                             or Config.FORECAST_ACCURACY * 100) / 100
+        except ValueError:
+            print("⚠️ 请输入数字")
+            return
+        if days <= 0 or not 0 < accuracy <= 1:
+            print("⚠️ 天数需大于0，正确率需在0~100之间")
+            return
+
+        result = self.forecast(days, accuracy)
+        for title, scenario in (("✅ 完全记住", result['perfect']),
+                                (f"🎯 正确率 {accuracy * 100:.0f}%", result['accuracy'])):
+            print(f"\n📈 未来{days}天复习量预测（{title}）")
+            print(render_histogram(scenario['due'], self.today))
+            print(f"合计复习 {sum(scenario['due'])} 次 | 期间掌握 {scenario['graduated']} 个单词")
 
     def _get_example(self, word):
-        """获取最佳例句"""
+        """获取最佳例句（混元的结果会写入例句缓存）"""
         if word.example:
             return word.example
             
-        # 优先使用NLTK获取例句
-        try:
-            import nltk
-            from nltk.corpus import wordnet as wn
-            nltk.download('wordnet', quiet=True)
-            synsets = wn.synsets(word.english)
-            if synsets:
-                examples = synsets[0].examples()
-                if examples:
-                    return f"{examples[0]}_这是一个包含{word.chinese}的例句"
-        except Exception as e:
-            print(f"⚠️ NLTK获取例句失败: {str(e)}")
+        # 优先使用本地WordNet例句索引
+        example = self.corpus.lookup(word.english)
+        if example:
+            return f"{example}_这是一个包含{word.chinese}的例句"
             
         # 尝试通过Hunyuan获取例句
-        example = self.hunyuan.get_example(word.english)
-        if example:
-            return example
+        if self.hunyuan.client:
+            example = self._cached_example(word, 'hunyuan', lambda w: self.hunyuan.generate_example(w.english))
+            if example:
+                return example
             
         # 本地例句库
-        if word.english.lower() in self.example_db:
-            return random.choice(self.example_db[word.english.lower()])
+        for example_db in (self.hunyuan.local_db, self.example_db):
+            if word.english.lower() in example_db:
+                return random.choice(example_db[word.english.lower()])
             
         # 生成默认例句
         return f"This is an example sentence with {word.english}_这是一个包含{word.chinese}的例句"
 
+    def _cloze_template(self, word, example):
+        """例句的挖空模板：读取例句缓存中保存的模板（导入、缓存例句时生成），没有时生成并保存"""
+        return self.example_cache.template(word.english, example)
+
+    def _cached_example(self, word, source, fetch):
+        """先查例句缓存，未命中时调用fetch获取并写回；获取失败（返回None）不缓存"""
+        example = self.example_cache.get(word.english, source)
+        if example is None:
+            example = fetch(word)
+            if example is None:
+                return None
+            self.example_cache.put(word.english, source, example)
+        return example
+
     def _text_to_speech(self, text):
-        """文本转语音"""
+        """文本转语音（在后台播放，不阻塞输入）"""
         if not Config.TTS_ENABLED:
             return
-    
-        try:
-            # 确保文本有效
-            if not text or not isinstance(text, str):
-                print("⚠️ 无效的文本输入")
-                return
-    
-            # 提取英文部分
-            en_text = text.split('_')[0]
-            if not en_text:
-                print("⚠️ 无法提取有效的英文文本")
-                return
-            
-            # 使用macOS自带的say命令
-            os.system(f'say "{en_text}"')
-        except Exception as e:
-            print(f"⚠️ 语音生成过程中发生错误: {str(e)}")
 
-    def _practice_word(self, word):
-        """单个单词练习流程"""
-        print(f"\n{'━'*30}")
-        print(f"🔔 当前进度: {word.success_count}/{Config.MAX_SUCCESS_COUNT}")
-        
-        # 显示例句
-        example = self._get_example(word)
-        if '_' in example:
-            first_occurrence = example.index('_')
-            # 保留第一个下划线，后续所有下划线删除
-            example = example[:first_occurrence+1] + example[first_occurrence+1:].replace('_', '')
-
-        if not word.example: 
-            word.example = example
-        
-        en_example, zh_example = example.split('_') if '_' in example else (example, "")
-        
-        # 忽略大小写进行替换
-        lower_en_example = en_example.lower()
-        lower_word = word.english.lower()
-        start_index = lower_en_example.find(lower_word)
-        if start_index != -1:
-            end_index = start_index + len(word.english)
-            blanked_part = '_' * len(word.english) + f"({len(word.english)})"
-            blanked_example = en_example[:start_index] + blanked_part + en_example[end_index:]
-        else:
-            blanked_example = en_example
-        
-        print(f"📖 中文释义: {word.chinese}")
-        print(f"📝 例句: {blanked_example}")
-        if zh_example:
-            print(f"🌏 例句翻译: {zh_example}")
-
-        # 拼写测试
-        attempt = 0
-        while attempt < 3:
-            answer = ""
-            print("请输入英文单词（h=显示答案，s=播放语音）: ", end='', flush=True)
-            while True:
-                char = readchar.readchar()
-                if char == '\n':  # 回车提交答案
-                    break
-                elif char == '\x7f':  # 退格键
-                    if answer: 
-                        answer = answer[:-1]
-                        print(' ', end='', flush=True)  # 清除显示的字符
-                else: 
-                    answer += char
-                    print(char, end='', flush=True)
-                # 在同一行更新输入提示和字母计数
-                print(f"\r已输入 {len(answer)} 个字母。请输入英文单词（h=显示答案，s=播放语音）: {answer}", end='', flush=True)
-
-            answer = answer.strip().lower()
-            if answer == "h":
-                print(f"\n📢 正确答案: {word.english}")
-                return False
-            if answer == "s":
-                self._text_to_speech(example)
-                print("\n")  # 新增换行
-                continue
-            if answer == word.english.lower():
-                print("\n✅ 正确！")
-                self._text_to_speech(example)
-                return True
-            attempt += 1
-            print(f"\n❌ 错误（剩余尝试次数 {3 - attempt}）")
+        # 确保文本有效
+        if not text or not isinstance(text, str):
+            print("⚠️ 无效的文本输入")
+            return
 
-        print(f"\n📢 正确答案: {word.english}")
-        return False
+        # 提取英文部分
+        en_text = text.split('_')[0]
+        if not en_text:
+            print("⚠️ 无法提取有效的英文文本")
+            return
+
+        self.tts.speak(en_text)
+
+    def _prerender_speech(self, words):
+        """为即将复习的单词提前合成例句音频（只处理已有例句的单词）"""
+        if not Config.TTS_ENABLED:
+            return
+        texts = [w.example.split('_')[0] for w in words if w.example]
+        self.tts.prerender(texts)
+
+    def _prerender_ahead(self, words, index):
+        """复习到第index个单词时，提前合成它和后续几个单词的例句音频"""
+        self._prerender_speech(words[index:index + 1 + Config.TTS_PRERENDER_AHEAD])
 
-    def daily_review(self):
-        """执行每日复习（轮次复习逻辑）"""
+    def _prefetch_examples(self, words):
+        """按复习顺序在后台预取例句"""
+        from prefetch import ExamplePrefetcher
+        return ExamplePrefetcher(self._get_example, words, Config.PREFETCH_LOOKAHEAD,
+                                 Config.PREFETCH_WORKERS)
+
+    def _practice_word(self, word, example=None, frontend=None):
+        """单个单词练习流程（example为已预取的例句），返回是否答对"""
+        import asyncio
+        from session import ReviewSession, TerminalFrontend
+
+        if example is None:
+            example = self._get_example(word)
+        session = ReviewSession(self, [word])
+        return asyncio.run(session.practice(frontend or TerminalFrontend(), word, example))
+
+    def _log_attempt(self, word, outcome, attempt, interval, timing, answer=None):
+        """记录一次作答（timing为 出现提示、首次按键、提交 的时刻）"""
+        if not Config.EVENT_LOG_ENABLED:
+            return
+        from events import CORRECT, HINT, REPLAY, WRONG
+        kind = {'correct': CORRECT, 'wrong': WRONG, 'hint': HINT, 'replay': REPLAY}[outcome]
+        prompted, first_key, submitted = timing
+        self.event_log.log(word_key(word.english), kind, attempt, word.success_count,
+                           (first_key - prompted) * 1000, (submitted - prompted) * 1000,
+                           interval, answer)
+
+    def _flush_events(self):
+        """复习结束时把缓冲的事件写入日志文件"""
+        if self._event_log is not None:
+            self._event_log.flush()
+
+    def daily_review(self, frontend=None):
+        """执行每日复习（轮次复习逻辑，frontend默认为终端界面）"""
         review_list = self._get_today_review_list()
         if not review_list:
             print("\n🎉 今日没有需要复习的单词！")
@@ -421,51 +807,15 @@ class WordReciter:
 
         print(f"\n📚 今日需要复习 {len(review_list)} 个单词（第{self.current_review_round + 1}轮）")
         
-        # 初始化统计变量
-        mastered_today = 0
-        correct_count = 0
-        wrong_count = 0
-        total_words = len(review_list)
-        
         # 按复习次数排序，确保复习次数少的单词优先被复习
         review_list.sort(key=lambda w: w.review_count)
         
-        for index, word in enumerate(review_list.copy(), start=1):
-            print(f"\n⏳ 剩余 {total_words - index + 1} 个单词需要复习")
-            success = self._practice_word(word)
-            
-            # 更新统计
-            if success:
-                correct_count += 1
-                word.success_count += 1
-                word.review_count += 1  # 增加复习次数
-                
-                if word.success_count >= Config.MAX_SUCCESS_COUNT:
-                    self.mastered_words.append(word)
-                    self.all_words.remove(word)
-                    mastered_today += 1
-                    print(f"🎉 已掌握单词: {word.english}")
-                else:
-                    # 根据success_count设置间隔天数（艾宾浩斯遗忘曲线）
-                    # 处理边界情况：新单词(success_count=0)应该立即复习
-                    if word.success_count == 0:
-                        delta_days = 0  # 新单词立即复习
-                    else:
-                        success_index = word.success_count - 1
-                        if success_index < len(Config.REVIEW_INTERVAL_DAYS):
-                            delta_days = Config.REVIEW_INTERVAL_DAYS[success_index]
-                        else:
-                            delta_days = Config.REVIEW_INTERVAL_DAYS[-1]  # 使用最大间隔
-                    
-                    word.next_review_date = self.today + timedelta(days=delta_days)
-                    print(f"⏱ 下次复习: {word.next_review_date} (+{delta_days}天，第{word.success_count}次成功)")
-            else:
-                wrong_count += 1
-                word.review_count += 1  # 即使失败也记录复习次数
-                print("⏳ 保持原复习计划")
-            
-            # 检查是否需要进入下一轮复习
-            self._check_and_advance_round()
+        # 复习会话在后台预取后续单词的例句和音频，作答当前单词时下一个单词已准备好
+        from session import ReviewSession, TerminalFrontend
+        result = ReviewSession(self, review_list).run_sync(frontend or TerminalFrontend())
+        total_words, correct_count, wrong_count, mastered_today = result
+
+        self._flush_graduated()
 
         # 计算正确率
         accuracy = 0
@@ -474,6 +824,7 @@ class WordReciter:
 
         # 显示日报
         print("\n📊 今日复习报告:")
+        from prettytable import PrettyTable
         report = PrettyTable()
         report.field_names = ["统计项", "数量"]
         report.add_row(["复习单词总数", total_words])
@@ -482,99 +833,320 @@ class WordReciter:
         report.add_row(["复习正确率", f"{accuracy:.1f}%"])
         report.add_row(["新掌握单词", mastered_today])
         report.add_row(["当前复习轮次", f"第{self.current_review_round + 1}轮"])
-        report.add_row(["当前进度", f"{len(self.mastered_words)} 已掌握 / {len(self.all_words)} 待复习"])
+        pending_count, mastered_count = self._word_counts()
+        report.add_row(["当前进度", f"{mastered_count} 已掌握 / {pending_count} 待复习"])
+        cache_stats = self.example_cache.stats()
+        report.add_row(["例句缓存命中", f"{cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']}"])
         print(report)
-        
-        # 保存进度
-        self._save_data()
+
+        self.example_cache.save()
+        self._flush_events()
+
+    def _apply_review(self, word, success):
+        """记录一次每日复习的结果并写入日志，返回 (是否新掌握, 间隔天数或None)"""
+        if success:
+            word.success_count += 1
+        self._count_review(word)  # 即使失败也记录复习次数
+
+        mastered, delta_days = False, None
+        if success and word.success_count >= Config.MAX_SUCCESS_COUNT:
+            self._graduate(word)
+            mastered = True
+        else:
+            delta_days = self._schedule_next(word, correct=success)
+
+        # 立即写入日志，中途退出也不会丢失进度
+        self._record_word(word, mastered=word.success_count >= Config.MAX_SUCCESS_COUNT)
+        return mastered, delta_days
 
     def _check_and_advance_round(self):
-        """检查并推进复习轮次"""
+        """检查并推进复习轮次，进入新轮次时返回True"""
         # 检查当前轮次的所有单词是否都已复习过
-        current_round_words = [w for w in self.all_words if w.review_round == self.current_review_round]
-        
-        if not current_round_words:
+        if self._use_index():
+            round_finished = not self.storage.has_round(self.current_review_round)
+        else:
+            round_finished = not self._get_scheduler().has_round(self.current_review_round)
+
+        if round_finished:
             # 当前轮次没有单词，进入下一轮
             if self.current_review_round < Config.MAX_REVIEW_ROUND:
                 self.current_review_round += 1
-                print(f"\n🎯 进入第{self.current_review_round + 1}轮复习！")
-                
-                # 更新所有单词的复习轮次
-                for word in self.all_words:
-                    if word.review_round < self.current_review_round:
-                        word.review_round = self.current_review_round
-                        # 根据success_count设置复习间隔（艾宾浩斯遗忘曲线）
-                        # 处理边界情况：新单词(success_count=0)应该立即复习
-                        if word.success_count == 0:
-                            delta_days = 0  # 新单词立即复习
-                        else:
-                            success_index = word.success_count - 1
-                            if success_index < len(Config.REVIEW_INTERVAL_DAYS):
-                                delta_days = Config.REVIEW_INTERVAL_DAYS[success_index]
-                            else:
-                                delta_days = Config.REVIEW_INTERVAL_DAYS[-1]
-                        word.next_review_date = self.today + timedelta(days=delta_days)
+
+                # 只更新轮次低于新轮次的单词
+                if self._use_index():
+                    self._advance_round_indexed(self.current_review_round)
+                else:
+                    self._get_scheduler().advance_round(self.current_review_round, self._reschedule_for_round)
+                    # 轮次推进会批量修改单词，直接写入完整快照
+                    self._save_data()
+                return True
+        return False
+
+    def _advance_round_indexed(self, new_round):
+        """索引模式推进轮次：只读出轮次低于新轮次的单词，更新后批量写入"""
+        words = []
+        for data in self.storage.load_below_round(new_round):
+            key = word_key(data['english'])
+            word = self._detached.get(key) or Word.from_dict(data)
+            word.review_round = new_round
+            self._reschedule_for_round(word)
+            words.append(word)
+        self._record_words(words)
+
+    def _schedule_next(self, word, correct):
+        """由复习算法根据本次结果安排下次复习，返回间隔天数（None表示保持原复习计划）
+
+        过期单词在复习前保留原来的到期日期，算法据此得到距上次复习的实际天数。
+        """
+        review_day = word.review_day
+        delta_days = self.algorithm.review(word, correct, self.today.toordinal())
+        if delta_days is not None:
+            word.next_review_date = self.today + timedelta(days=delta_days)
+        elif word.next_review_date < self.today:
+            word.next_review_date = self.today  # 保持原复习计划：过期单词视为今天到期
+        if self._scheduler is not None and word.review_day != review_day:
+            self._scheduler.update(word)
+        return delta_days
+
+    def _reschedule_for_round(self, word):
+        """进入新轮次时按单词当前的复习间隔重新安排复习日期"""
+        word.next_review_date = self.today + timedelta(days=self.algorithm.current_interval(word))
 
     def add_words(self, words):
-        """批量添加单词"""
-        existing_words = {w.english.lower() for w in self.all_words + self.mastered_words}
+        """批量添加单词（[(英文, 中文), ...]）"""
+        stats = self.import_records(({'english': en, 'chinese': zh}, False) for en, zh in words)
+        print(f"✅ 成功添加 {stats.added} 个新单词")
+
+    def import_file(self, path, fmt=None):
+        """导入CSV / TSV / JSON词库文件（格式自动识别），边读边写入"""
+        from importer import iter_records
+        stats = self.import_records(
+            iter_records(path, fmt),
+            progress=lambda s: print(f"\r⏳ {s.summary()}", end='', flush=True)
+        )
+        print(f"\n✅ 导入完成: {stats.summary()}")
+        return stats
+
+    def import_records(self, records, batch_size=None, progress=None):
+        """流式导入 (单词数据, 是否已掌握) 记录，返回ImportStats
+
+        - 按大小写折叠后的英文去重；已有单词只更新释义和例句，保留学习进度
+        - 每批在一个事务（或一次日志同步）中写入存储
+        - 数据尚未整体加载且存储带索引时，按主键批量查询已有单词，不把词库读入内存
+        """
+        from importer import ImportStats, iter_batches
+        stats = ImportStats()
+        use_index = self._use_index()
+        index = None if use_index else self._word_index()
+        for batch in iter_batches(records, batch_size or Config.IMPORT_BATCH_SIZE, stats):
+            if use_index:
+                entries = self._merge_batch_indexed(batch, stats)
+            else:
+                entries = self._merge_batch_loaded(batch, index, stats)
+            if entries:
+                self.storage.record_many(entries)
+                # 导入时即为带例句的单词生成挖空模板，复习时直接读取
+                for data, _ in entries:
+                    if data.get('example'):
+                        self.example_cache.template(data['english'], data['example'])
+            if progress:
+                progress(stats)
+        # 导入过程只追加日志，结束时最多压缩一次
+        if self.storage.journal_size >= Config.JOURNAL_COMPACT_THRESHOLD:
+            self._save_data()
+        self.example_cache.save()
+        return stats
+
+    def _word_index(self):
+        """已加载单词的去重索引：{去重键: (单词, 是否已掌握)}"""
+        self._flush_graduated()
+        index = {word_key(w.english): (w, False) for w in self.all_words}
+        index.update((word_key(w.english), (w, True)) for w in self.mastered_words)
+        return index
+
+    def _new_words(self, batch, keys, stats):
+        """由导入记录创建新单词，并批量生成例句；返回 [(单词, 是否已掌握)]"""
         new_words = []
-        
-        for en, zh in words:
-            if en.lower() not in existing_words:
-                new_words.append(Word(en, zh))
-                existing_words.add(en.lower())
-        
-        self.all_words.extend(new_words)
-        self._save_data()
-        print(f"✅ 成功添加 {len(new_words)} 个新单词")
+        for key in keys:
+            data, mastered = batch[key]
+            try:
+                if 'next_review_date' in data:
+                    word = Word.from_dict(data)
+                else:
+                    word = Word(**data)
+            except (TypeError, ValueError):
+                stats.invalid += 1
+                continue
+            new_words.append((word, mastered))
+        self._prefill_examples([w for w, _ in new_words])
+        stats.added += len(new_words)
+        return new_words
+
+    def _merge_batch_loaded(self, batch, index, stats):
+        """数据已在内存中：在索引中查找并更新单词对象，返回待写入存储的记录"""
+        from importer import merge_word_data
+        entries = []
+        new_keys = []
+        for key, (data, _) in batch.items():
+            found = index.get(key)
+            if found is None:
+                new_keys.append(key)
+                continue
+            word, mastered = found
+            current = {'chinese': word.chinese, 'example': word.example}
+            if merge_word_data(current, data):
+                word.chinese = current['chinese']
+                word.example = current['example']
+                entries.append((word.to_dict(), mastered))
+                stats.updated += 1
+            else:
+                stats.skipped += 1
+
+        for word, mastered in self._new_words(batch, new_keys, stats):
+            index[word_key(word.english)] = (word, mastered)
+            if self._deck_stats is not None:
+                self._deck_stats.add(word, mastered)
+            if mastered:
+                self.mastered_words.append(word)
+            else:
+                self.all_words.append(word)
+                if self._scheduler is not None:
+                    self._scheduler.add(word)
+            entries.append((word.to_dict(), mastered))
+        return entries
+
+    def _merge_batch_indexed(self, batch, stats):
+        """数据未加载：按主键批量查询存储中的已有单词，返回待写入存储的记录"""
+        from importer import merge_word_data
+        existing = self.storage.lookup(batch.keys())
+        entries = []
+        new_keys = []
+        for key, (data, _) in batch.items():
+            row = existing.get(key)
+            if row is None:
+                new_keys.append(key)
+                continue
+            mastered = row.pop('mastered')
+            if merge_word_data(row, data):
+                entries.append((row, mastered))
+                stats.updated += 1
+                detached = self._detached.get(key)
+                if detached is not None:
+                    # 已通过索引读出的单词对象同步更新，避免之后写回旧的释义
+                    detached.chinese = row['chinese']
+                    detached.example = row['example']
+            else:
+                stats.skipped += 1
+
+        for word, mastered in self._new_words(batch, new_keys, stats):
+            entries.append((word.to_dict(), mastered))
+            if self._deck_stats is not None:
+                self._deck_stats.add(word, mastered)
+        return entries
+
+    def _prefill_examples(self, words):
+        """导入时批量生成例句（先查例句缓存，未命中的单词合并为少量混元请求）"""
+        missing = [w for w in words if not w.example]
+        if not missing or not self.hunyuan.client:
+            return
+        uncached = []
+        for word in missing:
+            example = self.example_cache.get(word.english, 'hunyuan')
+            if example:
+                word.example = example
+            else:
+                uncached.append(word)
+
+        if uncached:
+            print(f"⏳ 正在为 {len(uncached)} 个单词批量生成例句...")
+            examples = self.hunyuan.get_examples([w.english for w in uncached])
+            for word in uncached:
+                example = examples.get(word.english)
+                if example:
+                    word.example = example
+                    self.example_cache.put(word.english, 'hunyuan', example)
+            print(f"✅ 已生成 {len(examples)} 个例句")
+        self.example_cache.save()
 
     def _load_data(self):
-        """加载学习数据（兼容新数据结构）"""
+        """加载学习数据（快照 + 重放复习日志，兼容新数据结构）
+
+        在首次访问单词列表时调用；已被直接赋值的列表保持不变。
+        """
+        example_loader = None
         try:
-            with open(Config.DATA_FILE) as f:
-                data = json.load(f)
-                self.all_words = [Word.from_dict(w) for w in data['all_words']]
-                self.mastered_words = [Word.from_dict(w) for w in data['mastered_words']]
-                
-                # 兼容旧版本数据：为旧数据添加复习轮次和复习次数
-                for word in self.all_words + self.mastered_words:
-                    if not hasattr(word, 'review_round'):
-                        word.review_round = 0
-                    if not hasattr(word, 'review_count'):
-                        word.review_count = 0
-                
-                # 新增统计信息
-                total_words = len(self.all_words) + len(self.mastered_words)
-                mastered_count = len(self.mastered_words)
-                
-                # 计算平均复习次数
-                if self.all_words:
-                    avg_review_count = sum(w.review_count for w in self.all_words) / len(self.all_words)
-                else:
-                    avg_review_count = 0
-                    
-                print(f"📊 单词统计: 总计 {total_words} 个 | 已掌握 {mastered_count} 个 | 平均复习次数 {avg_review_count:.1f}")
+            if self.storage.indexed:
+                # 例句留在数据库中，练习到该单词时才读取
+                data = self.storage.load(with_examples=False)
+                example_loader = self.storage.load_example
+            else:
+                data = self.storage.load()
         except FileNotFoundError:
-            print(f"⚠️ 数据文件 {Config.DATA_FILE} 不存在，将创建新文件")
-            self.all_words = []
-            self.mastered_words = []
-            print("📊 单词统计: 总计 0 个 | 已掌握 0 个 | 平均复习次数 0.0")
-        except json.JSONDecodeError as e:
-            print(f"⚠️ 数据文件 {Config.DATA_FILE} 格式错误: {str(e)}")
-            print("⚠️ 可能是文件损坏，将重置为初始状态")
-            self.all_words = []
-            self.mastered_words = []
-            print("📊 单词统计: 总计 0 个 | 已掌握 0 个 | 平均复习次数 0.0")
+            print(f"⚠️ 数据文件 {self.storage.path} 不存在，将创建新文件")
+            data = {'all_words': [], 'mastered_words': []}
+        except ValueError as e:  # JSON解析错误或二进制快照损坏
+            print(f"⚠️ 数据文件 {self.storage.path} 格式错误: {str(e)}")
+            print(f"⚠️ 可能是文件损坏，已备份为 {self.storage.path}.corrupt，将重置为初始状态")
+            if os.path.exists(self.storage.path + '.journal.corrupt'):
+                print(f"⚠️ 复习日志已原样备份为 {self.storage.path}.journal.corrupt")
+            data = {'all_words': [], 'mastered_words': []}
+
+        if self._all_words is None:
+            all_words = [Word.from_dict(w, example_loader) for w in data['all_words']]
+            if self._detached:
+                # 复用已通过索引读出的单词对象，保证同一单词只有一个实例
+                all_words = [self._detached.get(word_key(w.english), w) for w in all_words]
+                self._detached = {}
+            self.all_words = all_words
+        if self._mastered_words is None:
+            self.mastered_words = [Word.from_dict(w, example_loader) for w in data['mastered_words']]
+
+        # 兼容旧版本数据：为旧数据添加复习轮次和复习次数
+        for word in self.all_words + self.mastered_words:
+            if not hasattr(word, 'review_round'):
+                word.review_round = 0
+            if not hasattr(word, 'review_count'):
+                word.review_count = 0
+
+        # 加载时顺便建立统计计数，之后随复习结果增量更新
+        self._flush_graduated()
+        self._deck_stats = DeckStats.from_words(self.all_words, self.mastered_words)
+        total_words = self._deck_stats.total
+        mastered_count = self._deck_stats.mastered
+        avg_review_count = self._deck_stats.avg_review_count
+
+        print(f"📊 单词统计: 总计 {total_words} 个 | 已掌握 {mastered_count} 个 | 平均复习次数 {avg_review_count:.1f}")
+
+    def _record_word(self, word, mastered=False):
+        """将单个单词的最新状态追加到复习日志（O(1)），日志过长时压缩为快照"""
+        self.storage.record(word.to_dict(), mastered)
+        if self.storage.journal_size >= Config.JOURNAL_COMPACT_THRESHOLD:
+            self._save_data()
+
+    def _record_words(self, words, mastered=False):
+        """将一批单词的最新状态一次性追加到复习日志"""
+        if not words:
+            return
+        self.storage.record_many([(word.to_dict(), mastered) for word in words])
+        if self.storage.journal_size >= Config.JOURNAL_COMPACT_THRESHOLD:
+            self._save_data()
 
     def _save_data(self):
-        """保存学习数据"""
-        data = {
-            'all_words': [w.to_dict() for w in self.all_words],
-            'mastered_words': [w.to_dict() for w in self.mastered_words]
-        }
-        with open(Config.DATA_FILE, 'w') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        """保存学习数据（原子写入完整快照并清空复习日志）"""
+        self._flush_graduated()
+        self.storage.save_all(
+            [w.to_dict() for w in self.all_words],
+            [w.to_dict() for w in self.mastered_words]
+        )
+
+    def close(self):
+        """退出前关闭存储、语音引擎和事件日志，保存例句缓存"""
+        self.storage.close()
+        if self._tts is not None:
+            self._tts.close()
+        if self._event_log is not None:
+            self._event_log.close()
+        self.example_cache.save()
 
 # 用户界面
 class ReciterCLI:
@@ -591,7 +1163,8 @@ class ReciterCLI:
             print("3. 导入单词文件")
             print("4. 查看已掌握词汇")
             print("5. 复习已掌握词汇")
-            print("6. 退出系统")
+            print("6. 复习量预测")
+            print("7. 退出系统")
             
             choice = input("请选择操作: ").strip()
             
@@ -606,6 +1179,9 @@ class ReciterCLI:
             elif choice == '5':
                 self.reciter.review_mastered_words()
             elif choice == '6':
+                self.reciter.show_forecast()
+            elif choice == '7':
+                self.reciter.close()
                 print("👋 再见！")
                 break
             else:
@@ -614,12 +1190,61 @@ class ReciterCLI:
     def _import_file(self):
         path = input(f"输入文件路径（默认{Config.WORD_FILE}）: ").strip() or Config.WORD_FILE
         try:
-            with open(path, encoding='utf-8') as f:
-                words = [line.strip().split(',', 1) for line in f if ',' in line]
-                self.reciter.add_words(words)
+            self.reciter.import_file(path)
         except Exception as e:
-            print(f"⚠️ 导入失败: {str(e)}")
+            print(f"\n⚠️ 导入失败: {str(e)}")
+
+def _profile_spans():
+    """--profile 时计时的方法：{类: {方法名: 阶段名}}"""
+    return {
+        WordReciter: {
+            '_load_data': 'load', '_save_data': 'save', '_record_word': 'record', '_record_words': 'record',
+            '_get_today_review_list': 'today_list', '_check_and_advance_round': 'advance_round',
+            '_get_example': 'example', '_text_to_speech': 'tts',
+            'add_words': 'add_words', 'import_file': 'import_file',
+        },
+        WordNetExampleIndex: {'lookup': 'example.wordnet'},
+        HunyuanGenerator: {'generate_example': 'example.hunyuan', 'get_examples': 'example.hunyuan_batch'},
+        ReviewScheduler: {
+            '__init__': 'scheduler.build', 'due_words': 'scheduler.due_words',
+            'has_round': 'scheduler.has_round', 'advance_round': 'scheduler.advance_round',
+        },
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="智能单词背诵系统")
+    parser.add_argument('--profile', action='store_true', help="退出时输出各阶段耗时（p50/p95）")
+    parser.add_argument('--profile-trace', metavar='FILE', help="同时写入Chrome trace文件（隐含--profile）")
+    parser.add_argument('--profile-cprofile', metavar='FILE', help="同时用cProfile剖析整个会话并写入统计文件（隐含--profile）")
+    args = parser.parse_args(argv)
+
+    profiler = cprofile = None
+    if args.profile or args.profile_trace or args.profile_cprofile:
+        from profiling import Profiler
+        profiler = Profiler(trace=bool(args.profile_trace))
+        for cls, spans in _profile_spans().items():
+            profiler.instrument(cls, spans)
+    if args.profile_cprofile:
+        import cProfile
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
+    try:
+        cli = ReciterCLI()
+        cli.main_menu()
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(args.profile_cprofile)
+            print(f"📄 cProfile统计已写入 {args.profile_cprofile}（python -m pstats 查看）")
+        if profiler is not None:
+            profiler.print_summary()
+            if args.profile_trace:
+                profiler.write_chrome_trace(args.profile_trace)
+                print(f"📄 Chrome trace已写入 {args.profile_trace}")
+
 
 if __name__ == "__main__":
-    cli = ReciterCLI()
-    cli.main_menu()
\ No newline at end of file
+    main()
\ No newline at end of file
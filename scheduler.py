@@ -0,0 +1,193 @@
+"""复习调度器：按轮次分桶 + 到期日期小顶堆；已掌握单词的选择索引"""
+
+import heapq
+
+
+class ReviewScheduler:
+    """增量维护的复习调度结构
+
+    - 每个复习轮次一个桶（记录该轮次的单词）和一个按到期日期排序的小顶堆
+    - 单词复习结果、掌握、轮次推进时只调整相关单词，不再扫描全部单词
+    - 堆采用惰性删除：单词状态变化时压入新条目，旧条目在弹出时按版本号丢弃
+    """
+
+    def __init__(self, words, today):
+        self.today = today.toordinal()
+        self._words = {}     # 序号 -> 单词
+        self._seq_of = {}    # id(单词) -> 序号（序号即在待复习列表中的先后顺序）
+        self._version = {}   # 序号 -> 版本号
+        self._rounds = {}    # 序号 -> 入堆时的轮次
+        self._buckets = {}   # 轮次 -> 序号集合
+        self._heaps = {}     # 轮次 -> [(到期日序数, 序号, 版本号)]
+        self._next_seq = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return len(self._words)
+
+    def add(self, word):
+        """加入新单词（排在已有单词之后）"""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._words[seq] = word
+        self._seq_of[id(word)] = seq
+        self._version[seq] = 0
+        self._push(seq)
+
+    def _push(self, seq):
+        word = self._words[seq]
+        review_round = word.review_round
+        self._rounds[seq] = review_round
+        self._buckets.setdefault(review_round, set()).add(seq)
+        heapq.heappush(self._heaps.setdefault(review_round, []),
+                       (word.next_review_date.toordinal(), seq, self._version[seq]))
+
+    def _detach(self, seq):
+        """从桶中移除，堆中的旧条目随版本号失效"""
+        review_round = self._rounds.pop(seq)
+        bucket = self._buckets[review_round]
+        bucket.discard(seq)
+        if not bucket:
+            del self._buckets[review_round]
+        self._version[seq] += 1
+
+    def update(self, word):
+        """单词的复习轮次或下次复习日期变化后调用，O(log n)"""
+        seq = self._seq_of[id(word)]
+        self._detach(seq)
+        self._push(seq)
+
+    def remove(self, word):
+        """单词已掌握，移出调度，O(1)"""
+        seq = self._seq_of.pop(id(word))
+        self._detach(seq)
+        del self._words[seq], self._version[seq]
+
+    def has_round(self, review_round):
+        """指定轮次是否还有待复习单词，O(1)"""
+        return review_round in self._buckets
+
+    def min_round(self):
+        """最小复习轮次，没有单词时返回None"""
+        return min(self._buckets) if self._buckets else None
+
+    def _is_live(self, entry):
+        _, seq, version = entry
+        return self._version.get(seq) == version
+
+    def _pop_due(self, review_round):
+        """弹出指定轮次的全部到期单词序号（随后需放回堆中）"""
+        heap = self._heaps.get(review_round, [])
+        due = []
+        while heap and heap[0][0] <= self.today:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                due.append(entry)
+        # 顺便清理堆顶的失效条目
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return due
+
+    def due_words(self, current_round):
+        """今日复习列表，O(k log n)，k为到期单词数
+
+        与原有逻辑一致：优先当前轮次的到期单词，没有时选择有到期单词的最小轮次；
+        同一轮次内按复习次数排序，复习次数相同时保持待复习列表中的顺序。
+        """
+        rounds = sorted(self._buckets)
+        if current_round in self._buckets:
+            rounds.remove(current_round)
+            rounds.insert(0, current_round)
+
+        for review_round in rounds:
+            due = self._pop_due(review_round)
+            if not due:
+                continue
+            heap = self._heaps[review_round]
+            for entry in due:
+                heapq.heappush(heap, entry)
+            words = [(self._words[seq].review_count, seq) for _, seq, _ in due]
+            words.sort()
+            return [self._words[seq] for _, seq in words]
+        return []
+
+    def advance_round(self, new_round, reschedule):
+        """推进到新轮次：只移动轮次低于new_round的单词，并用reschedule重新安排复习日期"""
+        for review_round in [r for r in self._buckets if r < new_round]:
+            for seq in sorted(self._buckets[review_round]):
+                word = self._words[seq]
+                self._detach(seq)
+                word.review_round = new_round
+                reschedule(word)
+                self._push(seq)
+            self._heaps.pop(review_round, None)
+
+
+class MasteredSelector:
+    """已掌握单词的选择索引：按优先级排序的小顶堆
+
+    - 建立时整体堆化 O(n)，之后选出优先级最高的k个单词为 O(k log n)
+    - 单词复习后压入新条目，旧条目按版本号惰性删除；失效条目过多时重建堆
+    - priority(word, today) 返回可比较的元组，越小越优先
+    """
+
+    def __init__(self, words, today, priority):
+        self.today = today.toordinal()
+        self.priority = priority
+        self._words = {}       # 序号 -> 单词
+        self._seq_of = {}      # id(单词) -> 序号
+        self._version = {}     # 序号 -> 版本号
+        self._unreviewed = set()  # 从未复习过的单词序号
+        self._next_seq = 0
+        self._heap = [(priority(word, self.today), self._register(word), 0) for word in words]
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._words)
+
+    def _register(self, word):
+        seq = self._next_seq
+        self._next_seq += 1
+        self._words[seq] = word
+        self._seq_of[id(word)] = seq
+        self._version[seq] = 0
+        if not word.review_count:
+            self._unreviewed.add(seq)
+        return seq
+
+    def _is_live(self, entry):
+        _, seq, version = entry
+        return self._version.get(seq) == version
+
+    def add(self, word):
+        """加入新掌握的单词，O(log n)"""
+        seq = self._register(word)
+        heapq.heappush(self._heap, (self.priority(word, self.today), seq, 0))
+
+    def update(self, word):
+        """单词复习后调用，O(log n)"""
+        seq = self._seq_of[id(word)]
+        self._version[seq] += 1
+        if word.review_count:
+            self._unreviewed.discard(seq)
+        heapq.heappush(self._heap, (self.priority(word, self.today), seq, self._version[seq]))
+        if len(self._heap) > 2 * len(self._words) + 64:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+
+    def select(self, k):
+        """优先级最高的k个单词（不移出索引），O(k log n)"""
+        heap = self._heap
+        selected = []
+        while heap and len(selected) < k:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                selected.append(entry)
+        for entry in selected:
+            heapq.heappush(heap, entry)
+        return [self._words[seq] for _, seq, _ in selected]
+
+    def all_reviewed(self):
+        """是否所有单词都至少复习过一次，O(1)"""
+        return not self._unreviewed
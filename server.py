@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""多用户模式：共享词库 + 每个用户的学习进度，通过本地HTTP/JSON接口复习
+
+数据保存在一个SQLite数据库中：
+- catalog：共享词库，每个单词（英文、中文、例句）只保存一份；例句在写入时生成挖空模板（cloze.py），
+  出题时不再解析例句；例句音频按内容哈希缓存，所有用户共用
+- users：用户
+- progress：每个用户每个单词一行，只保存学习进度（成功次数、下次复习日期、记忆状态等）
+
+接口（JSON）：
+    POST /users                    {"name": "alice"}
+    POST /words                    {"words": [{"english", "chinese", "example"?}], "users": ["alice"]?}
+                                   （不指定users时加入所有用户的词库）
+    GET  /users/<name>/next        下一个到期单词（挖空的例句），没有到期单词时word_id为null
+    POST /users/<name>/answer      {"word_id": 1, "answer": "apple"}，每次提交计为一次复习
+    GET  /users/<name>/stats       待复习、已掌握、今日到期的单词数
+    GET  /audio/<word_id>          例句音频
+
+复习规则与每日复习相同（按轮次、复习次数排序；答对成功次数加1，达到掌握次数后掌握），
+间隔由 Config.SRS_ALGORITHM 决定；多用户模式下不做整体的轮次推进。
+
+用法：
+    python server.py serve [--db classroom.db] [--host 127.0.0.1] [--port 8765]
+    python server.py add-user <用户名> [learning_data.json]   # 可同时导入该用户已有的学习数据
+    python server.py loadtest [--users 50] [--words 200] [--requests 20]
+    python server.py retemplate                               # 重新生成所有例句的挖空模板
+"""
+
+import contextlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cloze import ClozeTemplate, build_template, build_templates, normalize_example
+from reciter import Config, Word
+from srs import create_algorithm
+from storage import word_key
+
+PROGRESS_COLUMNS = ('success_count', 'next_review_date', 'review_round', 'review_count',
+                    'ease', 'interval', 'stability', 'difficulty')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS catalog (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    english TEXT NOT NULL,
+    chinese TEXT,
+    example TEXT,
+    cloze TEXT
+);
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS progress (
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    word_id INTEGER NOT NULL REFERENCES catalog(id),
+    success_count INTEGER NOT NULL DEFAULT 0,
+    next_review_date TEXT NOT NULL,
+    review_round INTEGER NOT NULL DEFAULT 0,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    ease REAL,
+    interval INTEGER,
+    stability REAL,
+    difficulty REAL,
+    mastered INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, word_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_progress_due
+    ON progress (user_id, mastered, next_review_date, review_round, review_count);
+'''
+
+
+class ConnectionPool:
+    """SQLite连接池：最多size个连接，在多个请求线程间复用"""
+
+    def __init__(self, path, size=8):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # 自动提交模式，写操作显式使用 BEGIN IMMEDIATE；timeout即等待写锁的时间
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @contextlib.contextmanager
+    def connection(self):
+        """借出一个连接，用完归还；连接都在使用中时等待"""
+        conn = None
+        with self._lock:
+            if self._idle.empty() and self._created < self.size:
+                self._created += 1
+                conn = self._connect()
+        if conn is None:
+            conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """借出连接并开启写事务"""
+        with self.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get().close()
+
+
+class UnknownUser(KeyError):
+    pass
+
+
+class UnknownWord(KeyError):
+    pass
+
+
+class Classroom:
+    """多用户复习服务（与HTTP无关，可直接调用）"""
+
+    def __init__(self, path, pool_size=None, algorithm=None, today=date.today, example_source=None):
+        self.pool = ConnectionPool(path, pool_size or Config.SERVER_POOL_SIZE)
+        self.algorithm = algorithm or create_algorithm(Config.SRS_ALGORITHM, Config.REVIEW_INTERVAL_DAYS)
+        self.today = today
+        self._example_source = example_source
+        self._tts = None
+        self._tts_lock = threading.Lock()
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+            # 旧版本数据库补充挖空模板列（模板在出题时补齐）
+            if 'cloze' not in {row[1] for row in conn.execute('PRAGMA table_info(catalog)')}:
+                conn.execute('ALTER TABLE catalog ADD COLUMN cloze TEXT')
+
+    def close(self):
+        if self._tts is not None:
+            self._tts.close()
+        self.pool.close()
+
+    # ---- 用户与词库 ----
+
+    def add_user(self, name):
+        """创建用户（已存在时直接返回），返回用户id"""
+        with self.pool.transaction() as conn:
+            conn.execute('INSERT OR IGNORE INTO users (name) VALUES (?)', (name,))
+            return conn.execute('SELECT id FROM users WHERE name = ?', (name,)).fetchone()[0]
+
+    @staticmethod
+    def _user_id(conn, name):
+        row = conn.execute('SELECT id FROM users WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise UnknownUser(name)
+        return row[0]
+
+    @staticmethod
+    def _catalog_ids(conn, words):
+        """把单词写入共享词库（已有的单词只补充缺少的例句），返回 {去重键: 单词id}"""
+        rows = []
+        for w in words:
+            example = normalize_example(w['example']) if w.get('example') else None
+            cloze = build_template(example, w['english']).dumps() if example else None
+            rows.append((word_key(w['english']), w['english'], w.get('chinese'), example, cloze))
+        conn.executemany('''
+            INSERT INTO catalog (key, english, chinese, example, cloze) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                cloze = CASE WHEN catalog.example IS NULL THEN excluded.cloze ELSE catalog.cloze END,
+                example = COALESCE(catalog.example, excluded.example)''', rows)
+        ids = {}
+        keys = list({word_key(w['english']) for w in words})
+        for start in range(0, len(keys), 500):  # 每次查询的参数个数有上限
+            chunk = keys[start:start + 500]
+            ids.update(conn.execute(f"SELECT key, id FROM catalog WHERE key IN ({','.join('?' * len(chunk))})",
+                                    chunk))
+        return ids
+
+    def add_words(self, words, users=None):
+        """把单词加入共享词库和指定用户（默认所有用户）的学习计划，返回新增的进度记录数"""
+        with self.pool.transaction() as conn:
+            ids = self._catalog_ids(conn, words)
+            if users is None:
+                user_ids = [row[0] for row in conn.execute('SELECT id FROM users')]
+            else:
+                user_ids = [self._user_id(conn, name) for name in users]
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO progress (user_id, word_id, next_review_date) VALUES (?, ?, ?)',
+                [(user_id, word_id, self.today().isoformat()) for user_id in user_ids for word_id in ids.values()])
+            return conn.total_changes - before
+
+    def import_user(self, name, data):
+        """导入单用户的学习数据（learning_data.json 格式），保留学习进度，返回导入的单词数"""
+        self.add_user(name)
+        sections = [(w, 0) for w in data.get('all_words', [])] + [(w, 1) for w in data.get('mastered_words', [])]
+        with self.pool.transaction() as conn:
+            user_id = self._user_id(conn, name)
+            ids = self._catalog_ids(conn, [w for w, _ in sections])
+            conn.executemany(f'''
+                INSERT OR REPLACE INTO progress (user_id, word_id, {', '.join(PROGRESS_COLUMNS)}, mastered)
+                VALUES (?, ?, {', '.join('?' * len(PROGRESS_COLUMNS))}, ?)''',
+                [(user_id, ids[word_key(w['english'])], w.get('success_count', 0),
+                  w.get('next_review_date') or self.today().isoformat(), w.get('review_round', 0),
+                  w.get('review_count', 0), w.get('ease'), w.get('interval'), w.get('stability'),
+                  w.get('difficulty'), mastered) for w, mastered in sections])
+        return len(sections)
+
+    # ---- 复习 ----
+
+    def _example(self, conn, word_id, english, chinese, example):
+        """共享词库中的例句；没有时生成一次并写回，所有用户共用"""
+        if example:
+            return example
+        example = None
+        if self._example_source is not None:
+            example = self._example_source(english)
+        if not example:
+            example = f"This is an example sentence with {english}_这是一个包含{chinese}的例句"
+        example = normalize_example(example)
+        conn.execute('UPDATE catalog SET example = ? WHERE id = ? AND example IS NULL', (example, word_id))
+        return example
+
+    @staticmethod
+    def _template(conn, word_id, english, example, cloze):
+        """单词的挖空模板：优先使用词库中保存的模板，没有时生成并写回"""
+        if cloze:
+            return ClozeTemplate.loads(cloze)
+        template = build_template(example, english)
+        conn.execute('UPDATE catalog SET cloze = ? WHERE id = ?', (template.dumps(), word_id))
+        return template
+
+    def retemplate(self, batch_size=1000):
+        """为词库中所有有例句的单词重新生成挖空模板（匹配规则更新后运行一次），返回单词数"""
+        count = 0
+        with self.pool.connection() as conn:
+            rows = conn.execute('SELECT id, english, example FROM catalog WHERE example IS NOT NULL').fetchall()
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            templates = build_templates((example, english) for _, english, example in batch)
+            with self.pool.transaction() as conn:
+                conn.executemany('UPDATE catalog SET cloze = ? WHERE id = ?',
+                                 [(template.dumps(), word_id) for template, (word_id, _, _) in zip(templates, batch)])
+            count += len(batch)
+        return count
+
+    def next_word(self, name):
+        """用户的下一个到期单词：优先当前轮次、复习次数少的单词"""
+        today = self.today().isoformat()
+        with self.pool.connection() as conn:
+            user_id = self._user_id(conn, name)
+            due = conn.execute('''
+                SELECT COUNT(*) FROM progress
+                WHERE user_id = ? AND mastered = 0 AND next_review_date <= ?''', (user_id, today)).fetchone()[0]
+            row = conn.execute('''
+                SELECT c.id, c.english, c.chinese, c.example, c.cloze, p.success_count
+                FROM progress p JOIN catalog c ON c.id = p.word_id
+                WHERE p.user_id = ? AND p.mastered = 0 AND p.next_review_date <= ?
+                ORDER BY p.review_round, p.review_count LIMIT 1''', (user_id, today)).fetchone()
+            if row is None:
+                return {'word_id': None, 'due': 0}
+            word_id, english, chinese, example, cloze, success_count = row
+            example = self._example(conn, word_id, english, chinese, example)
+            template = self._template(conn, word_id, english, example, cloze)
+        return {
+            'word_id': word_id,
+            'chinese': chinese,
+            'example': template.render(),
+            'translation': template.translation,
+            'length': len(english),
+            'success_count': success_count,
+            'max_success': Config.MAX_SUCCESS_COUNT,
+            'due': due,
+        }
+
+    def submit(self, name, word_id, answer):
+        """提交答案并更新该用户的学习进度"""
+        with self.pool.transaction() as conn:
+            user_id = self._user_id(conn, name)
+            row = conn.execute(f'''
+                SELECT c.english, c.chinese, {', '.join('p.' + c for c in PROGRESS_COLUMNS)}
+                FROM progress p JOIN catalog c ON c.id = p.word_id
+                WHERE p.user_id = ? AND p.word_id = ?''', (user_id, word_id)).fetchone()
+            if row is None:
+                raise UnknownWord(word_id)
+            word = Word.from_dict({k: v for k, v in zip(('english', 'chinese') + PROGRESS_COLUMNS, row)
+                                   if v is not None})
+
+            correct = answer.strip().lower() == word.english.lower()
+            word.review_count += 1
+            if correct:
+                word.success_count += 1
+            mastered = word.success_count >= Config.MAX_SUCCESS_COUNT
+            if not mastered:
+                today = self.today()
+                delta_days = self.algorithm.review(word, correct, today.toordinal())
+                if delta_days is not None:
+                    word.next_review_date = today + timedelta(days=delta_days)
+                elif word.next_review_date < today:
+                    word.next_review_date = today  # 过期单词视为今天到期
+
+            conn.execute(f'''
+                UPDATE progress SET {', '.join(c + ' = ?' for c in PROGRESS_COLUMNS)}, mastered = ?
+                WHERE user_id = ? AND word_id = ?''',
+                [word.success_count, word.next_review_date.isoformat(), word.review_round, word.review_count,
+                 word.ease, word.interval, word.stability, word.difficulty, int(mastered), user_id, word_id])
+        return {
+            'correct': correct,
+            'english': word.english,
+            'success_count': word.success_count,
+            'mastered': mastered,
+            'next_review_date': None if mastered else word.next_review_date.isoformat(),
+        }
+
+    def stats(self, name):
+        today = self.today().isoformat()
+        with self.pool.connection() as conn:
+            user_id = self._user_id(conn, name)
+            pending, mastered, due = conn.execute('''
+                SELECT COALESCE(SUM(mastered = 0), 0), COALESCE(SUM(mastered = 1), 0),
+                       COALESCE(SUM(mastered = 0 AND next_review_date <= ?), 0)
+                FROM progress WHERE user_id = ?''', (today, user_id)).fetchone()
+        return {'pending': pending, 'mastered': mastered, 'due': due}
+
+    def audio(self, word_id):
+        """例句音频文件路径（按内容哈希缓存，所有用户共用）"""
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT id, english, chinese, example FROM catalog WHERE id = ?',
+                               (word_id,)).fetchone()
+            if row is None:
+                raise UnknownWord(word_id)
+            example = self._example(conn, *row)
+        with self._tts_lock:
+            if self._tts is None:
+                from tts import TTSEngine, create_backend
+                self._tts = TTSEngine(create_backend(Config.TTS_BACKEND), Config.TTS_CACHE_DIR)
+        return self._tts.render(example.split('_')[0])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 保持连接，客户端可复用
+    disable_nagle_algorithm = True  # 响应头和正文分两次写出，避免等待延迟确认
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json; charset=utf-8'):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _dispatch(self, method):
+        classroom = self.server.classroom
+        parts = [p for p in self.path.split('?')[0].split('/') if p]
+        try:
+            if method == 'POST' and parts == ['users']:
+                name = self._body()['name']
+                return self._send(200, {'id': classroom.add_user(name), 'name': name})
+            if method == 'POST' and parts == ['words']:
+                body = self._body()
+                return self._send(200, {'added': classroom.add_words(body['words'], body.get('users'))})
+            if len(parts) == 3 and parts[0] == 'users':
+                name, action = parts[1], parts[2]
+                if method == 'GET' and action == 'next':
+                    return self._send(200, classroom.next_word(name))
+                if method == 'GET' and action == 'stats':
+                    return self._send(200, classroom.stats(name))
+                if method == 'POST' and action == 'answer':
+                    body = self._body()
+                    return self._send(200, classroom.submit(name, int(body['word_id']), body['answer']))
+            if method == 'GET' and len(parts) == 2 and parts[0] == 'audio':
+                path = classroom.audio(int(parts[1]))
+                with open(path, 'rb') as f:
+                    content_type = 'audio/aiff' if path.endswith('.aiff') else 'audio/wav'
+                    return self._send(200, f.read(), content_type)
+        except UnknownUser as e:
+            return self._send(404, {'error': f"未知的用户: {e.args[0]}"})
+        except UnknownWord as e:
+            return self._send(404, {'error': f"未知的单词: {e.args[0]}"})
+        except (KeyError, ValueError, TypeError) as e:
+            return self._send(400, {'error': f"请求格式错误: {e}"})
+        self._send(404, {'error': f"未知的接口: {method} {self.path}"})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+
+def make_server(classroom, host=None, port=None):
+    """创建HTTP服务（port=0时由系统分配端口），调用 serve_forever() 开始服务"""
+    server = ThreadingHTTPServer((host or Config.SERVER_HOST, Config.SERVER_PORT if port is None else port),
+                                 _Handler)
+    server.daemon_threads = True
+    server.classroom = classroom
+    return server
+
+
+def load_test(users=50, words=200, requests_per_user=20, accuracy=0.8, seed=0):
+    """在本机启动临时服务，用users个并发客户端各完成requests_per_user次 取词+作答
+
+    返回请求数、吞吐量和延迟分位数。
+    """
+    import http.client
+    import random
+    import statistics
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        classroom = Classroom(os.path.join(tmp, 'classroom.db'))
+        names = [f"user{i}" for i in range(users)]
+        for name in names:
+            classroom.add_user(name)
+        deck = [{'english': f"word{i}", 'chinese': f"释义{i}"} for i in range(words)]
+        classroom.add_words(deck)
+        with classroom.pool.connection() as conn:
+            answers = dict(conn.execute('SELECT id, english FROM catalog'))
+
+        server = make_server(classroom, '127.0.0.1', 0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        latencies, errors = [], []
+
+        def client(name, rng):
+            conn = http.client.HTTPConnection('127.0.0.1', port)
+
+            def call(method, path, body=None):
+                start = time.perf_counter()
+                conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                             headers={'Content-Type': 'application/json'})
+                response = conn.getresponse()
+                data = json.loads(response.read())
+                latencies.append(time.perf_counter() - start)
+                if response.status != 200:
+                    errors.append(data)
+                return data
+
+            for _ in range(requests_per_user):
+                word = call('GET', f"/users/{name}/next")
+                if word.get('word_id') is None:
+                    break
+                answer = answers[word['word_id']] if rng.random() < accuracy else 'wrong'
+                call('POST', f"/users/{name}/answer", {'word_id': word['word_id'], 'answer': answer})
+            conn.close()
+
+        threads = [threading.Thread(target=client, args=(name, random.Random(seed + i)))
+                   for i, name in enumerate(names)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+        classroom.close()
+
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'requests_per_s': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': cuts[49] * 1000 if cuts else 0.0,
+        'p95_ms': cuts[94] * 1000 if cuts else 0.0,
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="多用户复习服务")
+    parser.add_argument('--db', default=Config.SERVER_DB, help="数据库文件")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help="启动HTTP服务")
+    serve.add_argument('--host', default=Config.SERVER_HOST)
+    serve.add_argument('--port', type=int, default=Config.SERVER_PORT)
+    add_user = commands.add_parser('add-user', help="创建用户，可同时导入其学习数据")
+    add_user.add_argument('name')
+    add_user.add_argument('data_file', nargs='?')
+    loadtest = commands.add_parser('loadtest', help="在本机压测（使用临时数据库）")
+    loadtest.add_argument('--users', type=int, default=50)
+    loadtest.add_argument('--words', type=int, default=200)
+    loadtest.add_argument('--requests', type=int, default=20, help="每个用户复习的单词数")
+    commands.add_parser('retemplate', help="重新生成所有例句的挖空模板")
+    args = parser.parse_args(argv)
+
+    if args.command == 'loadtest':
+        result = load_test(args.users, args.words, args.requests)
+        print(f"📊 {result['requests']} 个请求 | {result['requests_per_s']:.0f} 请求/秒 | "
+              f"p50 {result['p50_ms']:.1f}ms | p95 {result['p95_ms']:.1f}ms | 错误 {result['errors']}")
+        return
+
+    classroom = Classroom(args.db)
+    try:
+        if args.command == 'add-user':
+            classroom.add_user(args.name)
+            if args.data_file:
+                from storage import read_json_data
+                count = classroom.import_user(args.name, read_json_data(args.data_file))  # 只读，不修改原文件
+                print(f"✅ 已为 {args.name} 导入 {count} 个单词的学习进度")
+            else:
+                print(f"✅ 已创建用户 {args.name}")
+            return
+        if args.command == 'retemplate':
+            print(f"✅ 已重新生成 {classroom.retemplate()} 个例句的挖空模板")
+            return
+        server = make_server(classroom, args.host, args.port)
+        print(f"🌐 服务已启动: http://{args.host}:{server.server_address[1]}（Ctrl+C 停止）")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+    finally:
+        classroom.close()
+
+
+if __name__ == "__main__":
+    main()
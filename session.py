@@ -0,0 +1,214 @@
+"""复习会话引擎：与界面无关的异步状态机
+
+ReviewSession 按顺序出题、接收答案、更新学习进度，通过事件与前端交互：
+- 前端实现 show(event) 显示事件，async answer(prompt) 返回用户输入
+  （字符串，或带首次按键时刻的 Answer）
+- 例句在线程池中按复习顺序预取，语音在TTS引擎的后台线程中合成和播放，
+  作答期间都在并发进行，单词之间没有阻塞等待
+- 终端界面（TerminalFrontend）和测试用的脚本前端都只是薄薄的适配层
+
+事件：
+    Prompt    新单词（中文释义、挖空的例句、进度）
+    Feedback  一次作答的结果：correct / wrong / failed（三次都答错）/ reveal（查看答案）/ replay（播放语音）
+    Result    每日复习中一个单词的新复习计划
+    RoundAdvanced  进入新的复习轮次
+"""
+
+import asyncio
+import time
+from collections import namedtuple
+
+from cloze import cached_template, normalize_example
+
+Prompt = namedtuple('Prompt', 'word chinese example translation length success_count max_success remaining')
+Feedback = namedtuple('Feedback', 'word outcome attempts_left')
+Result = namedtuple('Result', 'word success mastered next_review_date delta_days')
+RoundAdvanced = namedtuple('RoundAdvanced', 'review_round')
+Answer = namedtuple('Answer', 'text first_key')  # first_key: 首次按键的 perf_counter 时刻
+Report = namedtuple('Report', 'total correct wrong mastered')
+
+# 前端的作答结果 -> 复习事件日志中的类型
+_LOG_OUTCOMES = {'correct': 'correct', 'wrong': 'wrong', 'failed': 'wrong', 'reveal': 'hint', 'replay': 'replay'}
+
+
+class WordAttempt:
+    """单个单词的作答状态（同步，不涉及输入输出）"""
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, word, example, template=None):
+        self.word = word
+        self.example = normalize_example(example)
+        if template is None:
+            template = cached_template(self.example, word.english)  # 同一例句只解析一次
+        self.cloze, self.translation = template.render(), template.translation
+        self.attempt = 0     # 已答错的次数
+        self.success = None  # 结束后为 True / False
+
+    @property
+    def attempts_left(self):
+        return self.MAX_ATTEMPTS - self.attempt
+
+    def submit(self, text):
+        """处理一次输入，返回结果（见Feedback.outcome）"""
+        if text == "h":
+            self.success = False
+            return 'reveal'
+        if text == "s":
+            return 'replay'
+        if text == self.word.english.lower():
+            self.success = True
+            return 'correct'
+        self.attempt += 1
+        if self.attempt >= self.MAX_ATTEMPTS:
+            self.success = False
+            return 'failed'
+        return 'wrong'
+
+
+class ReviewSession:
+    """一次复习会话
+
+    mastered=False 为每日复习（答对计入成功次数、安排下次复习、推进轮次，每个单词立即写入日志），
+    mastered=True 为复习已掌握词汇（记录复习次数、安排下次巩固复习，会话结束时一次性写入）。
+    examples 可提供已准备好的例句 {序号: 例句}。
+    """
+
+    def __init__(self, reciter, words, mastered=False, examples=None):
+        self.reciter = reciter
+        self.words = list(words)
+        self.mastered = mastered
+        self.examples = examples or {}
+        self.correct = self.wrong = self.graduated = 0
+        self.reviewed = []  # 已复习、尚未写入的已掌握单词
+
+    def run_sync(self, frontend):
+        """在新的事件循环中运行会话，返回Report"""
+        return asyncio.run(self.run(frontend))
+
+    async def run(self, frontend):
+        try:
+            return await self._run(frontend)
+        finally:
+            # 中途退出时也保存已完成的复习
+            self.reciter._record_words(self.reviewed, mastered=True)
+            self.reviewed = []
+
+    async def _run(self, frontend):
+        reciter = self.reciter
+        with reciter._prefetch_examples(self.words) as prefetcher:
+            for index, word in enumerate(self.words):
+                if index in self.examples:
+                    example = self.examples[index]
+                else:
+                    example = await asyncio.wrap_future(prefetcher.take(index))
+                if not self.mastered:
+                    # 作答期间在后台合成后续单词的例句音频
+                    reciter._prerender_ahead(self.words, index)
+                success = await self.practice(frontend, word, example, len(self.words) - index)
+                self._finish(frontend, word, success)
+        return Report(len(self.words), self.correct, self.wrong, self.graduated)
+
+    async def practice(self, frontend, word, example, remaining=None):
+        """练习一个单词，返回是否答对"""
+        reciter = self.reciter
+        state = WordAttempt(word, example, reciter._cloze_template(word, example))
+        if not word.example:
+            word.example = state.example
+        reciter._prerender_speech([word])  # 作答期间合成，答对时即可播放
+
+        prompt = Prompt(word, word.chinese, state.cloze, state.translation, len(word.english),
+                        word.success_count, reciter.max_success_count, None if self.mastered else remaining)
+        frontend.show(prompt)
+        interval = reciter.algorithm.estimated_interval(word)  # 本次复习距上次的间隔，随事件记录
+        while state.success is None:
+            prompted = time.perf_counter()
+            reply = await frontend.answer(prompt)
+            submitted = time.perf_counter()
+            text, first_key = (reply, None) if isinstance(reply, str) else reply
+            text = text.strip().lower()
+
+            attempt = state.attempt
+            outcome = state.submit(text)
+            reciter._log_attempt(word, _LOG_OUTCOMES[outcome], attempt, interval,
+                                 (prompted, first_key or submitted, submitted),
+                                 text if outcome in ('wrong', 'failed') else None)
+            if outcome in ('correct', 'replay'):
+                reciter._text_to_speech(state.example)
+            frontend.show(Feedback(word, outcome, state.attempts_left))
+        return state.success
+
+    def _finish(self, frontend, word, success):
+        """更新学习进度并写入日志"""
+        reciter = self.reciter
+        if success:
+            self.correct += 1
+        else:
+            self.wrong += 1
+        if self.mastered:
+            reciter._review_mastered(word)
+            self.reviewed.append(word)
+            return
+
+        mastered, delta_days = reciter._apply_review(word, success)
+        self.graduated += mastered
+        frontend.show(Result(word, success, mastered, word.next_review_date, delta_days))
+        if reciter._check_and_advance_round():
+            frontend.show(RoundAdvanced(reciter.current_review_round))
+
+
+class TerminalFrontend:
+    """终端界面：逐键读取输入（在线程中等待，不阻塞事件循环），每次按键只重绘变化的部分
+
+    terminal: lineedit中的终端对象，默认为真实终端；测试时可传入HeadlessTerminal按脚本输入。
+    """
+
+    PROMPT = "请输入英文单词（h=显示答案，s=播放语音）: "
+
+    def __init__(self, terminal=None):
+        self.terminal = terminal
+
+    def show(self, event):
+        if isinstance(event, Prompt):
+            if event.remaining is not None:
+                print(f"\n⏳ 剩余 {event.remaining} 个单词需要复习")
+            print(f"\n{'━'*30}")
+            print(f"🔔 当前进度: {event.success_count}/{event.max_success}")
+            print(f"📖 中文释义: {event.chinese}")
+            print(f"📝 例句: {event.example}")
+            if event.translation:
+                print(f"🌏 例句翻译: {event.translation}")
+        elif isinstance(event, Feedback):
+            if event.outcome == 'correct':
+                print("\n✅ 正确！")
+            elif event.outcome == 'replay':
+                print("\n")
+            elif event.outcome == 'wrong':
+                print(f"\n❌ 错误（剩余尝试次数 {event.attempts_left}）")
+            else:
+                if event.outcome == 'failed':
+                    print("\n❌ 错误（剩余尝试次数 0）")
+                print(f"\n📢 正确答案: {event.word.english}")
+        elif isinstance(event, Result):
+            word = event.word
+            if event.mastered:
+                print(f"🎉 已掌握单词: {word.english}")
+            elif event.success:
+                print(f"⏱ 下次复习: {word.next_review_date} (+{event.delta_days}天，第{word.success_count}次成功)")
+            elif event.delta_days is None:
+                print("⏳ 保持原复习计划")
+            else:
+                print(f"🔁 重新安排复习: {word.next_review_date} (+{event.delta_days}天)")
+        elif isinstance(event, RoundAdvanced):
+            print(f"\n🎯 进入第{event.review_round + 1}轮复习！")
+
+    async def answer(self, prompt):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read_answer)
+
+    def _read_answer(self):
+        from lineedit import ConsoleTerminal, read_line
+        if self.terminal is None:
+            self.terminal = ConsoleTerminal()
+        text, first_key = read_line(self.PROMPT, self.terminal, getattr(self.terminal, 'latencies', None))
+        return Answer(text, first_key)
@@ -0,0 +1,823 @@
+#!/usr/bin/env python3
+"""二进制快照：定长数值列 + 字符串表，可直接内存映射（mmap）读取
+
+与 learning_data.json 保存相同的数据，但打开文件不需要解析：
+- 每个字段一列定长数组（单词按 待复习、已掌握 的顺序排列，行号即位置），
+  日期保存为日期序数，空值用哨兵（字符串 0xFFFFFFFF，整数 -2^31，浮点 NaN）
+- 英文、中文、例句保存在去重的字符串表中，列中只保存编号，读取单词时才解码
+- 预先排好序的行号索引：按去重键（二分查找单词）、按到期日期（今日复习队列）、
+  按 (轮次, 复习次数, 到期日期)（学习进度看板），以及待复习单词的轮次分布和汇总计数
+- 文件头带魔数和版本号；整数为小端序，列按本机字节序直接映射（仅支持小端机器）
+
+BinaryStorage 把快照与 JsonStorage 相同的复习日志组合为存储后端
+（Config.STORAGE_BACKEND = "binary"）：打开时只映射文件、重放日志，
+查询直接读取列，不为全部单词构造对象。
+
+用法：
+    python snapshot.py to-binary learning_data.json learning_data.bin   # JSON（含日志）-> 二进制
+    python snapshot.py to-json learning_data.bin learning_data.json     # 二进制（含日志）-> JSON
+    python snapshot.py bench [--sizes 10000,100000,1000000]              # 比较加载时间和文件大小
+"""
+
+import heapq
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+
+from storage import JsonStorage, atomic_write_json, word_key
+
+MAGIC = b'RCTSNAP\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHHIQIIQQII')  # 魔数、版本、保留、保留、代数、待复习数、已掌握数、两组复习次数之和、字符串数、轮次数
+ALIGN = 8
+
+NO_STRING = 0xFFFFFFFF
+NO_INT = -2 ** 31
+NAN = float('nan')
+
+# 列名 -> array/memoryview 类型码（写入和读取的顺序）
+COLUMNS = (
+    ('english', 'I'), ('chinese', 'I'), ('example', 'I'),
+    ('success_count', 'I'), ('review_day', 'i'), ('review_round', 'I'), ('review_count', 'I'),
+    ('interval', 'i'), ('ease', 'd'), ('stability', 'd'), ('difficulty', 'd'), ('flags', 'B'),
+    ('key_index', 'I'), ('due_index', 'I'), ('status_index', 'I'), ('rounds', 'I'),
+    ('string_offsets', 'Q'), ('strings', 'B'),
+)
+DIRECTORY = struct.Struct('<' + 'QQ' * len(COLUMNS))  # 每列的 (偏移, 字节数)
+
+# flags：单词数据中是否有该键（保证与JSON相互转换时数据完全一致）
+HAS_EXAMPLE, HAS_ROUND, HAS_COUNT = 1, 2, 4
+MEMORY_FLAGS = (('ease', 8), ('interval', 16), ('stability', 32), ('difficulty', 64))
+KNOWN_KEYS = {'english', 'chinese', 'success_count', 'next_review_date', 'example',
+              'review_round', 'review_count', 'ease', 'interval', 'stability', 'difficulty'}
+
+
+class SnapshotError(ValueError):
+    """快照文件损坏或版本不支持"""
+
+
+def _aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_snapshot(path, all_words, mastered_words, generation=0):
+    """原子写入二进制快照（单词为 learning_data.json 中的字典格式）"""
+    rows = list(all_words) + list(mastered_words)
+    pending_count = len(all_words)
+    columns = {name: array(code) for name, code in COLUMNS}
+    strings, string_ids = [], {}
+
+    def string_id(text):
+        if text is None:
+            return NO_STRING
+        sid = string_ids.get(text)
+        if sid is None:
+            sid = string_ids[text] = len(strings)
+            strings.append(text)
+        return sid
+
+    keys, days = [], columns['review_day']
+    reviews = [0, 0]
+    rounds = {}
+    for row, data in enumerate(rows):
+        unknown = data.keys() - KNOWN_KEYS
+        if unknown:
+            raise ValueError(f"单词 {data.get('english')} 含有无法保存的字段: {', '.join(sorted(unknown))}")
+        flags = 0
+        columns['english'].append(string_id(data['english']))
+        columns['chinese'].append(string_id(data.get('chinese')))
+        if 'example' in data:
+            flags |= HAS_EXAMPLE
+        columns['example'].append(string_id(data.get('example')))
+        columns['success_count'].append(data.get('success_count', 0))
+        days.append(date.fromisoformat(data['next_review_date']).toordinal())
+        if 'review_round' in data:
+            flags |= HAS_ROUND
+        if 'review_count' in data:
+            flags |= HAS_COUNT
+        review_round, review_count = data.get('review_round', 0), data.get('review_count', 0)
+        columns['review_round'].append(review_round)
+        columns['review_count'].append(review_count)
+        for field, bit in MEMORY_FLAGS:
+            if field in data:
+                flags |= bit
+        interval = data.get('interval')
+        columns['interval'].append(NO_INT if interval is None else interval)
+        for field in ('ease', 'stability', 'difficulty'):
+            value = data.get(field)
+            columns[field].append(NAN if value is None else value)
+        columns['flags'].append(flags)
+        keys.append(word_key(data['english']))
+        mastered = row >= pending_count
+        reviews[mastered] += review_count
+        if not mastered:
+            rounds[review_round] = rounds.get(review_round, 0) + 1
+
+    pending = range(pending_count)
+    round_col, count_col = columns['review_round'], columns['review_count']
+    columns['key_index'].extend(sorted(range(len(rows)), key=keys.__getitem__))
+    columns['due_index'].extend(sorted(pending, key=lambda row: (days[row], row)))
+    columns['status_index'].extend(sorted(pending, key=lambda row: (round_col[row], count_col[row], days[row], row)))
+    for review_round in sorted(rounds):
+        columns['rounds'].extend((review_round, rounds[review_round]))
+    offsets = columns['string_offsets']
+    blob = bytearray()
+    offsets.append(0)
+    for text in strings:
+        blob += text.encode('utf-8')
+        offsets.append(len(blob))
+    columns['strings'] = blob
+
+    header = HEADER.pack(MAGIC, VERSION, 0, 0, generation, pending_count, len(rows) - pending_count,
+                         reviews[0], reviews[1], len(strings), len(rounds))
+    position = _aligned(HEADER.size + DIRECTORY.size)
+    directory = []
+    for name, _ in COLUMNS:
+        size = len(columns[name]) * (columns[name].itemsize if isinstance(columns[name], array) else 1)
+        directory.extend((position, size))
+        position = _aligned(position + size)
+
+    directory_path = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory_path, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(DIRECTORY.pack(*directory))
+            for (name, _), offset in zip(COLUMNS, directory[::2]):
+                f.write(b'\x00' * (offset - f.tell()))
+                column = columns[name]
+                f.write(column if isinstance(column, bytearray) else column.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class Snapshot:
+    """以内存映射方式打开的快照：列按需读取，单词按需解码"""
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise SnapshotError("二进制快照只支持小端序机器")
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # 空文件
+                raise SnapshotError(f"快照文件为空: {path}") from None
+        self._views = []
+        try:
+            self._parse()
+        except BaseException:
+            self.close()
+            raise
+
+    def _parse(self):
+        size = len(self._mmap)
+        if size < HEADER.size + DIRECTORY.size:
+            raise SnapshotError(f"快照文件不完整: {self.path}")
+        (magic, version, _, _, self.generation, self.pending_count, self.mastered_count,
+         pending_reviews, mastered_reviews, self.string_count, _) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise SnapshotError(f"不是学习数据快照: {self.path}")
+        if version != VERSION:
+            raise SnapshotError(f"不支持的快照版本 {version}: {self.path}")
+        self.reviews = {False: pending_reviews, True: mastered_reviews}
+        directory = DIRECTORY.unpack_from(self._mmap, HEADER.size)
+        whole = memoryview(self._mmap)
+        self._views.append(whole)
+        for (name, code), offset, length in zip(COLUMNS, directory[::2], directory[1::2]):
+            if offset + length > size:
+                raise SnapshotError(f"快照文件不完整: {self.path}")
+            view = whole[offset:offset + length]
+            self._views.append(view)
+            if code != 'B':
+                view = view.cast(code)
+                self._views.append(view)
+            setattr(self, name, view)
+        if len(self.english) != len(self) or len(self.string_offsets) != self.string_count + 1:
+            raise SnapshotError(f"快照文件不完整: {self.path}")
+
+    def __len__(self):
+        return self.pending_count + self.mastered_count
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def string(self, sid):
+        if sid == NO_STRING:
+            return None
+        offsets = self.string_offsets
+        return str(self.strings[offsets[sid]:offsets[sid + 1]], 'utf-8')
+
+    def key(self, row):
+        return word_key(self.string(self.english[row]))
+
+    def is_mastered(self, row):
+        return row >= self.pending_count
+
+    def position(self, row):
+        """单词在所属列表中的位置"""
+        return row - self.pending_count if row >= self.pending_count else row
+
+    def find(self, key):
+        """二分查找去重键，返回行号或None，O(log n)"""
+        index = self.key_index
+        low, high = 0, len(index)
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(index[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(index) and self.key(index[low]) == key:
+            return index[low]
+        return None
+
+    def round_counts(self):
+        """待复习单词的 {轮次: 单词数}"""
+        rounds = self.rounds
+        return {rounds[i]: rounds[i + 1] for i in range(0, len(rounds), 2)}
+
+    def words(self, start, stop, with_examples=True):
+        """批量解码第 start 到 stop-1 行：整列转为列表、字符串表一次解码，比逐行调用 word 快"""
+        blob, offsets = bytes(self.strings), self.string_offsets.tolist()
+        texts = [blob[a:b].decode('utf-8') for a, b in zip(offsets, offsets[1:])]
+        texts.append(None)  # NO_STRING 作为下标时取到 None（列表末尾）
+
+        def column(name):
+            return getattr(self, name)[start:stop].tolist()
+
+        english, chinese, success, days, flags = (column(name) for name in
+                                                  ('english', 'chinese', 'success_count', 'review_day', 'flags'))
+        examples = column('example') if with_examples else None
+        rounds, counts = column('review_round'), column('review_count')
+        basic = HAS_ROUND | HAS_COUNT
+        iso = {}
+        result = []
+        for i, flag in enumerate(flags):
+            day = days[i]
+            next_review_date = iso.get(day)
+            if next_review_date is None:
+                next_review_date = iso[day] = date.fromordinal(day).isoformat()
+            if flag == basic or (flag == basic | HAS_EXAMPLE and not with_examples):
+                # 最常见的情况：字段齐全、没有记忆模型字段，不需要例句
+                result.append({'english': texts[english[i]], 'chinese': texts[chinese[i]],
+                               'success_count': success[i], 'next_review_date': next_review_date,
+                               'review_round': rounds[i], 'review_count': counts[i]})
+            elif flag == basic | HAS_EXAMPLE:
+                sid = examples[i]
+                result.append({'english': texts[english[i]], 'chinese': texts[chinese[i]],
+                               'success_count': success[i], 'next_review_date': next_review_date,
+                               'example': texts[sid if sid != NO_STRING else -1],
+                               'review_round': rounds[i], 'review_count': counts[i]})
+            else:
+                result.append(self.word(start + i, with_examples, iso))
+        return result
+
+    def memory(self, row):
+        """单词的记忆状态 (ease, interval, stability, difficulty)，没有的为None"""
+        flags = self.flags[row]
+        values = []
+        for field, bit in MEMORY_FLAGS:
+            value = getattr(self, field)[row] if flags & bit else None
+            if value == NO_INT or value != value:
+                value = None
+            values.append(value)
+        return tuple(values)
+
+    def word(self, row, with_example=True, iso=None):
+        """解码一个单词为 learning_data.json 中的字典格式（iso: 可选的日期序数->ISO字符串缓存）"""
+        flags = self.flags[row]
+        day = self.review_day[row]
+        if iso is None:
+            next_review_date = date.fromordinal(day).isoformat()
+        else:
+            next_review_date = iso.get(day)
+            if next_review_date is None:
+                next_review_date = iso[day] = date.fromordinal(day).isoformat()
+        data = {
+            'english': self.string(self.english[row]),
+            'chinese': self.string(self.chinese[row]),
+            'success_count': self.success_count[row],
+            'next_review_date': next_review_date,
+        }
+        if with_example and flags & HAS_EXAMPLE:
+            data['example'] = self.string(self.example[row])
+        if flags & HAS_ROUND:
+            data['review_round'] = self.review_round[row]
+        if flags & HAS_COUNT:
+            data['review_count'] = self.review_count[row]
+        for field, bit in MEMORY_FLAGS:
+            if flags & bit:
+                value = getattr(self, field)[row]
+                if field == 'interval':
+                    data[field] = None if value == NO_INT else value
+                else:
+                    data[field] = None if value != value else value
+        return data
+
+
+class BinaryStorage(JsonStorage):
+    """二进制快照 + 复习日志
+
+    复习日志与JsonStorage相同；打开时把日志中的单词作为覆盖层保存在内存中，
+    查询时合并快照和覆盖层。快照在首次查询时才映射。
+    """
+
+    indexed = True
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._snapshot = None
+        self._reset_state()
+
+    def _reset_state(self):
+        self._opened = False
+        self._corrupt = None      # 快照损坏时的异常（load时抛出）
+        self._journal_found = False
+        self._overlay = {}        # 键 -> [单词数据, 是否已掌握, 位置]
+        self._overlaid = {}       # 被覆盖层替换的快照行号 -> 键
+        self._next_position = {False: 0, True: 0}
+        self._counts = {False: 0, True: 0}
+        self._reviews = {False: 0, True: 0}
+        self._rounds = {}         # 待复习单词的 {轮次: 单词数}
+
+    # ---- 打开与覆盖层 ----
+
+    def _open(self):
+        """映射快照并重放日志（只做一次）"""
+        if self._opened:
+            return
+        self._opened = True
+        try:
+            self._snapshot = Snapshot(self.path)
+        except FileNotFoundError:
+            self._snapshot = None
+        except SnapshotError as e:
+            self._backup_corrupt()
+            self._corrupt = e
+            self._snapshot = None
+        snapshot = self._snapshot
+        if snapshot is not None:
+            self.generation = snapshot.generation
+            self._counts = {False: snapshot.pending_count, True: snapshot.mastered_count}
+            self._reviews = dict(snapshot.reviews)
+            self._rounds = snapshot.round_counts()
+            self._next_position = {False: snapshot.pending_count, True: snapshot.mastered_count}
+        sections = {'all_words': {}, 'mastered_words': {}}
+        self._journal_found = self._corrupt is None and self._replay_journal(sections)
+        for name, mastered in (('all_words', False), ('mastered_words', True)):
+            for word_data in sections[name].values():
+                self._apply(word_data, mastered)
+
+    def _current(self, key):
+        """单词当前的 (数据或快照行号, 是否已掌握)，不存在时返回None"""
+        entry = self._overlay.get(key)
+        if entry is not None:
+            return entry[0], entry[1]
+        if self._snapshot is not None:
+            row = self._snapshot.find(key)
+            if row is not None:
+                return row, self._snapshot.is_mastered(row)
+        return None
+
+    def _stats_of(self, current):
+        source, mastered = current
+        if isinstance(source, dict):
+            return source.get('review_round', 0), source.get('review_count', 0)
+        return self._snapshot.review_round[source], self._snapshot.review_count[source]
+
+    def _apply(self, word_data, mastered, key=None, current=None):
+        """把一个单词的最新状态放入覆盖层，同时更新计数"""
+        key = key or word_key(word_data['english'])
+        if current is None:
+            current = self._current(key)
+        position = None
+        if current is not None:
+            review_round, review_count = self._stats_of(current)
+            source, was_mastered = current
+            self._counts[was_mastered] -= 1
+            self._reviews[was_mastered] -= review_count
+            if not was_mastered:
+                self._rounds[review_round] -= 1
+            if was_mastered == mastered:
+                # 仍在原列表中，保持原有位置
+                entry = self._overlay.get(key)
+                position = entry[2] if entry is not None else self._snapshot.position(source)
+            if not isinstance(source, dict):
+                self._overlaid[source] = key
+        if position is None:
+            position = self._next_position[mastered]
+            self._next_position[mastered] += 1
+        self._overlay[key] = [word_data, mastered, position]
+        self._counts[mastered] += 1
+        self._reviews[mastered] += word_data.get('review_count', 0)
+        if not mastered:
+            review_round = word_data.get('review_round', 0)
+            self._rounds[review_round] = self._rounds.get(review_round, 0) + 1
+
+    def _example_of(self, current):
+        source, _ = current
+        if isinstance(source, dict):
+            return source.get('example')
+        return self._snapshot.string(self._snapshot.example[source])
+
+    # ---- 写入 ----
+
+    def record_many(self, entries):
+        """向日志追加一批 (单词数据, 是否已掌握)；未读取例句的单词沿用已保存的例句"""
+        self._open()
+        prepared = []
+        for word_data, mastered in entries:
+            key = word_key(word_data['english'])
+            current = self._current(key)
+            if 'example' not in word_data and current is not None:
+                word_data = {**word_data, 'example': self._example_of(current)}
+            prepared.append((word_data, mastered, key, current))
+        super().record_many([(word_data, mastered) for word_data, mastered, _, _ in prepared])
+        for word_data, mastered, key, current in prepared:
+            self._apply(word_data, mastered, key, current)
+
+    def save_all(self, all_words, mastered_words):
+        """压缩：原子写入新快照（未读取例句的单词沿用已保存的例句），然后清空日志"""
+        self._open()
+        sections = [list(all_words), list(mastered_words)]
+        if any('example' not in word_data for section in sections for word_data in section):
+            examples = self._example_lookup()
+            for section in sections:
+                for i, word_data in enumerate(section):
+                    if 'example' not in word_data:
+                        key = word_key(word_data['english'])
+                        if key in examples:
+                            section[i] = {**word_data, 'example': examples[key]}
+        # 先关闭映射；写入失败时快照和日志保持原样，下次查询重新打开
+        self._close_snapshot()
+        self._reset_state()
+        write_snapshot(self.path, sections[0], sections[1], self.generation + 1)
+        self.generation += 1
+        self._reset_journal()
+
+    def _example_lookup(self):
+        """{键: 例句}（一次扫描快照，供整体保存时补全例句）"""
+        examples = {}
+        snapshot = self._snapshot
+        if snapshot is not None:
+            for row in range(len(snapshot)):
+                if snapshot.flags[row] & HAS_EXAMPLE:
+                    examples[snapshot.key(row)] = snapshot.string(snapshot.example[row])
+        for key, (word_data, _, _) in self._overlay.items():
+            if 'example' in word_data:
+                examples[key] = word_data['example']
+        return examples
+
+    def _close_snapshot(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def close(self):
+        super().close()
+        self._close_snapshot()
+
+    # ---- 读取 ----
+
+    def load(self, with_examples=True):
+        """解码全部单词，返回 {'all_words': [...], 'mastered_words': [...]}
+
+        快照与日志都不存在时抛出FileNotFoundError；快照损坏时备份为 *.corrupt（日志移到 *.journal.corrupt）并抛出SnapshotError。
+        """
+        self._open()
+        if self._corrupt is not None:
+            error, self._corrupt = self._corrupt, None
+            raise error
+        if self._snapshot is None and not self._journal_found:
+            raise FileNotFoundError(self.path)
+        return {'all_words': self._section(False, with_examples),
+                'mastered_words': self._section(True, with_examples)}
+
+    def _section(self, mastered, with_examples):
+        snapshot = self._snapshot
+        words = []
+        if snapshot is not None:
+            first = snapshot.pending_count if mastered else 0
+            last = len(snapshot) if mastered else snapshot.pending_count
+            words = snapshot.words(first, last, with_examples)
+            if self._overlaid:
+                # 被覆盖层替换的行：仍在本列表中则替换为最新状态，否则删除
+                for row in sorted(self._overlaid, reverse=True):
+                    if first <= row < last:
+                        word_data, entry_mastered, _ = self._overlay[self._overlaid[row]]
+                        if entry_mastered == mastered:
+                            words[row - first] = self._strip(word_data, with_examples)
+                        else:
+                            del words[row - first]
+        start = snapshot.mastered_count if snapshot is not None and mastered else \
+            snapshot.pending_count if snapshot is not None else 0
+        appended = sorted((position, word_data) for word_data, entry_mastered, position in self._overlay.values()
+                          if entry_mastered == mastered and position >= start)
+        words.extend(self._strip(word_data, with_examples) for _, word_data in appended)
+        return words
+
+    @staticmethod
+    def _strip(word_data, with_examples):
+        if with_examples or 'example' not in word_data:
+            return word_data
+        return {key: value for key, value in word_data.items() if key != 'example'}
+
+    def load_example(self, english):
+        """按英文单词读取例句"""
+        self._open()
+        current = self._current(word_key(english))
+        return None if current is None else self._example_of(current)
+
+    def lookup(self, keys):
+        """按去重键批量查询已有单词，返回 {键: 单词数据}（含 'mastered'）"""
+        self._open()
+        found = {}
+        for key in keys:
+            current = self._current(key)
+            if current is None:
+                continue
+            source, mastered = current
+            data = dict(source) if isinstance(source, dict) else self._snapshot.word(source)
+            data['mastered'] = mastered
+            found[key] = data
+        return found
+
+    def _live_rows(self, rows):
+        """跳过被覆盖层替换的快照行"""
+        overlaid = self._overlaid
+        return (row for row in rows if row not in overlaid)
+
+    def load_due(self, today):
+        """到期单词，按 (复习轮次, 复习次数, 原有顺序) 排序；快照按到期日期二分查找"""
+        self._open()
+        today = today.toordinal()
+        due = []
+        snapshot = self._snapshot
+        if snapshot is not None:
+            index, days = snapshot.due_index, snapshot.review_day
+            low, high = 0, len(index)
+            while low < high:
+                middle = (low + high) // 2
+                if days[index[middle]] <= today:
+                    low = middle + 1
+                else:
+                    high = middle
+            for row in self._live_rows(index[:low]):
+                due.append(((snapshot.review_round[row], snapshot.review_count[row], row), row))
+        for word_data, mastered, position in self._overlay.values():
+            if not mastered and date.fromisoformat(word_data['next_review_date']).toordinal() <= today:
+                due.append(((word_data.get('review_round', 0), word_data.get('review_count', 0), position),
+                            word_data))
+        due.sort(key=lambda item: item[0])
+        return [snapshot.word(source) if isinstance(source, int) else dict(source) for _, source in due]
+
+    def min_round(self):
+        """待复习单词的最小复习轮次，没有单词时返回None"""
+        self._open()
+        rounds = [review_round for review_round, count in self._rounds.items() if count > 0]
+        return min(rounds) if rounds else None
+
+    def has_round(self, review_round):
+        """指定轮次是否还有待复习单词，O(1)"""
+        self._open()
+        return self._rounds.get(review_round, 0) > 0
+
+    def load_below_round(self, review_round):
+        """轮次低于review_round的待复习单词（推进轮次时使用），保持原有顺序
+
+        轮次计数中没有更低的轮次时直接返回；否则快照部分在按轮次排序的索引上取前缀。
+        """
+        self._open()
+        if not any(count > 0 for r, count in self._rounds.items() if r < review_round):
+            return []
+        found = []
+        snapshot = self._snapshot
+        if snapshot is not None:
+            index, rounds = snapshot.status_index, snapshot.review_round
+            for row in index:
+                if rounds[row] >= review_round:
+                    break
+                if row not in self._overlaid:
+                    found.append((snapshot.position(row), row))
+        found.extend((position, word_data) for word_data, mastered, position in self._overlay.values()
+                     if not mastered and word_data.get('review_round', 0) < review_round)
+        found.sort(key=lambda item: item[0])
+        return [snapshot.word(source) if isinstance(source, int) else dict(source) for _, source in found]
+
+    def counts(self):
+        """返回 (待复习单词数, 已掌握单词数)"""
+        self._open()
+        return self._counts[False], self._counts[True]
+
+    def aggregate(self):
+        """单词数与复习次数之和（按是否已掌握分组）"""
+        self._open()
+        return {'pending': self._counts[False], 'mastered': self._counts[True],
+                'pending_reviews': self._reviews[False], 'mastered_reviews': self._reviews[True]}
+
+    def pending_schedule(self, memory=False):
+        """待复习单词的 (下次复习日期, 成功次数)，用于复习量预测
+
+        memory=True 时每行再加上记忆状态 (ease, interval, stability, difficulty)，没有的为None。
+        """
+        self._open()
+        rows = []
+        fields = [field for field, _ in MEMORY_FLAGS] if memory else []
+        snapshot = self._snapshot
+        if snapshot is not None:
+            iso = {}
+            days, success = snapshot.review_day, snapshot.success_count
+            for row in self._live_rows(range(snapshot.pending_count)):
+                day = days[row]
+                text = iso.get(day)
+                if text is None:
+                    text = iso[day] = date.fromordinal(day).isoformat()
+                rows.append((text, success[row]) + snapshot.memory(row) if memory else (text, success[row]))
+        rows.extend((word_data['next_review_date'], word_data.get('success_count', 0))
+                    + tuple(word_data.get(field) for field in fields)
+                    for word_data, mastered, _ in self._overlay.values() if not mastered)
+        return rows
+
+    def page(self, mastered, limit, offset, review_round=None, due_before=None, text=None):
+        """分页查询单词（不含例句），返回 (单词数据列表, 符合条件的总数)
+
+        排序与SqliteStorage相同：待复习单词按 (复习轮次, 复习次数, 下次复习日期, 位置)，
+        已掌握单词按位置。快照部分使用预先排好序的索引，不带筛选条件时只读取当前页。
+        """
+        self._open()
+        snapshot = self._snapshot
+        due_day = due_before.toordinal() if due_before is not None else None
+        pattern = text.casefold() if text else None
+
+        def snapshot_key(row):
+            if mastered:
+                return (row - snapshot.pending_count,)
+            return (snapshot.review_round[row], snapshot.review_count[row], snapshot.review_day[row], row)
+
+        def snapshot_matches(row):
+            if review_round is not None and snapshot.review_round[row] != review_round:
+                return False
+            if due_day is not None and snapshot.review_day[row] > due_day:
+                return False
+            if pattern is not None:
+                chinese = snapshot.string(snapshot.chinese[row]) or ''
+                return pattern in snapshot.key(row) or pattern in chinese.casefold()
+            return True
+
+        def overlay_matches(word_data):
+            if review_round is not None and word_data.get('review_round', 0) != review_round:
+                return False
+            if due_day is not None and date.fromisoformat(word_data['next_review_date']).toordinal() > due_day:
+                return False
+            if pattern is not None:
+                return pattern in word_key(word_data['english']) or \
+                    pattern in (word_data.get('chinese') or '').casefold()
+            return True
+
+        def overlay_key(word_data, position):
+            if mastered:
+                return (position,)
+            return (word_data.get('review_round', 0), word_data.get('review_count', 0),
+                    date.fromisoformat(word_data['next_review_date']).toordinal(), position)
+
+        snapshot_items = iter(())
+        if snapshot is not None:
+            rows = range(snapshot.pending_count, len(snapshot)) if mastered else snapshot.status_index
+            snapshot_items = ((snapshot_key(row), row) for row in self._live_rows(rows) if snapshot_matches(row))
+        overlay_items = sorted((overlay_key(word_data, position), word_data)
+                               for word_data, entry_mastered, position in self._overlay.values()
+                               if entry_mastered == mastered and overlay_matches(word_data))
+        merged = heapq.merge(snapshot_items, overlay_items, key=lambda item: item[0])
+        if review_round is None and due_day is None and pattern is None:
+            total = self._counts[mastered]
+            page = list(itertools.islice(merged, offset, offset + limit))
+        else:
+            matched = list(merged)
+            total = len(matched)
+            page = matched[offset:offset + limit]
+        return [snapshot.word(source, with_example=False) if isinstance(source, int)
+                else self._strip(source, False) for _, source in page], total
+
+
+def _remove_journal(path):
+    """转换后的数据已包含日志内容，删除目标文件旁遗留的旧日志"""
+    try:
+        os.remove(path + '.journal')
+    except FileNotFoundError:
+        pass
+
+
+def json_to_binary(json_path, binary_path):
+    """JSON学习数据（含复习日志）-> 二进制快照，返回 (待复习单词数, 已掌握单词数)"""
+    source = JsonStorage(json_path)
+    data = source.load()
+    write_snapshot(binary_path, data['all_words'], data['mastered_words'], source.generation)
+    _remove_journal(binary_path)
+    return len(data['all_words']), len(data['mastered_words'])
+
+
+def binary_to_json(binary_path, json_path):
+    """二进制快照（含复习日志）-> JSON学习数据，返回 (待复习单词数, 已掌握单词数)"""
+    source = BinaryStorage(binary_path)
+    try:
+        data = source.load()
+        generation = source.generation
+    finally:
+        source.close()
+    atomic_write_json(json_path, {'generation': generation, **data}, ensure_ascii=False, indent=2)
+    _remove_journal(json_path)
+    return len(data['all_words']), len(data['mastered_words'])
+
+
+def bench(sizes, today=None, progress=print):
+    """比较JSON与二进制快照的文件大小、完整加载时间和打开后查询今日复习队列的时间"""
+    import tempfile
+    import time
+    from bench_suite import make_deck
+
+    today = today or date.today()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, binary_path = os.path.join(tmp, 'data.json'), os.path.join(tmp, 'data.bin')
+        for size in sizes:
+            all_words, mastered_words = make_deck(size, today)
+            JsonStorage(json_path).save_all(all_words, mastered_words)
+            write_snapshot(binary_path, all_words, mastered_words)
+
+            start = time.perf_counter()
+            JsonStorage(json_path).load()
+            json_load = time.perf_counter() - start
+
+            storage = BinaryStorage(binary_path)
+            start = time.perf_counter()
+            due = storage.load_due(today)
+            counts = storage.counts()
+            binary_open = time.perf_counter() - start
+            storage.close()
+
+            storage = BinaryStorage(binary_path)
+            start = time.perf_counter()
+            storage.load()
+            binary_load = time.perf_counter() - start
+            storage.close()
+
+            result = {'size': size, 'json_bytes': os.path.getsize(json_path),
+                      'binary_bytes': os.path.getsize(binary_path), 'json_load_ms': json_load * 1000,
+                      'binary_load_ms': binary_load * 1000, 'binary_open_due_ms': binary_open * 1000,
+                      'due': len(due), 'words': sum(counts)}
+            results.append(result)
+            if progress:
+                progress(f"  {size} 个单词: JSON {result['json_bytes'] / 1e6:.1f}MB 加载 {result['json_load_ms']:.0f}ms | "
+                         f"二进制 {result['binary_bytes'] / 1e6:.1f}MB 加载 {result['binary_load_ms']:.0f}ms，"
+                         f"打开并查询今日队列 {result['binary_open_due_ms']:.1f}ms")
+    return results
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="学习数据的二进制快照")
+    commands = parser.add_subparsers(dest='command', required=True)
+    to_binary = commands.add_parser('to-binary', help="JSON学习数据 -> 二进制快照")
+    to_binary.add_argument('json_file')
+    to_binary.add_argument('binary_file')
+    to_json = commands.add_parser('to-json', help="二进制快照 -> JSON学习数据")
+    to_json.add_argument('binary_file')
+    to_json.add_argument('json_file')
+    bench_parser = commands.add_parser('bench', help="比较JSON与二进制快照的加载时间和文件大小")
+    bench_parser.add_argument('--sizes', default='10000,100000,1000000')
+    bench_parser.add_argument('--output', help="结果写入JSON文件")
+    args = parser.parse_args(argv)
+
+    if args.command == 'to-binary':
+        pending, mastered = json_to_binary(args.json_file, args.binary_file)
+        print(f"✅ 转换完成: 待复习 {pending} 个 | 已掌握 {mastered} 个 -> {args.binary_file}")
+    elif args.command == 'to-json':
+        pending, mastered = binary_to_json(args.binary_file, args.json_file)
+        print(f"✅ 转换完成: 待复习 {pending} 个 | 已掌握 {mastered} 个 -> {args.json_file}")
+    else:
+        print("⏱ 快照格式基准:")
+        results = bench([int(size) for size in args.sizes.split(',')])
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"📄 结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
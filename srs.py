@@ -0,0 +1,365 @@
+"""复习间隔算法：艾宾浩斯间隔表（默认）、SM-2、FSRS
+
+每种算法实现两个方法：
+- review(word, correct, today=None)：根据本次复习结果更新单词的记忆状态，
+  返回距离下次复习的天数；返回None表示保持原复习计划（today为日期序数，用于计算实际间隔天数）
+- current_interval(word)：单词当前的复习间隔（进入新轮次时重新安排复习日期用）
+- estimated_interval(word)：同上，但不为旧数据补写记忆状态（只读，用于排序、统计等不保存单词的场合）
+
+单词的 success_count / review_count 由调用方维护，算法只负责间隔和记忆状态
+（Word.ease / interval / stability / difficulty，会随学习数据一起保存）。
+
+离线模拟（比较各算法的复习次数和记忆保持率；并把各算法的间隔按比例缩放到相同的平均保持率，
+比较达到同一保持率所需的复习次数）：
+    python srs.py simulate [数据文件] [天数] [新单词数] [目标保持率]
+"""
+
+import math
+import random
+import unicodedata
+
+
+class EbbinghausAlgorithm:
+    """固定间隔表：第n次成功后间隔 intervals[n-1] 天，答错保持原复习计划"""
+
+    name = 'ebbinghaus'
+
+    def __init__(self, intervals):
+        self.intervals = intervals
+
+    def current_interval(self, word):
+        # 处理边界情况：新单词(success_count=0)应该立即复习
+        if word.success_count == 0:
+            return 0
+        success_index = word.success_count - 1
+        if success_index < len(self.intervals):
+            return self.intervals[success_index]
+        return self.intervals[-1]  # 使用最大间隔
+
+    estimated_interval = current_interval  # 不修改单词
+
+    def review(self, word, correct, today=None):
+        if not correct:
+            return None
+        word.interval = None  # 间隔由success_count决定，不单独保存
+        return self.current_interval(word)
+
+
+class SM2Algorithm:
+    """SM-2：每个单词有自己的难度系数(ease)，答对间隔按系数增长，答错从头开始
+
+    只有对/错两种结果，答对按质量4、答错按质量1计算。
+    interval为0表示重新开始（下次答对间隔1天，再下次6天）。
+    """
+
+    name = 'sm2'
+    CORRECT_QUALITY = 4
+    WRONG_QUALITY = 1
+
+    def __init__(self, intervals, initial_ease=2.5, min_ease=1.3):
+        self.intervals = intervals  # 旧数据没有记忆状态时，由success_count推算当前间隔
+        self.initial_ease = initial_ease
+        self.min_ease = min_ease
+
+    def _ensure_state(self, word):
+        if word.ease is None:
+            word.ease = self.initial_ease
+        if word.interval is None:
+            word.interval = EbbinghausAlgorithm(self.intervals).current_interval(word)
+
+    def current_interval(self, word):
+        self._ensure_state(word)
+        return word.interval
+
+    def estimated_interval(self, word):
+        if word.interval is None:
+            return EbbinghausAlgorithm(self.intervals).current_interval(word)
+        return word.interval
+
+    def review(self, word, correct, today=None):
+        self._ensure_state(word)
+        quality = self.CORRECT_QUALITY if correct else self.WRONG_QUALITY
+        word.ease = max(self.min_ease,
+                        word.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        if not correct:
+            word.interval = 0
+            return 1  # 明天重新学习
+        if word.interval < 1:
+            word.interval = 1
+        elif word.interval == 1:
+            word.interval = 6
+        else:
+            word.interval = round(word.interval * word.ease)
+        return word.interval
+
+
+class FSRSAlgorithm:
+    """FSRS（v4参数）：按记忆稳定性(stability)和难度(difficulty)安排间隔
+
+    下次复习安排在记忆保持率降到 desired_retention 的那一天；
+    答错后稳定性下降，第二天重新学习。
+    """
+
+    name = 'fsrs'
+    WEIGHTS = (0.4, 0.6, 2.4, 5.8, 4.93, 0.94, 0.86, 0.01, 1.49, 0.14, 0.94,
+               2.18, 0.05, 0.34, 1.26, 0.29, 2.61)
+    AGAIN, GOOD = 1, 3
+
+    def __init__(self, intervals, desired_retention=0.9, maximum_interval=365):
+        self.intervals = intervals
+        self.desired_retention = desired_retention
+        self.maximum_interval = maximum_interval
+
+    def _initial_difficulty(self, rating):
+        w = self.WEIGHTS
+        return min(max(w[4] - (rating - 3) * w[5], 1.0), 10.0)
+
+    def _ensure_state(self, word):
+        """旧数据没有记忆状态时，以原间隔作为稳定性"""
+        if word.stability is None and word.success_count > 0:
+            word.stability = float(EbbinghausAlgorithm(self.intervals).current_interval(word))
+            word.interval = round(word.stability)
+        if word.stability is not None and word.difficulty is None:
+            word.difficulty = self._initial_difficulty(self.GOOD)
+
+    @staticmethod
+    def retrievability(elapsed_days, stability):
+        return (1 + elapsed_days / (9 * stability)) ** -1
+
+    @staticmethod
+    def elapsed_days(word, today):
+        """距上次复习的实际天数：上次复习日 = 下次复习日 - 当前间隔；不知道今天时按计划间隔"""
+        interval = word.interval or 0
+        if today is None:
+            return interval
+        return today - (word.review_day - interval)
+
+    def _next_interval(self, stability):
+        interval = 9 * stability * (1 / self.desired_retention - 1)
+        return min(max(round(interval), 1), self.maximum_interval)
+
+    def current_interval(self, word):
+        self._ensure_state(word)
+        if word.stability is None:
+            return 0
+        return self._next_interval(word.stability)
+
+    def estimated_interval(self, word):
+        stability = word.stability
+        if stability is None and word.success_count > 0:
+            stability = float(EbbinghausAlgorithm(self.intervals).current_interval(word))
+        if stability is None:
+            return 0
+        return self._next_interval(stability)
+
+    def review(self, word, correct, today=None):
+        self._ensure_state(word)
+        w = self.WEIGHTS
+        rating = self.GOOD if correct else self.AGAIN
+        if word.stability is None:
+            # 第一次复习
+            word.stability = w[rating - 1]
+            word.difficulty = self._initial_difficulty(rating)
+        else:
+            elapsed = max(self.elapsed_days(word, today), 0)
+            r = self.retrievability(elapsed, word.stability)
+            d, s = word.difficulty, word.stability
+            if correct:
+                word.stability = s * (1 + math.exp(w[8]) * (11 - d) * s ** -w[9]
+                                      * (math.exp(w[10] * (1 - r)) - 1))
+            else:
+                word.stability = min(s, w[11] * d ** -w[12] * ((s + 1) ** w[13] - 1)
+                                     * math.exp(w[14] * (1 - r)))
+            d = d - w[6] * (rating - 3)
+            d = w[7] * self._initial_difficulty(self.GOOD) + (1 - w[7]) * d  # 向初始难度回归
+            word.difficulty = min(max(d, 1.0), 10.0)
+
+        word.interval = self._next_interval(word.stability) if correct else 1
+        return word.interval
+
+
+ALGORITHMS = {cls.name: cls for cls in (EbbinghausAlgorithm, SM2Algorithm, FSRSAlgorithm)}
+
+
+def create_algorithm(name, intervals, **options):
+    """按名称创建复习间隔算法（ebbinghaus / sm2 / fsrs）"""
+    try:
+        cls = ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(f"未知的复习算法: {name}（可选: {', '.join(ALGORITHMS)}）")
+    return cls(intervals, **options)
+
+
+class ScaledAlgorithm:
+    """把算法安排的间隔乘以factor（至少1天）：模拟中调节复习频率，在相同保持率下比较各算法"""
+
+    def __init__(self, algorithm, factor):
+        self.algorithm = algorithm
+        self.factor = factor
+        self.name = algorithm.name
+        self.intervals = getattr(algorithm, 'intervals', [])
+
+    def current_interval(self, word):
+        return self._scale(self.algorithm.current_interval(word))
+
+    def estimated_interval(self, word):
+        return self._scale(self.algorithm.estimated_interval(word))
+
+    def _scale(self, interval):
+        return max(round(interval * self.factor), 1) if interval else interval
+
+    def review(self, word, correct, today=None):
+        delta = self.algorithm.review(word, correct, today)
+        return None if delta is None else max(round(delta * self.factor), 1)
+
+
+class _SimWord:
+    """模拟用的单词：只包含算法需要的字段
+
+    review_day 按算法的约定为"上次复习日 + 当前间隔"，算法据此得到距上次复习的实际天数。
+    """
+
+    __slots__ = ('success_count', 'review_day', 'ease', 'interval', 'stability', 'difficulty')
+
+    def __init__(self, success_count, review_day=0):
+        self.success_count = success_count
+        self.review_day = review_day
+        self.ease = self.interval = self.stability = self.difficulty = None
+
+
+def simulate(algorithm, words, days, seed=0):
+    """在相同的记忆模型下模拟一个算法
+
+    words: [(success_count, 距今天的到期天数)]，通常来自已记录的学习数据
+    记忆模型：每个单词有隐藏的半衰期，回忆概率为 2^(-距上次复习天数/半衰期)；
+    答对后半衰期增长，回忆越吃力增长越多（间隔效应），增长幅度因单词难易而不同；
+    答错后半衰期减半。同一seed下各算法面对同一批单词。
+    模拟期间单词不会转入已掌握列表，以便比较相同天数内的复习量和记忆保持率。
+    返回复习次数、答错次数、每天所有单词的平均记忆保持率、每天复习量的平均值和峰值，
+    以及复习效率（每次复习换来的"记住的单词·天"数）。
+    """
+    rng = random.Random(seed)
+    table = EbbinghausAlgorithm(getattr(algorithm, 'intervals', []))
+    buckets = {}
+    state = []  # [单词, 半衰期, 增长系数, 上次复习日]
+    for index, (success_count, offset) in enumerate(words):
+        half_life = rng.lognormvariate(math.log(1 + 2 * success_count), 0.5)
+        growth = rng.uniform(2.0, 5.0)  # 难词增长慢，易词增长快
+        word = _SimWord(success_count, offset)
+        last_day = offset - table.current_interval(word)  # 按原间隔表推算上次复习
+        state.append([word, half_life, growth, last_day])
+        buckets.setdefault(max(offset, 0), []).append(index)
+
+    outcome_rng = random.Random(seed + 1)
+    reviews = lapses = 0
+    retention_sum = 0.0
+    daily = []
+    for day in range(days):
+        due = buckets.pop(day, ())
+        daily.append(len(due))
+        for index in due:
+            entry = state[index]
+            word, half_life, growth, last_day = entry
+            p_recall = 2 ** (-max(day - last_day, 0) / half_life)
+            correct = outcome_rng.random() < p_recall
+            reviews += 1
+            if correct:
+                word.success_count += 1
+                entry[1] = half_life * (1 + (growth - 1) * (1 - p_recall) * 2)
+            else:
+                lapses += 1
+                entry[1] = max(half_life / 2, 0.5)
+            entry[3] = day
+            delta = algorithm.review(word, correct, day)
+            if delta is None:
+                delta = 1  # 保持原复习计划：第二天作为过期单词再次复习
+            delta = max(delta, 1)
+            # 间隔被缩放时，算法记录的间隔与实际安排的不同：按算法的间隔推算，保证上次复习日正确
+            word.review_day = day + (word.interval if word.interval else delta)
+            buckets.setdefault(day + delta, []).append(index)
+        retention_sum += sum(2 ** (-max(day - e[3], 0) / e[1]) for e in state) / len(state) if state else 0.0
+
+    return {
+        'algorithm': algorithm.name,
+        'reviews': reviews,
+        'lapses': lapses,
+        'retention': retention_sum / days if days else 0.0,
+        'efficiency': retention_sum * len(state) / reviews if reviews else 0.0,
+        'avg_daily': sum(daily) / days if days else 0.0,
+        'peak_daily': max(daily, default=0),
+    }
+
+
+def match_retention(algorithm, words, days, target, seed=0, steps=14):
+    """按比例缩放算法的间隔，使模拟的平均保持率达到target，返回 (缩放系数, 模拟结果)
+
+    保持率随间隔变长而下降，在 [1/16, 16] 倍之间按对数二分查找；达不到target时返回最接近的一端。
+    """
+    low, high = math.log(1 / 16), math.log(16)  # 系数越大间隔越长、保持率越低
+    best = None
+    for _ in range(steps):
+        middle = (low + high) / 2
+        result = simulate(ScaledAlgorithm(algorithm, math.exp(middle)), words, days, seed)
+        if best is None or abs(result['retention'] - target) < abs(best[1]['retention'] - target):
+            best = (math.exp(middle), result)
+        if result['retention'] > target:
+            low = middle
+        else:
+            high = middle
+    return best
+
+
+def _cell(text, width, left=False):
+    """按终端显示宽度对齐（汉字占两列），默认右对齐"""
+    text = str(text)
+    padding = ' ' * max(width - sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text), 0)
+    return text + padding if left else padding + text
+
+
+if __name__ == "__main__":
+    import sys
+    from datetime import date
+    from reciter import Config
+    from storage import read_json_data
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'simulate':
+        print("用法: python srs.py simulate [数据文件] [天数] [新单词数] [目标保持率]")
+        sys.exit(1)
+    data_path = sys.argv[2] if len(sys.argv) > 2 else Config.DATA_FILE
+    days = int(sys.argv[3]) if len(sys.argv) > 3 else 180
+    new_words = int(sys.argv[4]) if len(sys.argv) > 4 else 200
+    target = float(sys.argv[5]) if len(sys.argv) > 5 else 0.9
+
+    def configured(name):
+        """按复习程序的配置（间隔表、FSRS目标保持率）创建算法"""
+        options = {'desired_retention': Config.FSRS_DESIRED_RETENTION} if name == 'fsrs' else {}
+        return create_algorithm(name, Config.REVIEW_INTERVAL_DAYS, **options)
+
+    today = date.today().toordinal()
+    data = read_json_data(data_path)
+    deck = [(w.get('success_count', 0), date.fromisoformat(w['next_review_date']).toordinal() - today)
+            for w in data['all_words']]
+    print(f"📚 以 {data_path} 中的 {len(deck)} 个待复习单词和 {new_words} 个新单词为起点，模拟 {days} 天")
+    deck += [(0, 0)] * new_words
+    widths = (12, 10, 8, 12, 8, 8, 10)
+
+    def row(*cells):
+        return ''.join(_cell(cell, width, left=i == 0) for i, (cell, width) in enumerate(zip(cells, widths)))
+
+    header = row('算法', '复习次数', '答错', '平均保持率', '日均', '峰值', '复习效率')
+
+    def result_row(name, result, *extra):
+        return row(name, result['reviews'], result['lapses'], f"{result['retention']:.1%}",
+                   f"{result['avg_daily']:.1f}", result['peak_daily'], f"{result['efficiency']:.1f}", *extra)
+
+    print("\n按各算法的默认设置（保持率不同，复习次数不能直接比较）:")
+    print(header)
+    for name in ALGORITHMS:
+        print(result_row(name, simulate(configured(name), deck, days)))
+
+    print(f"\n间隔按比例缩放到相同的平均保持率 {target:.0%}（比较达到同一保持率所需的复习次数）:")
+    widths += (10,)
+    print(header + _cell('间隔倍数', widths[-1]))
+    for name in ALGORITHMS:
+        factor, result = match_retention(configured(name), deck, days, target)
+        print(result_row(name, result, f"{factor:.2f}x"))
@@ -0,0 +1,505 @@
+"""学习数据存储层：JSON快照 + 追加写日志，或带索引的SQLite数据库"""
+
+import json
+import os
+import sqlite3
+
+
+def word_key(english):
+    """单词的去重键（大小写折叠）"""
+    return english.casefold()
+
+
+def atomic_write_json(path, data, **kwargs):
+    """原子写入JSON：先写入同目录临时文件并fsync，再替换目标文件
+
+    写入过程中崩溃只会留下临时文件，原文件保持完整。
+    """
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_journal(journal_path, generation, sections):
+    """只读地把日志应用到 sections（{'all_words': {键: 单词}, 'mastered_words': {...}}）
+
+    日志头的代数与快照不一致时不应用；读到末尾写了一半的记录即停止。
+    日志不存在时返回None，否则返回 (是否已重放, 完整记录的字节数, 重放的事件数)。
+    """
+    try:
+        f = open(journal_path, 'rb')
+    except FileNotFoundError:
+        return None
+
+    good_offset = 0
+    replay = None  # 首行为日志头，代数一致才重放
+    count = 0
+    with f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                break  # 崩溃时写了一半的记录
+            if not line.endswith(b'\n'):
+                break
+            good_offset += len(line)
+            if replay is None:
+                replay = entry.get('generation') == generation
+                continue
+            if not replay:
+                continue
+            word = entry['word']
+            key = word_key(word['english'])
+            target = 'mastered_words' if entry.get('mastered') else 'all_words'
+            other = 'all_words' if entry.get('mastered') else 'mastered_words'
+            sections[other].pop(key, None)
+            sections[target][key] = word
+            count += 1
+    return bool(replay), good_offset, count
+
+
+def read_json_data(path):
+    """只读地读取JSON学习数据（含日志），不修改、不备份、不修复任何文件
+
+    文件不存在时抛出FileNotFoundError，格式错误时抛出ValueError。
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = None
+    if data is not None and not isinstance(data, dict):
+        raise ValueError(f"{path} 不是学习数据文件（顶层应为JSON对象）")
+    sections = {
+        name: {word_key(w['english']): w for w in (data or {}).get(name, [])}
+        for name in ('all_words', 'mastered_words')
+    }
+    generation = (data or {}).get('generation', 0)
+    if read_journal(path + '.journal', generation, sections) is None and data is None:
+        raise FileNotFoundError(path)
+    return {name: list(words.values()) for name, words in sections.items()}
+
+
+class JsonStorage:
+    """JSON快照 + 单词复习日志（write-ahead journal）
+
+    - 每次复习只向日志追加一行单词状态，代价为O(1)
+    - 日志达到阈值后由调用方触发压缩：整体写入新快照并清空日志
+    - 启动时读取最近一次快照，再按顺序重放日志
+    快照与日志都带有代数(generation)，压缩中途崩溃时旧日志不会被重放到新快照上。
+    """
+
+    indexed = False  # 只能整体加载
+
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = path + '.journal'
+        self.generation = 0
+        self.journal_size = 0  # 日志中尚未压缩的事件数
+        self._journal = None
+
+    def load(self):
+        """读取快照并重放日志，返回 {'all_words': [...], 'mastered_words': [...]}
+
+        快照与日志都不存在时抛出FileNotFoundError；
+        快照损坏时先将其改名为 *.corrupt 备份（日志原样移到 *.journal.corrupt），再抛出json.JSONDecodeError。
+        """
+        snapshot_found = True
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            snapshot_found = False
+            data = {}
+        except json.JSONDecodeError:
+            self._backup_corrupt()
+            raise
+
+        self.generation = data.get('generation', 0)
+        # 以大小写折叠后的英文为键，保持原有顺序
+        sections = {
+            'all_words': {word_key(w['english']): w for w in data.get('all_words', [])},
+            'mastered_words': {word_key(w['english']): w for w in data.get('mastered_words', [])},
+        }
+        journal_found = self._replay_journal(sections)
+        if not snapshot_found and not journal_found:
+            raise FileNotFoundError(self.path)
+
+        return {name: list(words.values()) for name, words in sections.items()}
+
+    def _backup_corrupt(self):
+        """快照损坏：快照和日志都改名备份，日志中可能有最近的复习记录，不能清空"""
+        self.close()
+        os.replace(self.path, self.path + '.corrupt')
+        try:
+            os.replace(self.journal_path, self.journal_path + '.corrupt')
+        except FileNotFoundError:
+            pass
+        self.journal_size = 0
+
+    def _replay_journal(self, sections):
+        """按顺序重放日志，丢弃末尾写了一半的记录"""
+        scan = read_journal(self.journal_path, self.generation, sections)
+        if scan is None:
+            return False
+        replay, good_offset, self.journal_size = scan
+        if not replay:
+            # 日志头缺失，或日志属于更早的快照（压缩过程中崩溃），直接丢弃
+            self._reset_journal()
+        elif os.path.getsize(self.journal_path) != good_offset:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good_offset)
+        return True
+
+    def record(self, word_data, mastered=False):
+        """向日志追加一个单词的最新状态"""
+        self.record_many([(word_data, mastered)])
+
+    def record_many(self, entries):
+        """向日志追加一批 (单词数据, 是否已掌握)，整批只同步一次磁盘"""
+        if self._journal is None:
+            if not os.path.exists(self.journal_path):
+                self._reset_journal()
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        count = 0
+        for word_data, mastered in entries:
+            entry = {'mastered': mastered, 'word': word_data}
+            self._journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            count += 1
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self.journal_size += count
+
+    def save_all(self, all_words, mastered_words):
+        """压缩：原子写入完整快照，然后清空日志"""
+        self.generation += 1
+        data = {
+            'generation': self.generation,
+            'all_words': all_words,
+            'mastered_words': mastered_words
+        }
+        atomic_write_json(self.path, data, ensure_ascii=False, indent=2)
+        self._reset_journal()
+
+    def _reset_journal(self):
+        """以当前代数重建空日志"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        header = json.dumps({'generation': self.generation}) + '\n'
+        with open(self.journal_path, 'w', encoding='utf-8') as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_size = 0
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+class SqliteStorage:
+    """SQLite存储：按 (next_review_date, review_round, review_count) 建立索引
+
+    今日复习队列是一次索引范围查询，只有到期的单词会被读出并构造成对象。
+    path 可以是数据库文件，也可以是 ':memory:'。
+    """
+
+    indexed = True  # 支持按到期日期等条件直接查询，无需加载全部单词
+    journal_size = 0  # 每次写入即提交，无需压缩
+
+    COLUMNS = ('english', 'chinese', 'success_count', 'next_review_date',
+               'example', 'review_round', 'review_count',
+               'ease', 'interval', 'stability', 'difficulty')
+    # 复习算法的记忆状态，为NULL时读出的单词数据中不包含这些键（与JSON格式一致）
+    MEMORY_COLUMNS = ('ease', 'interval', 'stability', 'difficulty')
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS words (
+                    key TEXT PRIMARY KEY,
+                    english TEXT NOT NULL,
+                    chinese TEXT,
+                    success_count INTEGER NOT NULL DEFAULT 0,
+                    next_review_date TEXT NOT NULL,
+                    example TEXT,
+                    review_round INTEGER NOT NULL DEFAULT 0,
+                    review_count INTEGER NOT NULL DEFAULT 0,
+                    ease REAL,
+                    interval INTEGER,
+                    stability REAL,
+                    difficulty REAL,
+                    mastered INTEGER NOT NULL DEFAULT 0,
+                    position INTEGER NOT NULL
+                )''')
+            # 旧版本数据库补充记忆状态列
+            existing = {row[1] for row in self.conn.execute('PRAGMA table_info(words)')}
+            for column in self.MEMORY_COLUMNS:
+                if column not in existing:
+                    column_type = 'INTEGER' if column == 'interval' else 'REAL'
+                    self.conn.execute(f'ALTER TABLE words ADD COLUMN {column} {column_type}')
+            # ISO日期字符串的字典序与日期顺序一致，可直接做范围查询
+            self.conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_words_due
+                ON words (mastered, next_review_date, review_round, review_count)''')
+            self.conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_words_round
+                ON words (mastered, review_round)''')
+
+    def _select(self, where='', params=(), columns=COLUMNS):
+        sql = f"SELECT {', '.join(columns)} FROM words {where}"
+        memory = [c for c in self.MEMORY_COLUMNS if c in columns]
+        rows = []
+        for row in self.conn.execute(sql, params):
+            data = dict(zip(columns, row))
+            if memory and all(data[c] is None for c in memory):
+                for column in memory:
+                    del data[column]
+            rows.append(data)
+        return rows
+
+    def load(self, with_examples=True):
+        """读取全部单词，返回 {'all_words': [...], 'mastered_words': [...]}
+
+        with_examples=False 时不读取例句列（返回的字典中没有'example'），
+        例句留在数据库中，需要时用 load_example 单独读取。
+        """
+        columns = self.COLUMNS if with_examples else tuple(c for c in self.COLUMNS if c != 'example')
+        return {
+            'all_words': self._select('WHERE mastered = 0 ORDER BY position', columns=columns),
+            'mastered_words': self._select('WHERE mastered = 1 ORDER BY position', columns=columns),
+        }
+
+    def load_example(self, english):
+        """按英文单词读取例句"""
+        row = self.conn.execute('SELECT example FROM words WHERE key = ?', (word_key(english),)).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, keys):
+        """按去重键批量查询已有单词，返回 {键: 单词数据}（含 'mastered'）"""
+        keys = list(keys)
+        columns = ('key',) + self.COLUMNS + ('mastered',)
+        found = {}
+        for start in range(0, len(keys), 500):  # 每次查询的参数个数有上限
+            chunk = keys[start:start + 500]
+            where = f"WHERE key IN ({', '.join('?' * len(chunk))})"
+            for row in self._select(where, chunk, columns):
+                row['mastered'] = bool(row['mastered'])
+                found[row.pop('key')] = row
+        return found
+
+    def load_due(self, today):
+        """索引查询到期单词，按 (复习轮次, 复习次数, 原有顺序) 排序"""
+        return self._select(
+            'WHERE mastered = 0 AND next_review_date <= ? '
+            'ORDER BY review_round, review_count, position',
+            (today.isoformat(),)
+        )
+
+    def min_round(self):
+        """待复习单词的最小复习轮次，没有单词时返回None"""
+        return self.conn.execute(
+            'SELECT MIN(review_round) FROM words WHERE mastered = 0').fetchone()[0]
+
+    def has_round(self, review_round):
+        """指定轮次是否还有待复习单词"""
+        return self.conn.execute(
+            'SELECT 1 FROM words WHERE mastered = 0 AND review_round = ? LIMIT 1',
+            (review_round,)).fetchone() is not None
+
+    def load_below_round(self, review_round):
+        """轮次低于review_round的待复习单词（推进轮次时使用，按轮次索引查询），保持原有顺序"""
+        return self._select('WHERE mastered = 0 AND review_round < ? ORDER BY position', (review_round,))
+
+    def counts(self):
+        """返回 (待复习单词数, 已掌握单词数)"""
+        rows = dict(self.conn.execute('SELECT mastered, COUNT(*) FROM words GROUP BY mastered'))
+        return rows.get(0, 0), rows.get(1, 0)
+
+    def pending_schedule(self, memory=False):
+        """待复习单词的 (下次复习日期, 成功次数)，用于复习量预测
+
+        memory=True 时每行再加上记忆状态 (ease, interval, stability, difficulty)，没有的为None。
+        """
+        columns = ('next_review_date', 'success_count') + (self.MEMORY_COLUMNS if memory else ())
+        return self.conn.execute(f"SELECT {', '.join(columns)} FROM words WHERE mastered = 0").fetchall()
+
+    def aggregate(self):
+        """单词数与复习次数之和（按是否已掌握分组）"""
+        rows = {mastered: (count, reviews) for mastered, count, reviews in self.conn.execute(
+            'SELECT mastered, COUNT(*), COALESCE(SUM(review_count), 0) FROM words GROUP BY mastered')}
+        pending, mastered = rows.get(0, (0, 0)), rows.get(1, (0, 0))
+        return {'pending': pending[0], 'mastered': mastered[0],
+                'pending_reviews': pending[1], 'mastered_reviews': mastered[1]}
+
+    def page(self, mastered, limit, offset, review_round=None, due_before=None, text=None):
+        """分页查询单词（不含例句），返回 (单词数据列表, 符合条件的总数)
+
+        待复习单词按 (复习轮次, 复习次数, 下次复习日期) 排序，已掌握单词保持原有顺序。
+        """
+        conditions, params = ['mastered = ?'], [int(mastered)]
+        if review_round is not None:
+            conditions.append('review_round = ?')
+            params.append(review_round)
+        if due_before is not None:
+            conditions.append('next_review_date <= ?')
+            params.append(due_before.isoformat())
+        if text:
+            conditions.append("(key LIKE ? ESCAPE '\\' OR chinese LIKE ? ESCAPE '\\')")
+            pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            params.extend([pattern, pattern])
+        where = 'WHERE ' + ' AND '.join(conditions)
+        total = self.conn.execute(f'SELECT COUNT(*) FROM words {where}', params).fetchone()[0]
+        order = 'position' if mastered else 'review_round, review_count, next_review_date, position'
+        columns = tuple(c for c in self.COLUMNS if c != 'example')
+        rows = self._select(f'{where} ORDER BY {order} LIMIT ? OFFSET ?', [*params, limit, offset], columns)
+        return rows, total
+
+    def _upsert_sql(self, columns):
+        """插入或更新单词；只更新给出的列（不含例句时保留库中原有例句）"""
+        return f'''
+            INSERT INTO words (key, {', '.join(columns)}, mastered, position)
+            VALUES ({', '.join('?' * (len(columns) + 3))})
+            ON CONFLICT(key) DO UPDATE SET
+                {', '.join(f'{c} = excluded.{c}' for c in columns)},
+                position = excluded.position,
+                mastered = excluded.mastered'''
+
+    def _columns_of(self, word_data):
+        return tuple(c for c in self.COLUMNS if c in word_data)
+
+    def record(self, word_data, mastered=False):
+        """写入单个单词的最新状态；单词转入另一列表时排到该列表末尾"""
+        self.record_many([(word_data, mastered)])
+
+    def record_many(self, entries):
+        """在一个事务中写入一批 (单词数据, 是否已掌握)"""
+        entries = list(entries)
+        keys = [word_key(word_data['english']) for word_data, _ in entries]
+        with self.conn:
+            # 批量查出已有单词的列表归属和位置
+            placed = {}
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placed.update((key, (mastered, position)) for key, mastered, position in self.conn.execute(
+                    f"SELECT key, mastered, position FROM words WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk))
+            next_position = None
+            groups = {}  # 列组合 -> 行
+            for key, (word_data, mastered) in zip(keys, entries):
+                row = placed.get(key)
+                if row is not None and row[0] == int(mastered):
+                    position = row[1]
+                else:
+                    if next_position is None:
+                        next_position = self.conn.execute(
+                            'SELECT COALESCE(MAX(position), -1) + 1 FROM words').fetchone()[0]
+                    position = next_position
+                    next_position += 1
+                    placed[key] = (int(mastered), position)
+                columns = self._columns_of(word_data)
+                groups.setdefault(columns, []).append(
+                    [key, *[word_data[c] for c in columns], int(mastered), position])
+            for columns, rows in groups.items():
+                self.conn.executemany(self._upsert_sql(columns), rows)
+
+    def save_all(self, all_words, mastered_words):
+        """在一个事务中整体替换全部单词"""
+        groups = {}  # 列组合 -> 行
+        keys = []
+        for mastered, words in ((0, all_words), (1, mastered_words)):
+            for word_data in words:
+                key = word_key(word_data['english'])
+                columns = self._columns_of(word_data)
+                groups.setdefault(columns, []).append(
+                    [key, *[word_data[c] for c in columns], mastered, len(keys)])
+                keys.append((key,))
+        with self.conn:
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS saved_keys (key TEXT PRIMARY KEY)')
+            self.conn.execute('DELETE FROM saved_keys')
+            self.conn.executemany('INSERT OR IGNORE INTO saved_keys VALUES (?)', keys)
+            self.conn.execute('DELETE FROM words WHERE key NOT IN (SELECT key FROM saved_keys)')
+            for columns, rows in groups.items():
+                self.conn.executemany(self._upsert_sql(columns), rows)
+
+    def close(self):
+        self.conn.close()
+
+
+def open_storage(backend, json_path, sqlite_path, binary_path=None):
+    """根据配置创建存储后端（'json'、'sqlite' 或 'binary'）"""
+    if backend == 'sqlite':
+        return SqliteStorage(sqlite_path)
+    if backend == 'binary':
+        from snapshot import BinaryStorage
+        return BinaryStorage(binary_path)
+    return JsonStorage(json_path)
+
+
+def migrate_json_to_sqlite(json_paths, sqlite_path):
+    """一次性迁移：将 learning_data.json / words.txt 格式的数据导入SQLite
+
+    多个文件中重复的单词以先出现的为准（应把带学习进度的文件放在前面）。
+    源文件只读，不会被修改；任一文件无法读取时不写入数据库，抛出ValueError列出全部有问题的文件。
+    返回 (待复习单词数, 已掌握单词数)。
+    """
+    seen = set()
+    merged = {'all_words': [], 'mastered_words': []}
+    errors = []
+    for json_path in json_paths:
+        try:
+            data = read_json_data(json_path)
+        except FileNotFoundError:
+            errors.append(f"{json_path}: 文件不存在")
+            continue
+        except (ValueError, KeyError, TypeError) as e:
+            errors.append(f"{json_path}: 格式错误 ({e})")
+            continue
+        for section in ('all_words', 'mastered_words'):
+            for word_data in data[section]:
+                key = word_key(word_data['english'])
+                if key not in seen:
+                    seen.add(key)
+                    merged[section].append(word_data)
+    if errors:
+        raise ValueError("以下文件无法读取，未进行迁移:\n" + "\n".join(errors))
+
+    storage = SqliteStorage(sqlite_path)
+    try:
+        storage.save_all(merged['all_words'], merged['mastered_words'])
+        return storage.counts()
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 4 or sys.argv[1] != 'migrate':
+        print("用法: python storage.py migrate <SQLite文件> <JSON文件>...")
+        sys.exit(1)
+    try:
+        pending, mastered = migrate_json_to_sqlite(sys.argv[3:], sys.argv[2])
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ 迁移完成: 待复习 {pending} 个 | 已掌握 {mastered} 个 -> {sys.argv[2]}")
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""多设备同步学习进度：只交换上次同步后改动过的单词
+
+每台设备在数据文件旁保存同步状态（learning_data.json.sync）：
+- 设备编号和逻辑时钟（Lamport时钟）：每次导出、导入时递增，导入时先与对方的时钟取最大值
+- 每个单词的内容哈希和最后改动的逻辑时间：导出前对比哈希找出本机改动过的单词，打上当前时间
+- 每个对端设备的水位：已合并到对方的时间（导出时只发送比它新的单词）和已收到的对方时间
+
+增量文件（gzip压缩的JSON）只包含改动过的单词，每个单词带内容哈希和逻辑时间，
+复习几十个单词后的增量只有几KB。导入时对本机数据做一次遍历完成合并，只写回有变化的单词。
+
+合并规则（与导入顺序无关，两台设备互相导入后结果相同）：
+- 成功次数、复习次数、复习轮次取较大值，下次复习日期取较晚的，任一设备已掌握即为已掌握
+- 释义、例句和记忆模型字段取逻辑时间较新的一方（相同时按内容哈希决定）；较新一方没有例句时保留另一方的
+单词删除不会同步。
+
+用法（在各设备的数据目录中运行，或用 --dir 指定）：
+    python sync.py export laptop.delta [--peer 设备编号 | --since 时间]
+    python sync.py import laptop.delta
+    python sync.py merge a.json b.json merged.json       # 直接合并两个学习数据文件
+    python sync.py status
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import uuid
+
+from storage import atomic_write_json, read_json_data, word_key
+
+DELTA_FORMAT = 'reciter-delta'
+DELTA_VERSION = 1
+MAX_FIELDS = ('success_count', 'review_count', 'review_round')  # 合并时取较大值的进度字段
+
+
+def word_hash(word_data, mastered):
+    """单词内容哈希（与字段顺序无关）"""
+    text = json.dumps([word_data, bool(mastered)], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def iter_words(data):
+    """按 待复习、已掌握 的顺序产生 (单词数据, 是否已掌握)"""
+    for word_data in data['all_words']:
+        yield word_data, False
+    for word_data in data['mastered_words']:
+        yield word_data, True
+
+
+def load_words(storage):
+    """读取本机全部单词；还没有数据文件时返回空数据"""
+    try:
+        return storage.load()
+    except FileNotFoundError:
+        return {'all_words': [], 'mastered_words': []}
+
+
+def merge_word(local, incoming):
+    """合并同一单词的两个版本：(单词数据, 是否已掌握, 逻辑时间, 哈希)，返回 (单词数据, 是否已掌握)"""
+    newer, older = (incoming, local) if (incoming[2], incoming[3]) > (local[2], local[3]) else (local, incoming)
+    merged = dict(newer[0])
+    for field in MAX_FIELDS:
+        if field in newer[0] or field in older[0]:
+            merged[field] = max(newer[0].get(field, 0), older[0].get(field, 0))
+    merged['next_review_date'] = max(newer[0]['next_review_date'], older[0]['next_review_date'])
+    if not merged.get('example') and older[0].get('example'):
+        merged['example'] = older[0]['example']
+    return merged, newer[1] or older[1]
+
+
+class SyncState:
+    """本机的同步状态：设备编号、逻辑时钟、单词哈希与改动时间、对端水位"""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        self.device = data.get('device') or uuid.uuid4().hex[:12]
+        self.clock = data.get('clock', 0)
+        self.words = data.get('words', {})  # 键 -> [哈希, 逻辑时间, 来源设备（从该设备原样收到时）]
+        self.peers = data.get('peers', {})  # 设备编号 -> {'acked': 对方已合并的本机时间, 'received': 已收到的对方时间}
+
+    def save(self):
+        atomic_write_json(self.path, {'device': self.device, 'clock': self.clock,
+                                      'words': self.words, 'peers': self.peers})
+
+    def tick(self, remote_clock=0):
+        """开始一次同步：时钟推进到 max(本机, 对方) + 1，本次改动都使用这个时间"""
+        self.clock = max(self.clock, remote_clock) + 1
+        return self.clock
+
+    def observe(self, key, word_data, mastered):
+        """对比哈希：单词在本机改动过（或是新单词）时打上当前时间，返回 (逻辑时间, 哈希)"""
+        digest = word_hash(word_data, mastered)
+        entry = self.words.get(key)
+        if entry is None or entry[0] != digest:
+            entry = self.words[key] = [digest, self.clock, None]
+        return entry[1], digest
+
+    def peer(self, device):
+        return self.peers.setdefault(device, {'acked': 0, 'received': 0})
+
+
+def export_delta(storage, state, path, peer=None, since=None):
+    """导出逻辑时间晚于水位的单词，返回导出的单词数
+
+    水位：明确给出的since；否则为对端已合并的本机时间（未指定对端时取所有已知对端的最小值，没有对端时导出全部）。
+    """
+    if since is None:
+        if peer is not None:
+            since = state.peers.get(peer, {}).get('acked', 0)
+        else:
+            since = min((info['acked'] for info in state.peers.values()), default=0)
+    clock = state.tick()
+    words = []
+    for word_data, mastered in iter_words(load_words(storage)):
+        key = word_key(word_data['english'])
+        ts, digest = state.observe(key, word_data, mastered)
+        origin = state.words[key][2]
+        if ts > since and (peer is None or origin != peer):
+            words.append({'word': word_data, 'mastered': mastered, 'ts': ts, 'hash': digest})
+    delta = {'format': DELTA_FORMAT, 'version': DELTA_VERSION, 'device': state.device, 'clock': clock,
+             'since': since, 'acks': {device: info['received'] for device, info in state.peers.items()},
+             'words': words}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(delta, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    state.save()
+    return len(words)
+
+
+def read_delta(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        delta = json.load(f)
+    if delta.get('format') != DELTA_FORMAT or delta.get('version') != DELTA_VERSION:
+        raise ValueError(f"不是支持的同步增量文件: {path}")
+    return delta
+
+
+def import_delta(storage, state, path):
+    """合并增量文件：遍历一次本机数据，只写回有变化的单词，返回 (收到的单词数, 更新数, 新增数)"""
+    delta = read_delta(path)
+    if delta['device'] == state.device:
+        raise ValueError("不能导入本机导出的增量文件")
+    source = delta['device']
+    clock = state.tick(delta['clock'])
+    incoming = {word_key(entry['word']['english']): entry for entry in delta['words']}
+    entries, updated = [], 0
+
+    def apply(key, word_data, mastered, entry):
+        # 合并结果与对方的版本相同时记下来源，之后不再发回给对方
+        same = word_hash(word_data, mastered) == entry['hash']
+        state.words[key] = [word_hash(word_data, mastered), clock, source if same else None]
+        entries.append((word_data, mastered))
+
+    for word_data, mastered in iter_words(load_words(storage)):
+        key = word_key(word_data['english'])
+        entry = incoming.pop(key, None)
+        ts, digest = state.observe(key, word_data, mastered)
+        if entry is None:
+            continue
+        merged, merged_mastered = merge_word((word_data, mastered, ts, digest),
+                                             (entry['word'], entry['mastered'], entry['ts'], entry['hash']))
+        if merged_mastered == mastered and merged == word_data:
+            if digest == entry['hash']:
+                state.words[key][2] = source
+            continue
+        apply(key, merged, merged_mastered, entry)
+        updated += 1
+    for key, entry in incoming.items():
+        apply(key, entry['word'], entry['mastered'], entry)
+    if entries:
+        storage.record_many(entries)
+
+    info = state.peer(source)
+    info['received'] = max(info['received'], delta['clock'])
+    info['acked'] = max(info['acked'], delta['acks'].get(state.device, 0))
+    state.save()
+    return len(delta['words']), updated, len(incoming)
+
+
+def merge_files(base_path, other_path, target_path):
+    """合并两个学习数据文件（含复习日志）写入新文件：遍历一次base，按键查找other中的同一单词
+
+    两个源文件只读取，不会被修改。
+    """
+    from importer import DeckWriter
+    other = {word_key(word_data['english']): (word_data, mastered)
+             for word_data, mastered in iter_words(read_json_data(other_path))}
+    counts = {'merged': 0, 'base_only': 0, 'other_only': 0}
+    with DeckWriter(target_path) as writer:
+        for word_data, mastered in iter_words(read_json_data(base_path)):
+            match = other.pop(word_key(word_data['english']), None)
+            if match is None:
+                counts['base_only'] += 1
+            else:
+                # 没有逻辑时间：两边都按0处理，由内容哈希决定释义、例句
+                word_data, mastered = merge_word(
+                    (word_data, mastered, 0, word_hash(word_data, mastered)),
+                    (match[0], match[1], 0, word_hash(*match)))
+                counts['merged'] += 1
+            writer.write(word_data, mastered)
+        for word_data, mastered in other.values():
+            writer.write(word_data, mastered)
+            counts['other_only'] += 1
+    try:
+        os.remove(target_path + '.journal')  # 目标位置遗留的旧日志不属于新文件
+    except FileNotFoundError:
+        pass
+    return counts
+
+
+def open_local(directory='.', backend=None):
+    """打开数据目录中的存储和同步状态"""
+    from reciter import Config
+    from storage import open_storage
+    storage = open_storage(backend or Config.STORAGE_BACKEND,
+                           os.path.join(directory, Config.DATA_FILE),
+                           os.path.join(directory, Config.SQLITE_FILE),
+                           os.path.join(directory, Config.BINARY_FILE))
+    return storage, SyncState(storage.path + '.sync')
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="多设备同步学习进度")
+    parser.add_argument('--dir', default='.', help="数据目录（默认当前目录）")
+    parser.add_argument('--backend', choices=('json', 'sqlite', 'binary'), help="存储后端（默认与Config相同）")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help="导出上次同步后改动的单词")
+    export_parser.add_argument('delta_file')
+    export_parser.add_argument('--peer', help="对端设备编号（只导出对方尚未合并的改动）")
+    export_parser.add_argument('--since', type=int, help="只导出逻辑时间晚于该值的单词（0为全部）")
+    import_parser = commands.add_parser('import', help="合并其他设备导出的增量")
+    import_parser.add_argument('delta_file')
+    merge_parser = commands.add_parser('merge', help="合并两个学习数据文件")
+    merge_parser.add_argument('base_file')
+    merge_parser.add_argument('other_file')
+    merge_parser.add_argument('target_file')
+    commands.add_parser('status', help="显示本机设备编号和同步水位")
+    args = parser.parse_args(argv)
+
+    if args.command == 'merge':
+        counts = merge_files(args.base_file, args.other_file, args.target_file)
+        print(f"✅ 合并完成: 两边都有 {counts['merged']} 个 | 仅第一个文件 {counts['base_only']} 个 | "
+              f"仅第二个文件 {counts['other_only']} 个 -> {args.target_file}")
+        return
+
+    storage, state = open_local(args.dir, args.backend)
+    try:
+        if args.command == 'export':
+            count = export_delta(storage, state, args.delta_file, args.peer, args.since)
+            size = os.path.getsize(args.delta_file)
+            print(f"✅ 已导出 {count} 个单词（{size / 1024:.1f}KB） -> {args.delta_file}")
+        elif args.command == 'import':
+            received, updated, added = import_delta(storage, state, args.delta_file)
+            print(f"✅ 已合并 {received} 个单词: 更新 {updated} 个 | 新增 {added} 个")
+        else:
+            state.save()  # 首次运行时保存新生成的设备编号
+            print(f"📱 设备编号: {state.device} | 逻辑时钟: {state.clock} | 已跟踪单词: {len(state.words)}")
+            for device, info in state.peers.items():
+                print(f"  ↔ {device}: 对方已合并到 {info['acked']} | 已收到对方到 {info['received']}")
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
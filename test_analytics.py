@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""测试复习事件分析的脚本"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from events import CORRECT, HINT, NO_ANSWER, NUMPY_FIELDS, REPLAY, WRONG, EventLog
+from analytics import hardest_words, load_events, retention_curve, time_per_word
+
+
+def _write_sample(path):
+    log = EventLog(path)
+    # apple：4次复习，1次答错后答对，1次查看答案
+    log.log('apple', CORRECT, 0, 0, 100, 1000, 0)
+    log.log('apple', WRONG, 0, 1, 100, 2000, 1, answer='aple')
+    log.log('apple', CORRECT, 1, 1, 100, 1000, 1)
+    log.log('apple', REPLAY, 0, 1, 50, 500, 2)
+    log.log('apple', HINT, 0, 1, 100, 3000, 2)
+    log.log('apple', CORRECT, 0, 1, 100, 1000, 7)
+    # pear：3次复习全部答对
+    for interval in (0, 1, 2):
+        log.log('pear', CORRECT, 0, interval, 100, 500, interval)
+    log.close()
+
+
+def test_queries():
+    """测试保持率曲线、最难单词、作答耗时"""
+    print("🧪 测试复习事件分析...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        _write_sample(path)
+        for use_numpy in (False, True):
+            columns, vocab = load_events(path, use_numpy)
+            curve = retention_curve(columns, bins=(0, 1, 2, 7))
+            assert curve == [(0, 1, 2, 2), (1, 2, 2, 1), (2, 7, 2, 1), (7, None, 1, 1)]
+
+            hardest = hardest_words(columns, vocab, min_reviews=3)
+            assert [row['word'] for row in hardest] == ['apple', 'pear']
+            assert hardest[0]['lapses'] == 2 and hardest[0]['reviews'] == 4
+            assert hardest[0]['wrong'] == 1 and hardest[0]['hints'] == 1
+            assert hardest[0]['mistake'] == 'aple' and hardest[1]['mistake'] is None
+
+            timing = time_per_word(columns, vocab)
+            assert timing['median_ms'] == 1000 and timing['first_key_median_ms'] == 100
+            assert [row['word'] for row in timing['words']] == ['apple', 'pear']
+            assert timing['words'][0]['avg_ms'] == 8000 / 4
+    print("✅ 复习事件分析测试完成！")
+
+
+def test_empty_log():
+    """测试没有日志文件时返回空结果"""
+    print("🧪 测试空日志...")
+    with tempfile.TemporaryDirectory() as tmp:
+        for use_numpy in (False, True):
+            columns, vocab = load_events(os.path.join(tmp, 'missing.bin'), use_numpy)
+            assert all(reviews == 0 for _, _, reviews, _ in retention_curve(columns))
+            assert hardest_words(columns, vocab) == []
+            assert time_per_word(columns, vocab)['words'] == []
+    print("✅ 空日志测试完成！")
+
+
+def test_million_events():
+    """测试百万条事件的向量化统计耗时"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("⚠️ 未安装NumPy，跳过")
+        return
+    print("🧪 测试百万条事件分析耗时...")
+    import numpy as np
+    rng = np.random.default_rng(3)
+    count, words = 1000000, 5000
+    data = np.zeros(count, dtype=np.dtype(NUMPY_FIELDS))
+    data['word'] = rng.integers(0, words, count)
+    data['kind'] = np.where(rng.random(count) < 0.8, CORRECT, WRONG)
+    data['answer'] = np.where(data['kind'] == WRONG, words, NO_ANSWER)
+    data['latency_ms'] = rng.integers(500, 5000, count)
+    data['interval'] = rng.choice([1, 2, 4, 7], count)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        data.tofile(path)
+        with open(path + '.vocab', 'w', encoding='utf-8') as f:
+            f.writelines(f"word{i}\n" for i in range(words))
+            f.write("typo\n")
+
+        start = time.perf_counter()
+        columns, vocab = load_events(path)
+        retention_curve(columns)
+        hardest_words(columns, vocab)
+        time_per_word(columns, vocab)
+        elapsed = time.perf_counter() - start
+    assert len(columns['kind']) == 1000000
+    assert elapsed < 3, elapsed
+    print(f"✅ 百万条事件分析耗时测试完成！{elapsed * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    test_queries()
+    test_empty_log()
+    test_million_events()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""测试离线性能基准的脚本"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date
+from bench_suite import DUE_TODAY, compare, make_deck, run_suite, synthetic_word
+from reciter import Config
+
+TODAY = date(2025, 1, 10)
+
+
+def test_make_deck():
+    """测试合成词库：单词唯一，今天到期的数量固定"""
+    print("🧪 测试合成词库...")
+    assert len({synthetic_word(i) for i in range(100000)}) == 100000
+    all_words, mastered_words = make_deck(1000, TODAY)
+    assert len(all_words) + len(mastered_words) == 1000
+    due = [w for w in all_words if w['next_review_date'] <= TODAY.isoformat()]
+    assert len(due) == DUE_TODAY
+    assert make_deck(1000, TODAY) == (all_words, mastered_words)
+    print("✅ 合成词库测试完成！")
+
+
+def test_run_suite_offline():
+    """测试小规模基准：三种后端都能跑完，不改动用户数据和全局配置"""
+    print("🧪 测试离线基准...")
+    config = dict(vars(Config))
+    data_mtime = os.path.getmtime(Config.DATA_FILE) if os.path.exists(Config.DATA_FILE) else None
+
+    report = run_suite([300], ['json', 'sqlite', 'binary'], TODAY, progress=None)
+    assert [(r['backend'], r['size']) for r in report['results']] == [('json', 300), ('sqlite', 300), ('binary', 300)]
+    for result in report['results']:
+        metrics = result['metrics']
+        assert metrics['due_today'] == DUE_TODAY
+        assert all(value >= 0 for value in metrics.values())
+        assert metrics['import_words_per_s'] > 0
+
+    assert dict(vars(Config)) == config
+    if data_mtime is not None:
+        assert os.path.getmtime(Config.DATA_FILE) == data_mtime
+    print("✅ 离线基准测试完成！")
+
+
+def test_compare():
+    """测试与基准结果对比：耗时变长或吞吐量下降超过20%时标记"""
+    print("🧪 测试基准对比...")
+    baseline = {'results': [{'backend': 'json', 'size': 1000,
+                             'metrics': {'load_ms': 10.0, 'save_ms': 10.0, 'import_words_per_s': 1000.0}}]}
+    report = {'results': [{'backend': 'json', 'size': 1000,
+                           'metrics': {'load_ms': 11.0, 'save_ms': 13.0, 'import_words_per_s': 700.0}},
+                          {'backend': 'sqlite', 'size': 1000, 'metrics': {'load_ms': 1.0}}]}
+    rows = compare(report, baseline)
+    assert [(name, regressed) for _, _, name, _, _, regressed in rows] == \
+        [('load_ms', False), ('save_ms', True), ('import_words_per_s', True)]
+    print("✅ 基准对比测试完成！")
+
+
+if __name__ == "__main__":
+    test_make_deck()
+    test_run_suite_offline()
+    test_compare()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""测试例句挖空模板的脚本"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cloze import ClozeTemplate, build_template, build_templates, cached_template, inflections
+from reciter import HunyuanGenerator
+
+
+def blank(example, english):
+    return build_template(example, english).render()
+
+
+def test_word_boundary():
+    """测试只挖空整词，不挖空其他单词中间的部分"""
+    print("🧪 测试整词匹配...")
+    assert blank("We camped near the camp._我们在营地附近露营。", "camp") == "We camped near the ____(4)."
+    assert blank("Apple pie is sweet._苹果派很甜。", "apple") == "_____(5) pie is sweet."
+    assert blank("She ate an ice  cream._她吃了冰淇淋。", "ice cream") == "She ate an _________(9)."
+    template = build_template("An apple a day._一天一个苹果。", "apple")
+    assert template == ClozeTemplate("An ", " a day.", 5, "一天一个苹果。")
+    print("✅ 整词匹配测试完成！")
+
+
+def test_inflections():
+    """测试常见屈折变化：挖空整个变化形式，提示原形的字母数"""
+    print("🧪 测试屈折变化...")
+    assert blank("They camped by the lake._他们在湖边露营。", "camp") == "They ____(4) by the lake."
+    assert blank("She studies hard._她学习很努力。", "study") == "She _____(5) hard."
+    assert blank("He is stopping the car._他正在停车。", "stop") == "He is ____(4) the car."
+    assert blank("We are making tea._我们在泡茶。", "make") == "We are ____(4) tea."
+    assert blank("Two boxes._两个盒子。", "box") == "Two ___(3)."
+    assert blank("I am happier now._我现在更开心。", "happy") == "I am _____(5) now."
+    assert {'studies', 'studied', 'stopping'} <= inflections('study') | inflections('stop')
+    print("✅ 屈折变化测试完成！")
+
+
+def test_fallbacks():
+    """测试没有整词时挖空包含该单词的词，完全没有时不挖空；例句格式的兼容"""
+    print("🧪 测试兜底规则...")
+    assert blank("She was unhappy._她不开心。", "happy") == "She was _____(5)."
+    template = build_template("This sentence has no answer.", "apple")
+    assert template.render() == "This sentence has no answer." and template.translation == ""
+    template = build_template("Use it here._这里_使用_它。", "use")
+    assert template.translation == "这里使用它。"
+    assert ClozeTemplate.loads(template.dumps()) == template
+    print("✅ 兜底规则测试完成！")
+
+
+def test_split_ch_en():
+    """测试混元结果的中英文拆分"""
+    print("🧪 测试中英文拆分...")
+    assert HunyuanGenerator.split_ch_en("I like apples. 我喜欢苹果。") == ("I like apples.", "我喜欢苹果。")
+    assert HunyuanGenerator("", "").split_ch_en("no chinese ") == ("no chinese", "")
+    print("✅ 中英文拆分测试完成！")
+
+
+def test_render_speed():
+    """测试批量生成模板和缓存后出题的速度"""
+    print("🧪 测试模板速度...")
+    pairs = [(f"We practised the word word{i}s today._我们今天练习了单词{i}", f"word{i}") for i in range(20000)]
+    start = time.perf_counter()
+    templates = build_templates(pairs)
+    build_seconds = time.perf_counter() - start
+    assert all(t.length for t in templates)
+
+    example, english = pairs[0]
+    cached_template(example, english)
+    start = time.perf_counter()
+    for _ in range(100000):
+        cached_template(example, english).render()
+    per_render = (time.perf_counter() - start) / 100000
+    assert per_render < 5e-6, per_render
+    print(f"✅ 模板速度测试完成！批量 {len(pairs) / build_seconds:.0f} 个/秒，出题 {per_render * 1e6:.2f}µs")
+
+
+if __name__ == "__main__":
+    test_word_boundary()
+    test_inflections()
+    test_fallbacks()
+    test_split_ch_en()
+    test_render_speed()
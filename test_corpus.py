@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""测试本地例句索引的脚本"""
+
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import WordNetExampleIndex, build_index
+
+
+def test_build_and_lookup():
+    """测试生成索引与查询"""
+    print("🧪 测试例句索引...")
+    assert 'nltk' not in sys.modules
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wordnet.db')
+        count = build_index(path, [
+            ('camp', ['they camped for the night', 'the camp was quiet']),
+            ('study', ['she studies hard']),
+            ('look up', ['look up the word in a dictionary']),
+            ('empty', []),
+        ])
+        assert count == 3
+
+        index = WordNetExampleIndex(path)
+        assert index.lookup('Camp') == 'they camped for the night'
+        assert index.lookup('look up') == 'look up the word in a dictionary'
+        # 常见词形变化回退到原形
+        assert index.lookup('camps') == 'they camped for the night'
+        assert index.lookup('studies') == 'she studies hard'
+        assert index.lookup('empty') == ''
+        assert index.lookup('unknown') == ''
+
+        # 多线程查询
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(index.lookup('camp'))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == ['they camped for the night'] * 4
+        index.close()
+    # 复习时不会导入NLTK
+    assert 'nltk' not in sys.modules
+    print("✅ 例句索引测试完成！")
+
+
+def test_missing_index():
+    """测试索引文件不存在时只检查一次"""
+    print("🧪 测试缺失索引...")
+    index = WordNetExampleIndex(os.path.join(tempfile.gettempdir(), 'no-such-index.db'))
+    assert index.lookup('camp') is None
+    assert index.lookup('camp') is None
+    assert not index.available
+    print("✅ 缺失索引测试完成！")
+
+
+if __name__ == "__main__":
+    test_build_and_lookup()
+    test_missing_index()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""测试学习进度看板的脚本"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date, timedelta
+from dashboard import DeckStats, StatusFilter, paginate
+from reciter import WordReciter, Word
+from storage import SqliteStorage
+
+TODAY = date(2025, 1, 10)
+
+
+def _words():
+    words = []
+    for i in range(30):
+        word = Word(f"word{i:02d}", f"释义{i}", next_review_date=TODAY + timedelta(days=i % 10))
+        word.review_round = i % 3
+        word.review_count = i % 5
+        words.append(word)
+    words.append(Word("apple", "苹果", next_review_date=TODAY))
+    return words
+
+
+def _status_key(w):
+    return (w.review_round, w.review_count, w.review_day)
+
+
+def test_paginate_matches_full_sort():
+    """测试分页结果与完整排序后切片一致"""
+    print("🧪 测试分页...")
+    words = _words()
+    expected = sorted(words, key=_status_key)
+    for page in range(4):
+        visible, total = paginate(words, _status_key, page, 8)
+        assert visible == expected[page * 8:(page + 1) * 8]
+        assert total == len(words)
+
+    visible, total = paginate(words, None, 1, 10)
+    assert visible == words[10:20] and total == len(words)
+    print("✅ 分页测试完成！")
+
+
+def test_filters():
+    """测试按轮次、到期时间、关键字筛选"""
+    print("🧪 测试筛选...")
+    words = _words()
+    status_filter = StatusFilter.parse("r2 d3")
+    assert status_filter.review_round == 1 and status_filter.due_days == 3
+    match = status_filter.matcher(TODAY)
+    expected = [w for w in words if w.review_round == 1 and (w.next_review_date - TODAY).days <= 3]
+    visible, total = paginate(words, _status_key, 0, 100, match)
+    assert sorted(visible, key=_status_key) == sorted(expected, key=_status_key)
+    assert total == len(expected)
+
+    visible, total = paginate(words, None, 0, 10, StatusFilter.parse("苹").matcher(TODAY))
+    assert [w.english for w in visible] == ["apple"] and total == 1
+    assert not StatusFilter.parse("")
+    print("✅ 筛选测试完成！")
+
+
+def test_sqlite_page_matches_memory():
+    """测试SQLite分页查询与内存分页结果一致"""
+    print("🧪 测试SQLite分页...")
+    words = _words()
+    storage = SqliteStorage(':memory:')
+    storage.save_all([w.to_dict() for w in words], [])
+    for spec in ("", "r1", "d0", "word1", "r3 d5"):
+        status_filter = StatusFilter.parse(spec)
+        predicate = status_filter.matcher(TODAY) if status_filter else None
+        expected, expected_total = paginate(words, _status_key, 1, 4, predicate)
+        rows, total = storage.page(False, 4, 4, status_filter.review_round,
+                                   status_filter.due_before(TODAY), status_filter.text)
+        assert [r['english'] for r in rows] == [w.english for w in expected], spec
+        assert total == expected_total
+    storage.close()
+    print("✅ SQLite分页测试完成！")
+
+
+def test_incremental_stats():
+    """测试统计计数随复习结果增量更新，与全量统计一致"""
+    print("🧪 测试统计计数...")
+    reciter = WordReciter()
+    reciter.storage = SqliteStorage(':memory:')
+    reciter.all_words = _words()
+    reciter.mastered_words = []
+    stats = reciter._get_deck_stats()
+
+    for word in reciter.all_words[:5]:
+        reciter._count_review(word)
+    graduated = reciter.all_words[0]
+    reciter._graduate(graduated)
+    reciter._count_review(graduated, mastered=True)
+
+    reciter._flush_graduated()
+    expected = DeckStats.from_words(reciter.all_words, reciter.mastered_words)
+    assert vars(stats) == vars(expected)
+    assert reciter._word_counts() == (30, 1)
+    reciter.storage.close()
+    print("✅ 统计计数测试完成！")
+
+
+if __name__ == "__main__":
+    test_paginate_matches_full_sort()
+    test_filters()
+    test_sqlite_page_matches_memory()
+    test_incremental_stats()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""测试复习事件日志的脚本"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import readchar
+import events
+from events import CORRECT, HINT, NO_ANSWER, REPLAY, WRONG, EventLog, iter_events, read_vocab
+from reciter import Config, Word, WordReciter
+
+
+def test_log_roundtrip():
+    """测试事件写入与读取，单词编号跨会话保持不变"""
+    print("🧪 测试事件日志读写...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        log = EventLog(path)
+        log.log('apple', WRONG, 0, 2, 350, 1200, 4, answer='aple')
+        log.log('apple', CORRECT, 1, 2, 200, 900, 4)
+        log.close()
+
+        log = EventLog(path)
+        log.log('pear', HINT, 0, 0, 5000, 6000, 0)
+        log.log('apple', REPLAY, 0, 3, 100, 300, 7)
+        log.close()
+
+        assert read_vocab(path + '.vocab') == ['apple', 'aple', 'pear']
+        rows = list(iter_events(path))
+        assert [row[1:] for row in rows] == [
+            (0, 1, WRONG, 0, 2, 350, 1200, 4),
+            (0, NO_ANSWER, CORRECT, 1, 2, 200, 900, 4),
+            (2, NO_ANSWER, HINT, 0, 0, 5000, 6000, 0),
+            (0, NO_ANSWER, REPLAY, 0, 3, 100, 300, 7),
+        ]
+        assert rows[0][0] <= rows[-1][0] <= time.time() * 1000
+    print("✅ 事件日志读写测试完成！")
+
+
+def test_truncated_tail():
+    """测试中途崩溃留下的不完整记录：读取时忽略，继续写入前截掉"""
+    print("🧪 测试不完整记录...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.bin')
+        log = EventLog(path)
+        log.log('apple', CORRECT)
+        log.close()
+        with open(path, 'ab') as f:
+            f.write(b'\x01\x02\x03')
+        assert len(list(iter_events(path))) == 1
+
+        log = EventLog(path)
+        log.log('pear', WRONG, answer='peer')
+        log.close()
+        assert [row[1] for row in iter_events(path)] == [0, 1]
+        assert os.path.getsize(path) == 2 * events.RECORD.size
+    print("✅ 不完整记录测试完成！")
+
+
+def test_log_latency():
+    """测试记录一条事件的耗时（只写缓冲区，不应拖慢输入）"""
+    print("🧪 测试事件记录耗时...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = EventLog(os.path.join(tmp, 'events.bin'))
+        keys = [f"word{i}" for i in range(1000)]
+        for key in keys:
+            log.log(key, CORRECT)  # 先写入词表
+        start = time.perf_counter()
+        for i in range(20000):
+            log.log(keys[i % 1000], WRONG, 1, 3, 120, 800, 7, answer=keys[(i + 1) % 1000])
+        per_event = (time.perf_counter() - start) / 20000
+        log.close()
+    assert per_event < 50e-6, per_event
+    print(f"✅ 事件记录耗时测试完成！每条 {per_event * 1e6:.1f}µs")
+
+
+def test_practice_word_logs_attempts():
+    """测试单词练习时记录播放语音、答错和答对"""
+    print("🧪 测试练习记录...")
+    keys = iter("s\nappel\napple\n")
+    original, tts_enabled, log_path, cache_path = (readchar.readkey, Config.TTS_ENABLED, Config.EVENT_LOG,
+                                                   Config.EXAMPLE_CACHE)
+    with tempfile.TemporaryDirectory() as tmp:
+        readchar.readkey = lambda: next(keys)
+        Config.TTS_ENABLED = False
+        Config.EVENT_LOG = os.path.join(tmp, 'events.bin')
+        Config.EXAMPLE_CACHE = os.path.join(tmp, 'example_cache.json')
+        try:
+            reciter = WordReciter()
+            word = Word("Apple", "苹果", success_count=3)
+            assert reciter._practice_word(word, "An apple a day._一天一个苹果。")
+            reciter.close()
+        finally:
+            readchar.readkey, Config.TTS_ENABLED, Config.EVENT_LOG, Config.EXAMPLE_CACHE = \
+                original, tts_enabled, log_path, cache_path
+
+        rows = list(iter_events(os.path.join(tmp, 'events.bin')))
+        vocab = read_vocab(os.path.join(tmp, 'events.bin.vocab'))
+    assert [row[3] for row in rows] == [REPLAY, WRONG, CORRECT]
+    assert [row[4] for row in rows] == [0, 0, 1]
+    assert all(row[5] == 3 and row[8] == 4 for row in rows)  # 第3次成功后的间隔为4天
+    assert vocab[rows[1][2]] == 'appel' and vocab[rows[0][1]] == 'apple'
+    assert all(row[6] <= row[7] for row in rows)
+    print("✅ 练习记录测试完成！")
+
+
+if __name__ == "__main__":
+    test_log_roundtrip()
+    test_truncated_tail()
+    test_log_latency()
+    test_practice_word_logs_attempts()
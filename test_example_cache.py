@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""测试例句缓存的脚本"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import example_cache
+from example_cache import ExampleCache
+
+
+def test_hit_miss_and_persistence():
+    """测试命中统计与持久化"""
+    print("🧪 测试例句缓存命中...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.json')
+        cache = ExampleCache(path)
+        assert cache.get('Apple', 'nltk') is None
+        cache.put('Apple', 'nltk', 'an apple a day')
+        cache.put('fox', 'nltk', '')  # 该来源没有例句
+        assert cache.get('apple', 'nltk') == 'an apple a day'
+        assert cache.get('apple', 'hunyuan') is None
+        assert cache.get('fox', 'nltk') == ''
+        assert (cache.hits, cache.misses) == (2, 2)
+        cache.save()
+
+        # 重新打开后仍然命中
+        cache = ExampleCache(path)
+        assert cache.get('APPLE', 'nltk') == 'an apple a day'
+        assert cache.stats()['hit_rate'] == 1.0
+    print("✅ 例句缓存命中测试完成！")
+
+
+def test_lru_eviction_and_ttl():
+    """测试LRU淘汰与过期刷新"""
+    print("🧪 测试例句缓存淘汰...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.json')
+        cache = ExampleCache(path, max_entries=2)
+        cache.put('a', 'nltk', 'A')
+        cache.put('b', 'nltk', 'B')
+        cache.get('a', 'nltk')  # a 变为最近使用
+        cache.put('c', 'nltk', 'C')
+        assert cache.get('b', 'nltk') is None
+        assert cache.get('a', 'nltk') == 'A' and cache.get('c', 'nltk') == 'C'
+        assert cache.evictions == 1
+
+        # 过期条目视为未命中
+        cache.entries['nltk:a'][1] = time.time() - cache.ttl - 1
+        assert cache.get('a', 'nltk') is None
+        assert 'nltk:a' not in cache.entries
+    print("✅ 例句缓存淘汰测试完成！")
+
+
+def test_stored_templates():
+    """测试挖空模板：写入例句时生成、随缓存保存，重新打开后直接读取，例句变化后重新生成"""
+    print("🧪 测试保存的挖空模板...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.json')
+        cache = ExampleCache(path)
+        cache.put('camp', 'hunyuan', 'We camped there._我们在那里露营。')
+        assert 'camp' in cache.templates
+        cache.template('Street', 'The street is busy._街道很繁忙。')
+        cache.save()
+
+        cache = ExampleCache(path)
+        cache._load()
+        build_template = example_cache.build_template
+        example_cache.build_template = None  # 读取保存的模板，不再解析例句
+        try:
+            assert cache.template('camp', 'We camped there._我们在那里露营。').render() == 'We ____(4) there.'
+            template = cache.template('street', 'The street is busy._街道很繁忙。')
+            assert template.render() == 'The ______(6) is busy.' and template.translation == '街道很繁忙。'
+        finally:
+            example_cache.build_template = build_template
+        assert cache.template('camp', 'Camp here._在这露营。').render() == '____(4) here.'
+
+        cache.templates['camp'][1] = 'stale\x1f\x1f1\x1f'
+        assert cache.retemplate() == 2
+        assert cache.template('camp', 'Camp here._在这露营。').render() == '____(4) here.'
+    print("✅ 保存的挖空模板测试完成！")
+
+
+if __name__ == "__main__":
+    test_hit_miss_and_persistence()
+    test_lru_eviction_and_ttl()
+    test_stored_templates()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""测试复习量预测的脚本"""
+
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import tempfile
+from datetime import date, timedelta
+import forecast
+from bench_suite import isolated_config, new_reciter, quiet
+from forecast import forecast_algorithm, forecast_due, render_histogram
+from reciter import Config, Word
+from srs import EbbinghausAlgorithm, SM2Algorithm
+
+INTERVALS = [1, 2, 4, 7, 15, 30, 60, 90]
+
+
+def test_forecast_small_deck():
+    """测试按间隔表推演的到期数"""
+    print("🧪 测试复习量预测...")
+    # 今天到期的新单词在第0、1、3、7天复习；已过期单词视为今天到期
+    result = forecast_due([0, -3, 2], [0, 6, 7], 10, INTERVALS, 8)
+    assert result['due'] == [2, 1, 1, 1, 0, 0, 0, 1, 0, 0]
+    assert result['graduated'] == 1  # 第3个单词第2天答对即掌握
+
+    # 全部答错时每天都会再次到期
+    result = forecast_due([0], [0], 5, INTERVALS, 8, accuracy=1e-9)
+    assert result['due'] == [1, 1, 1, 1, 1]
+    print("✅ 复习量预测测试完成！")
+
+
+def test_numpy_matches_python():
+    """测试向量化实现与纯Python实现结果一致（完全记住情景）"""
+    try:
+        import numpy as np
+    except ImportError:
+        print("⚠️ 未安装NumPy，跳过")
+        return
+    print("🧪 测试向量化预测...")
+    rng = random.Random(1)
+    offsets = [rng.randint(-5, 40) for _ in range(2000)]
+    successes = [rng.randint(0, 7) for _ in range(2000)]
+    args = (offsets, successes, 120, INTERVALS, 8)
+    assert forecast._forecast_numpy(np, *args, 1.0, 0) == forecast._forecast_python(*args, 1.0, 0)
+
+    # 按正确率的情景：随机数不同，总量应接近
+    vectorized = forecast._forecast_numpy(np, *args, 0.8, 0)
+    python = forecast._forecast_python(*args, 0.8, 0)
+    assert abs(sum(vectorized['due']) - sum(python['due'])) < 0.05 * sum(python['due'])
+    print("✅ 向量化预测测试完成！")
+
+
+def test_forecast_speed():
+    """测试10万个单词预测365天的耗时"""
+    print("🧪 测试预测耗时...")
+    rng = random.Random(2)
+    offsets = [rng.randint(-5, 90) for _ in range(100000)]
+    successes = [rng.randint(0, 7) for _ in range(100000)]
+    start = time.perf_counter()
+    forecast_due(offsets, successes, 365, INTERVALS, 8, accuracy=0.85)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 3, elapsed
+    print(f"✅ 预测耗时测试完成！{elapsed * 1000:.0f}ms")
+
+
+def test_forecast_algorithm():
+    """测试逐个单词按复习算法推演：间隔表的结果与按表推演一致，复习程序按配置的算法预测"""
+    print("🧪 测试按复习算法预测...")
+    rng = random.Random(3)
+    offsets = [rng.randint(-5, 40) for _ in range(500)]
+    successes = [rng.randint(0, 7) for _ in range(500)]
+    words = list(zip(offsets, successes))
+    for accuracy in (1.0, 0.8):
+        assert forecast_algorithm(EbbinghausAlgorithm(INTERVALS), words, 120, 8, accuracy) == \
+            forecast._forecast_python(offsets, successes, 120, INTERVALS, 8, accuracy, 0)
+    sm2 = forecast_algorithm(SM2Algorithm(INTERVALS), words, 120, 8)
+    assert sm2 != forecast_due(offsets, successes, 120, INTERVALS, 8)
+
+    today = date(2025, 1, 6)
+    saved = Config.SRS_ALGORITHM
+    try:
+        Config.SRS_ALGORITHM = 'sm2'
+        results = {}
+        for backend in ('json', 'sqlite'):
+            with tempfile.TemporaryDirectory() as tmp, isolated_config(tmp, backend), quiet():
+                reciter = new_reciter(today)
+                reciter.all_words = [Word(f"word{i}", "测试", success_count=success,
+                                          next_review_date=today + timedelta(days=offset))
+                                     for i, (offset, success) in enumerate(words)]
+                reciter.all_words[0].ease, reciter.all_words[0].interval = 1.3, 20
+                reciter._save_data()
+                reciter.storage.close()
+                reciter = new_reciter(today)  # sqlite后端通过索引查询，不加载单词
+                results[backend] = reciter.forecast(120, 0.8)
+                reciter.storage.close()
+        assert results['json'] == results['sqlite']
+        words[0] = (offsets[0], successes[0], 1.3, 20, None, None)
+        assert results['json']['perfect'] == forecast_algorithm(SM2Algorithm(INTERVALS), words, 120, 8)
+        assert results['json']['perfect'] != forecast_due(offsets, successes, 120, INTERVALS, 8)
+    finally:
+        Config.SRS_ALGORITHM = saved
+    print("✅ 按复习算法预测测试完成！")
+
+
+def test_histogram():
+    """测试直方图按天、按周显示"""
+    print("🧪 测试预测直方图...")
+    text = render_histogram([1, 0, 4], date(2025, 1, 6))
+    assert text.splitlines() == ["01-06 周一 | " + "█" * 10 + " 1",
+                                 "01-07 周二 |  0",
+                                 "01-08 周三 | " + "█" * 40 + " 4"]
+    assert len(render_histogram([1] * 60, date(2025, 1, 6)).splitlines()) == 9
+    print("✅ 预测直方图测试完成！")
+
+
+if __name__ == "__main__":
+    test_forecast_small_deck()
+    test_numpy_matches_python()
+    test_forecast_speed()
+    test_forecast_algorithm()
+    test_histogram()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""测试批量例句生成的脚本"""
+
+import sys
+import os
+import json
+import re
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from types import SimpleNamespace
+from hunyuan_batch import BatchExampleGenerator, pack_batches, parse_batch_response
+
+
+class StubHunyuanClient:
+    """模拟 HunyuanClient.ChatCompletions 的离线客户端
+
+    第一次遇到 flaky_words 中的单词时不返回该单词，用于测试重试。
+    """
+
+    def __init__(self, flaky_words=()):
+        self.flaky_words = set(flaky_words)
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def ChatCompletions(self, prompt):
+        words = json.loads(re.search(r'单词列表: (\[.*?\])。', prompt).group(1))
+        with self.lock:
+            self.prompts.append(words)
+            reply = {}
+            for word in words:
+                if word in self.flaky_words:
+                    self.flaky_words.discard(word)
+                    continue
+                reply[word] = f"i use the word {word} here_我在这里使用{word}"
+        content = "```json\n" + json.dumps(reply, ensure_ascii=False) + "\n```"
+        return SimpleNamespace(Choices=[SimpleNamespace(Message=SimpleNamespace(Content=content))])
+
+
+def _chat_with(client):
+    return lambda prompt: client.ChatCompletions(prompt).Choices[0].Message.Content
+
+
+def test_pack_batches():
+    """测试按token预算打包"""
+    print("🧪 测试批次打包...")
+    words = [f"word{i}" for i in range(100)]
+    batches = pack_batches(words, token_budget=620, output_tokens_per_word=60)
+    assert sum(batches, []) == words
+    assert all(len(batch) == 10 for batch in batches)
+    assert pack_batches(["a"] * 3, token_budget=1) == [["a"], ["a"], ["a"]]
+    print("✅ 批次打包测试完成！")
+
+
+def test_parse_batch_response():
+    """测试解析结构化响应"""
+    print("🧪 测试响应解析...")
+    content = '好的：{"Apple": "an apple a day_一天一苹果", "book": "no match here_不匹配"}'
+    assert parse_batch_response(content, ["apple", "book", "pear"]) == {"apple": "an apple a day_一天一苹果"}
+    assert parse_batch_response("not json", ["apple"]) == {}
+    print("✅ 响应解析测试完成！")
+
+
+def test_generate_with_retry():
+    """测试批量生成与只重试失败的单词"""
+    print("🧪 测试批量生成...")
+    client = StubHunyuanClient(flaky_words=["word7"])
+    generator = BatchExampleGenerator(_chat_with(client), token_budget=620, max_concurrency=3,
+                                      requests_per_second=0)
+    words = [f"word{i}" for i in range(30)]
+    results = generator.generate(words)
+    assert set(results) == set(words)
+    assert results["word7"] == "i use the word word7 here_我在这里使用word7"
+    # 3个批次 + 1次只包含失败单词的重试
+    assert generator.requests == 4
+    assert client.prompts[-1] == ["word7"]
+    print("✅ 批量生成测试完成！")
+
+
+if __name__ == "__main__":
+    test_pack_batches()
+    test_parse_batch_response()
+    test_generate_with_retry()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""测试单词导入的脚本"""
+
+import sys
+import os
+import io
+import json
+import tempfile
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from example_cache import ExampleCache
+from importer import ImportStats, detect_format, iter_batches, iter_records, _iter_json_deck
+from reciter import WordReciter
+from storage import JsonStorage, SqliteStorage
+
+
+def _write(tmp, name, text):
+    path = os.path.join(tmp, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def test_formats():
+    """测试自动识别 CSV / TSV / JSON词库"""
+    print("🧪 测试导入格式识别...")
+    deck = {
+        'generation': 3,
+        'all_words': [{'english': 'street', 'chinese': '街道', 'success_count': 2,
+                       'next_review_date': '2025-10-02', 'example': 'a quiet street_安静的街道'}],
+        'mastered_words': [{'english': 'apple', 'chinese': '苹果'}]
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = _write(tmp, 'a.csv', 'english,chinese\napple,苹果\n"pear","梨, 一种水果",ripe pear_熟梨\nbroken\n')
+        text_path = _write(tmp, 'b.csv', 'run,跑,奔跑\n"set","放置, 设定"\n')
+        tsv_path = _write(tmp, 'a.tsv', 'apple\t苹果\n')
+        json_path = _write(tmp, 'words.txt', json.dumps(deck, ensure_ascii=False, indent=2))
+
+        assert detect_format(csv_path) == 'csv'
+        assert detect_format(tsv_path) == 'tsv'
+        assert detect_format(json_path) == 'json'
+
+        records = list(iter_records(csv_path))
+        assert records[0] == ({'english': 'apple', 'chinese': '苹果'}, False)
+        assert records[1][0] == {'english': 'pear', 'chinese': '梨, 一种水果', 'example': 'ripe pear_熟梨'}
+        assert records[2] == (None, False)
+        # 没有表头：按第一个逗号拆分，其余都是中文释义
+        assert [w for w, _ in iter_records(text_path)] == [{'english': 'run', 'chinese': '跑,奔跑'},
+                                                          {'english': 'set', 'chinese': '放置, 设定'}]
+        assert list(iter_records(tsv_path)) == [({'english': 'apple', 'chinese': '苹果'}, False)]
+
+        records = list(iter_records(json_path))
+        assert [(w['english'], m) for w, m in records] == [('street', False), ('apple', True)]
+        assert records[0][0]['success_count'] == 2
+
+    # 分块很小时也能正确拼接跨块的值
+    text = json.dumps(deck, ensure_ascii=False)
+    records = list(_iter_json_deck(io.StringIO(text), chunk_size=7))
+    assert [(w['english'], m) for w, m in records] == [('street', False), ('apple', True)]
+    print("✅ 导入格式识别测试完成！")
+
+
+def test_batches_dedup():
+    """测试批内去重（大小写折叠）与无效记录计数"""
+    print("🧪 测试批内去重...")
+    stats = ImportStats()
+    records = [({'english': 'Apple ', 'chinese': '苹果'}, False),
+               ({'english': 'APPLE', 'chinese': '苹果（水果）'}, False),
+               (None, False),
+               ({'english': 'pear', 'chinese': '梨'}, False)]
+    batches = list(iter_batches(records, 2, stats))
+    assert [list(b) for b in batches] == [['apple', 'pear']]
+    assert batches[0]['apple'][0] == {'english': 'Apple', 'chinese': '苹果（水果）'}
+    assert stats.invalid == 1 and stats.skipped == 1
+    print("✅ 批内去重测试完成！")
+
+
+def _reciter(storage, tmp):
+    reciter = WordReciter()
+    reciter.storage = storage
+    reciter.hunyuan.client = None
+    reciter.example_cache = ExampleCache(os.path.join(tmp, 'example_cache.json'))
+    return reciter
+
+
+def test_import_merge():
+    """测试导入合并：新增单词、更新释义和例句、保留学习进度"""
+    print("🧪 测试导入合并...")
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage in (JsonStorage(os.path.join(tmp, 'data.json')), SqliteStorage(':memory:')):
+            reciter = _reciter(storage, tmp)
+            reciter.add_words([('apple', '苹果'), ('pear', '梨')])
+            reciter.all_words[0].success_count = 3
+            reciter._save_data()
+
+            reciter = _reciter(storage, tmp)
+            path = _write(tmp, 'update.csv', 'word,chinese,example\nAPPLE,苹果（水果）,an apple_一个苹果\npear,梨\nplum,李子\n')
+            stats = reciter.import_file(path)
+            assert (stats.added, stats.updated, stats.skipped) == (1, 1, 1)
+
+            data = storage.load()
+            words = {w['english']: w for w in data['all_words']}
+            assert sorted(words) == ['apple', 'pear', 'plum']
+            assert words['apple']['chinese'] == '苹果（水果）'
+            assert words['apple']['example'] == 'an apple_一个苹果'
+            assert words['apple']['success_count'] == 3
+            # 导入时即生成挖空模板
+            assert reciter.example_cache.template('apple', 'an apple_一个苹果').render() == 'an _____(5)'
+            assert 'pear' not in reciter.example_cache.templates
+            storage.close()
+    print("✅ 导入合并测试完成！")
+
+
+def test_import_bounded_memory():
+    """测试数据未加载时按批次导入，内存占用与文件大小无关"""
+    print("🧪 测试流式导入内存...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'big.tsv')
+        with open(path, 'w', encoding='utf-8') as f:
+            for i in range(20000):
+                f.write(f"word{i}\t释义{i}\n")
+
+        storage = SqliteStorage(os.path.join(tmp, 'data.db'))
+        reciter = _reciter(storage, tmp)
+        tracemalloc.start()
+        stats = reciter.import_records(iter_records(path), batch_size=500)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert stats.added == 20000
+        assert storage.counts() == (20000, 0)
+        assert reciter._all_words is None  # 没有把词库读入内存
+        assert peak < 5 * 1024 * 1024, peak
+        storage.close()
+    print(f"✅ 流式导入内存测试完成！峰值 {peak / 1024 / 1024:.1f}MB，{stats.rate:.0f} 条/秒")
+
+
+if __name__ == "__main__":
+    test_formats()
+    test_batches_dedup()
+    test_import_merge()
+    test_import_bounded_memory()
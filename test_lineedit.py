@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""测试拼写输入编辑器的脚本（无终端模式，用脚本按键驱动）"""
+
+import sys
+import os
+import asyncio
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from lineedit import DELETE, END, HOME, LEFT, RIGHT, HeadlessTerminal, LineEditor, read_line
+from reciter import Word
+from session import Answer, Prompt, TerminalFrontend
+
+PROMPT = "拼写: "
+
+
+def _type(keys):
+    terminal = HeadlessTerminal(list(keys) + ['\r'])
+    text, _ = read_line(PROMPT, terminal, terminal.latencies)
+    return text, terminal
+
+
+def test_editing_keys():
+    """测试退格、Delete、方向键、Home/End，屏幕显示与输入内容一致"""
+    print("🧪 测试编辑按键...")
+    text, terminal = _type("aple")  # 提示占6列：光标在第10列
+    assert text == "aple" and terminal.screen() == (PROMPT + "aple", len(PROMPT) + 6)
+
+    # 在中间插入漏掉的字母
+    text, terminal = _type(["a", "p", "l", "e", LEFT, LEFT, "p"])
+    assert text == "apple" and terminal.screen()[0] == PROMPT + "apple"
+
+    # 退格真正擦除字符，不留下空格或残留
+    text, terminal = _type(["p", "e", "a", "c", "h", "\x7f", "\x7f", "r"])
+    assert text == "pear" and terminal.screen()[0] == PROMPT + "pear"
+
+    text, terminal = _type(["x", "b", "c", HOME[0], DELETE, "a", END[0], "\x1b[A", "\x03", "d", RIGHT])
+    assert text == "abcd" and terminal.screen() == (PROMPT + "abcd", len(PROMPT) + 6)
+
+    text, terminal = _type(["\x7f", LEFT, DELETE])
+    assert text == "" and terminal.screen()[0] == PROMPT
+    print("✅ 编辑按键测试完成！")
+
+
+def test_minimal_output():
+    """测试每次按键只输出变化的部分，且一次按键只写一次"""
+    print("🧪 测试差异输出...")
+    editor = LineEditor()
+    assert [editor.feed(key) for key in "word"] == ['w', 'o', 'r', 'd']
+    assert editor.feed('\x7f') == '\b\x1b[K'
+    assert editor.feed(LEFT) == '\b' and editor.feed(RIGHT) == '\x1b[1C'
+    assert editor.feed(HOME[0]) == '\b\b\b'
+    assert editor.feed('s') == 'swor\b\b\b'
+    assert editor.feed('\x1b[A') == ''  # 上方向键不改变内容，不输出
+
+    _, terminal = _type("pronunciation")
+    # 提示一次、每个字母一次；回车不输出
+    assert len(terminal.output) == 1 + len("pronunciation")
+    assert all(len(chunk) == 1 for chunk in terminal.output[1:])
+    print("✅ 差异输出测试完成！")
+
+
+def test_terminal_frontend():
+    """测试复习界面通过无终端模式读取答案"""
+    print("🧪 测试界面读取答案...")
+    terminal = HeadlessTerminal(["a", "p", "p", "l", "e", "\r"])
+    frontend = TerminalFrontend(terminal)
+    prompt = Prompt(Word("apple", "苹果"), "苹果", "_____(5)", "", 5, 0, 8, None)
+    answer = asyncio.run(frontend.answer(prompt))
+    assert isinstance(answer, Answer) and answer.text == "apple" and answer.first_key is not None
+    assert terminal.screen()[0] == TerminalFrontend.PROMPT + "apple"
+    assert len(terminal.latencies) == 6
+    print("✅ 界面读取答案测试完成！")
+
+
+def test_keystroke_latency():
+    """测试每次按键的处理延迟（编辑长单词的中间位置）"""
+    print("🧪 测试按键延迟...")
+    keys = list("internationalization") + [LEFT] * 10 + list("xyz") + ["\x7f"] * 3 + [END]
+    terminal = HeadlessTerminal()
+    for _ in range(200):
+        terminal.send(*keys, '\r')
+    start = time.perf_counter()
+    for _ in range(200):
+        assert read_line(PROMPT, terminal, terminal.latencies)[0] == "internationalization"
+    elapsed = time.perf_counter() - start
+    latencies = sorted(terminal.latencies)
+    p99 = latencies[int(len(latencies) * 0.99)]
+    assert p99 < 1e-3, p99
+    print(f"✅ 按键延迟测试完成！平均 {elapsed / len(latencies) * 1e6:.1f}µs，p99 {p99 * 1e6:.1f}µs")
+
+
+if __name__ == "__main__":
+    test_editing_keys()
+    test_minimal_output()
+    test_terminal_frontend()
+    test_keystroke_latency()
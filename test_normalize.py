@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""测试词库清洗的脚本"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from importer import iter_records
+from normalize import (DROPPED_EXTRA, DUPLICATE, NO_HEADWORD, NO_TRANSLATION, make_messy_deck,
+                       normalize_deck, normalize_examples, normalize_record)
+from reciter import Word
+
+
+def test_normalize_examples():
+    """测试拆分多条例句、去除引用标记、统一标点和分隔符"""
+    print("🧪 测试例句清洗...")
+    field = ("The street was busy_街道很繁忙 [9,10](@ref) | Ｔｈｅ street is quiet，really ＿街道 _很安静"
+             " | We walked down the streets together 我们一起沿街走")
+    examples, rejects = normalize_examples("street", field)
+    assert examples == [("The street was busy", "街道很繁忙"),
+                        ("The street is quiet, really", "街道很安静"),
+                        ("We walked down the streets together", "我们一起沿街走")], examples
+    assert rejects == []
+
+    examples, rejects = normalize_examples("camp", "We sang songs_我们唱歌 | Camp here_在这露营 | "
+                                                   "camp here_在此露营 | A camp fire.")
+    assert examples == [("Camp here", "在这露营")]
+    assert [reason for _, reason in rejects] == [NO_HEADWORD, DUPLICATE, NO_TRANSLATION]
+
+    # 只接受完整的单词或屈折变化，包含该单词的更长的词不算
+    examples, rejects = normalize_examples("happy", "He was unhappy_他不开心 | Happier days_更快乐的日子")
+    assert examples == [("Happier days", "更快乐的日子")]
+    assert [reason for _, reason in rejects] == [NO_HEADWORD]
+    print("✅ 例句清洗测试完成！")
+
+
+def test_normalize_record():
+    """测试清洗后的单词：example为第一条合格例句，其余合格例句记入报告，学习进度不变，输出可以直接读入单词"""
+    print("🧪 测试单词清洗...")
+    word = {'english': ' apple ', 'chinese': '苹果 ', 'success_count': 3, 'next_review_date': '2025-01-01',
+            'example': "I like apples_我喜欢苹果 | An apple a day_一天一个苹果"}
+    cleaned, rejects = normalize_record(word)
+    assert cleaned['english'] == 'apple' and cleaned['chinese'] == '苹果' and cleaned['success_count'] == 3
+    assert cleaned['example'] == "I like apples_我喜欢苹果"
+    assert Word.from_dict(dict(cleaned)).example == "I like apples_我喜欢苹果"
+    assert rejects == [("An apple a day_一天一个苹果", DROPPED_EXTRA)]
+
+    cleaned, rejects = normalize_record({'english': 'pear', 'chinese': '梨', 'example': "No fruit_没有水果"})
+    assert 'example' not in cleaned and len(rejects) == 1
+    print("✅ 单词清洗测试完成！")
+
+
+def test_normalize_deck():
+    """测试流式清洗整个词库：并行与单进程结果相同，输出可直接导入，拒绝报告完整"""
+    print("🧪 测试词库清洗...")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'messy.json')
+        make_messy_deck(source, 500)
+        outputs = []
+        for workers in (1, 2):
+            target = os.path.join(tmp, f'clean{workers}.json')
+            rejects = os.path.join(tmp, f'rejects{workers}.jsonl')
+            stats = normalize_deck(source, target, rejects, workers=workers, chunk_size=64)
+            with open(target, encoding='utf-8') as f, open(rejects, encoding='utf-8') as g:
+                outputs.append((f.read(), g.read()))
+            assert stats.words == 500 and stats.examples == 1000 and stats.extra == 500 and stats.rejected == 500
+            assert stats.rejects == {NO_HEADWORD: 500, DROPPED_EXTRA: 500}
+        assert outputs[0] == outputs[1]
+
+        deck = json.loads(outputs[0][0])
+        assert len(deck['all_words']) == 500 and deck['mastered_words'] == []
+        assert all('@ref' not in word['example'] and '，' not in word['example'] for word in deck['all_words'])
+        records = list(iter_records(os.path.join(tmp, 'clean1.json')))
+        assert len(records) == 500 and records[0][0]['example'].count('_') == 1
+        report = [json.loads(line) for line in outputs[0][1].splitlines()]
+        assert len(report) == 1000 and report[0]['reason'] == NO_HEADWORD
+        # 没有写入词库的合格例句可以从报告中找回
+        extra = [line['example'] for line in report if line['reason'] == DROPPED_EXTRA]
+        assert len(extra) == 500 and all(line.count('_') == 1 and '@ref' not in line for line in extra)
+
+        # 已掌握单词和无效记录
+        source = os.path.join(tmp, 'mixed.json')
+        with open(source, 'w', encoding='utf-8') as f:
+            json.dump({'all_words': [{'english': ''}],
+                       'mastered_words': [{'english': 'train', 'chinese': '火车',
+                                           'example': "The train is fast_火车很快"}]}, f)
+        stats = normalize_deck(source, os.path.join(tmp, 'mixed_clean.json'), workers=1)
+        with open(os.path.join(tmp, 'mixed_clean.json'), encoding='utf-8') as f:
+            deck = json.load(f)
+        assert stats.invalid == 1 and deck['all_words'] == [] and deck['mastered_words'][0]['english'] == 'train'
+    print("✅ 词库清洗测试完成！")
+
+
+if __name__ == "__main__":
+    test_normalize_examples()
+    test_normalize_record()
+    test_normalize_deck()
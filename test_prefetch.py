@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""测试例句预取的脚本"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from types import SimpleNamespace
+from prefetch import ExamplePrefetcher
+
+
+class FakeHunyuanClient:
+    """模拟 hunyuan_client.HunyuanClient：每次请求耗时固定"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def ChatCompletions(self, word):
+        with self.lock:
+            self.requests.append(word)
+        time.sleep(self.delay)
+        message = SimpleNamespace(Content=f"i like {word}_我喜欢{word}")
+        return SimpleNamespace(Choices=[SimpleNamespace(Message=message)])
+
+
+def _fetch_with(client):
+    return lambda word: client.ChatCompletions(word.english).Choices[0].Message.Content
+
+
+def test_prefetch_overlaps_answering():
+    """测试作答当前单词时后续例句已在后台获取"""
+    print("🧪 测试例句预取...")
+    client = FakeHunyuanClient(delay=0.05)
+    words = [SimpleNamespace(english=f"word{i}", example=None) for i in range(6)]
+    words[2].example = "already here_已有例句"
+
+    start = time.perf_counter()
+    with ExamplePrefetcher(_fetch_with(client), words, lookahead=2, max_workers=2) as prefetcher:
+        examples = []
+        for index in range(len(words)):
+            examples.append(prefetcher.get(index))
+            time.sleep(0.05)  # 模拟用户作答
+    elapsed = time.perf_counter() - start
+
+    assert examples[0] == "i like word0_我喜欢word0"
+    assert examples[2] == "already here_已有例句"
+    assert "word2" not in client.requests
+    # 串行需要 6*0.05(作答) + 5*0.05(请求)，预取后请求与作答重叠
+    assert elapsed < 0.5, elapsed
+    print(f"✅ 例句预取测试完成！耗时 {elapsed:.2f}s")
+
+
+def test_bounded_and_cancel():
+    """测试预取数量有界，退出时取消未开始的任务"""
+    print("🧪 测试预取取消...")
+    client = FakeHunyuanClient(delay=0.05)
+    words = [SimpleNamespace(english=f"word{i}", example=None) for i in range(50)]
+    with ExamplePrefetcher(_fetch_with(client), words, lookahead=3, max_workers=1) as prefetcher:
+        prefetcher.get(0)
+    time.sleep(0.2)
+    # 只提交了前几个单词，退出后不会继续请求
+    assert len(client.requests) <= 5, client.requests
+    print("✅ 预取取消测试完成！")
+
+
+if __name__ == "__main__":
+    test_prefetch_overlaps_answering()
+    test_bounded_and_cancel()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""测试性能剖析的脚本"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date
+from profiling import Profiler
+from reciter import WordReciter, Word, _profile_spans
+from storage import SqliteStorage
+
+
+class Slow:
+    def work(self, seconds):
+        time.sleep(seconds)
+        return seconds
+
+    @staticmethod
+    def helper():
+        return 'ok'
+
+
+def test_spans_and_summary():
+    """测试计时、统计与恢复"""
+    print("🧪 测试阶段计时...")
+    original = Slow.__dict__['work']
+    profiler = Profiler()
+    profiler.instrument(Slow, {'work': 'slow.work', 'helper': 'slow.helper'})
+    for seconds in (0.001, 0.001, 0.02):
+        assert Slow().work(seconds) == seconds
+    assert Slow.helper() == 'ok'
+
+    rows = {row['name']: row for row in profiler.summary()}
+    assert rows['slow.work']['calls'] == 3 and rows['slow.helper']['calls'] == 1
+    assert rows['slow.work']['p50_ms'] < 10 <= rows['slow.work']['max_ms']
+    assert profiler.summary()[0]['name'] == 'slow.work'
+
+    profiler.uninstrument()
+    assert Slow.__dict__['work'] is original
+    assert isinstance(Slow.__dict__['helper'], staticmethod)
+    print("✅ 阶段计时测试完成！")
+
+
+def test_chrome_trace():
+    """测试Chrome trace输出"""
+    print("🧪 测试Chrome trace...")
+    profiler = Profiler(trace=True)
+    profiler.instrument(Slow, {'work': 'slow.work'})
+    try:
+        Slow().work(0.001)
+    finally:
+        profiler.uninstrument()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'trace.json')
+        profiler.write_chrome_trace(path)
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+    assert [(e['name'], e['ph']) for e in events] == [('slow.work', 'X')]
+    assert events[0]['dur'] >= 1000
+    print("✅ Chrome trace测试完成！")
+
+
+def test_reciter_spans():
+    """测试背诵系统的阶段：未开启时方法不被替换，开启后记录复习流程各阶段"""
+    print("🧪 测试背诵系统阶段计时...")
+    spans = _profile_spans()
+    originals = {(cls, attr): cls.__dict__[attr] for cls, methods in spans.items() for attr in methods}
+
+    profiler = Profiler()
+    for cls, methods in spans.items():
+        profiler.instrument(cls, methods)
+    try:
+        reciter = WordReciter()
+        reciter.storage = SqliteStorage(':memory:')
+        reciter.today = date(2025, 1, 10)
+        reciter.all_words = [Word("apple", "苹果", next_review_date=date(2025, 1, 10))]
+        reciter.mastered_words = []
+        assert [w.english for w in reciter._get_today_review_list()] == ["apple"]
+        reciter._save_data()
+        reciter.storage.close()
+    finally:
+        profiler.uninstrument()
+
+    names = {row['name'] for row in profiler.summary()}
+    assert {'today_list', 'scheduler.build', 'scheduler.due_words', 'save'} <= names
+    assert all(cls.__dict__[attr] is original for (cls, attr), original in originals.items())
+    print("✅ 背诵系统阶段计时测试完成！")
+
+
+if __name__ == "__main__":
+    test_spans_and_summary()
+    test_chrome_trace()
+    test_reciter_spans()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""测试复习调度器的脚本"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+from scheduler import MasteredSelector, ReviewScheduler
+
+
+def _reference_review_list(words, today, current_round):
+    """原有的全量扫描逻辑（WordReciter._get_today_review_list）"""
+    overdue_words = [w for w in words if w.next_review_date <= today]
+    if not overdue_words:
+        return []
+    words_by_round = {}
+    for word in overdue_words:
+        words_by_round.setdefault(word.review_round, []).append(word)
+    review_round = current_round if current_round in words_by_round else min(words_by_round)
+    return sorted(words_by_round[review_round], key=lambda w: w.review_count)
+
+
+def _random_word(rng, today, index):
+    return SimpleNamespace(
+        english=f"word{index}",
+        review_round=rng.randint(0, 3),
+        review_count=rng.randint(0, 5),
+        next_review_date=today + timedelta(days=rng.randint(-3, 3))
+    )
+
+
+def test_matches_full_scan():
+    """测试调度器与原有全量扫描的排序一致"""
+    print("🧪 测试调度器排序...")
+    rng = random.Random(42)
+    today = date(2025, 1, 10)
+    words = [_random_word(rng, today, i) for i in range(300)]
+    scheduler = ReviewScheduler(words, today)
+
+    for step in range(200):
+        current_round = rng.randint(0, 3)
+        assert scheduler.due_words(current_round) == _reference_review_list(words, today, current_round)
+
+        # 随机修改一个单词，或将其标记为已掌握
+        word = rng.choice(words)
+        if step % 10 == 0:
+            scheduler.remove(word)
+            words.remove(word)
+        else:
+            word.review_count += 1
+            word.next_review_date = today + timedelta(days=rng.randint(-1, 2))
+            word.review_round = rng.randint(0, 3)
+            scheduler.update(word)
+    print("✅ 调度器排序测试完成！")
+
+
+def test_advance_round():
+    """测试轮次推进只移动低轮次单词"""
+    print("🧪 测试轮次推进...")
+    today = date(2025, 1, 10)
+    words = [
+        SimpleNamespace(english="apple", review_round=0, review_count=1, next_review_date=today),
+        SimpleNamespace(english="pear", review_round=2, review_count=0, next_review_date=today),
+    ]
+    scheduler = ReviewScheduler(words, today)
+    assert scheduler.has_round(0) and scheduler.min_round() == 0
+
+    moved = []
+
+    def reschedule(word):
+        moved.append(word.english)
+        word.next_review_date = today + timedelta(days=1)
+
+    scheduler.advance_round(1, reschedule)
+    assert moved == ["apple"]
+    assert not scheduler.has_round(0) and scheduler.has_round(1)
+    assert scheduler.due_words(1) == [words[1]]
+    print("✅ 轮次推进测试完成！")
+
+
+def test_mastered_selector():
+    """测试已掌握单词的选择索引与全量排序一致，复习后增量更新"""
+    print("🧪 测试已掌握单词选择索引...")
+    rng = random.Random(1)
+    today = date(2025, 1, 1)
+    words = [SimpleNamespace(english=f"word{i}", review_count=rng.randint(0, 5), age=rng.randint(0, 100))
+             for i in range(2000)]
+    priority = lambda word, day: (word.review_count, -word.age)
+    selector = MasteredSelector(words, today, priority)
+    for _ in range(50):
+        expected = sorted(words, key=lambda w: priority(w, None))[:10]
+        selected = selector.select(10)
+        assert [priority(w, None) for w in selected] == [priority(w, None) for w in expected]
+        for word in selected:
+            word.review_count += 1
+            word.age = 0
+            selector.update(word)
+    assert selector.all_reviewed() == all(w.review_count for w in words)
+
+    new_word = SimpleNamespace(english="new", review_count=0, age=1000)
+    selector.add(new_word)
+    assert selector.select(1) == [new_word] and len(selector) == 2001
+    assert not selector.all_reviewed()
+    assert len(selector._heap) <= 2 * len(selector) + 64
+
+    selector = MasteredSelector(words[:3], today, priority)
+    for word in words[:3]:
+        word.review_count = max(word.review_count, 1)
+        selector.update(word)
+    assert selector.all_reviewed()
+    print("✅ 已掌握单词选择索引测试完成！")
+
+
+if __name__ == "__main__":
+    test_matches_full_scan()
+    test_advance_round()
+    test_mastered_selector()
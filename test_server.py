@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""测试多用户模式的脚本"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date, timedelta
+from reciter import Config
+from server import Classroom, UnknownUser, load_test, main, make_server
+from storage import JsonStorage
+
+TODAY = date(2025, 1, 10)
+
+
+def _classroom(tmp):
+    return Classroom(os.path.join(tmp, 'classroom.db'), today=lambda: TODAY)
+
+
+def test_shared_catalog():
+    """测试共享词库只保存一份单词，进度按用户分开"""
+    print("🧪 测试共享词库...")
+    with tempfile.TemporaryDirectory() as tmp:
+        classroom = _classroom(tmp)
+        classroom.add_user('alice')
+        classroom.add_user('bob')
+        assert classroom.add_words([{'english': 'apple', 'chinese': '苹果'},
+                                    {'english': 'pear', 'chinese': '梨'}]) == 4
+        assert classroom.add_words([{'english': 'Apple', 'chinese': '苹果'}], users=['alice']) == 0
+        assert classroom.add_words([{'english': 'plum', 'chinese': '李子'}], users=['bob']) == 1
+        with classroom.pool.connection() as conn:
+            assert conn.execute('SELECT COUNT(*) FROM catalog').fetchone()[0] == 3
+
+        assert classroom.stats('alice') == {'pending': 2, 'mastered': 0, 'due': 2}
+        assert classroom.stats('bob') == {'pending': 3, 'mastered': 0, 'due': 3}
+
+        # 例句生成一次后写回共享词库
+        word = classroom.next_word('alice')
+        assert word['chinese'] == '苹果' and 'apple' not in word['example'] and word['length'] == 5
+        with classroom.pool.connection() as conn:
+            example = conn.execute("SELECT example FROM catalog WHERE key = 'apple'").fetchone()[0]
+        assert 'apple' in example
+        try:
+            classroom.stats('carol')
+            assert False, "未知用户应报错"
+        except UnknownUser:
+            pass
+        classroom.close()
+    print("✅ 共享词库测试完成！")
+
+
+def test_stored_templates():
+    """测试导入时保存挖空模板，出题时直接使用，批量重新生成"""
+    print("🧪 测试挖空模板...")
+    with tempfile.TemporaryDirectory() as tmp:
+        classroom = _classroom(tmp)
+        classroom.add_user('alice')
+        classroom.add_words([{'english': 'camp', 'chinese': '露营', 'example': 'We camped there._我们在那里露营。'}])
+        with classroom.pool.connection() as conn:
+            assert conn.execute("SELECT cloze FROM catalog WHERE key = 'camp'").fetchone()[0]
+            conn.execute("UPDATE catalog SET cloze = NULL")
+        assert classroom.next_word('alice')['example'] == 'We ____(4) there.'
+        with classroom.pool.connection() as conn:
+            conn.execute("UPDATE catalog SET cloze = 'stale\x1f\x1f1\x1f'")
+        assert classroom.next_word('alice')['example'] == 'stale_(1)'  # 使用保存的模板，不再解析例句
+        assert classroom.retemplate() == 1
+        assert classroom.next_word('alice')['example'] == 'We ____(4) there.'
+        classroom.close()
+    print("✅ 挖空模板测试完成！")
+
+
+def test_import_user_read_only():
+    """测试导入学员的学习数据：日志中的复习记录一并导入，原文件和日志都不被修改"""
+    print("🧪 测试导入学员数据...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, 'learning_data.json')
+        storage = JsonStorage(data_path)
+        storage.save_all([{'english': 'apple', 'chinese': '苹果', 'success_count': 2,
+                           'next_review_date': TODAY.isoformat()}], [])
+        storage.record({'english': 'pear', 'chinese': '梨', 'success_count': 1,
+                        'next_review_date': TODAY.isoformat()})
+        storage.close()
+        with open(data_path + '.journal', 'a') as f:
+            f.write('{"english": "half')  # 写了一半的日志尾部
+        files = {}
+        for path in (data_path, data_path + '.journal'):
+            with open(path, 'rb') as f:
+                files[path] = f.read()
+
+        db_path = os.path.join(tmp, 'classroom.db')
+        main(['--db', db_path, 'add-user', 'alice', data_path])
+        for path, content in files.items():
+            with open(path, 'rb') as f:
+                assert f.read() == content, path
+        assert sorted(os.listdir(tmp)) == ['classroom.db', 'learning_data.json', 'learning_data.json.journal']
+
+        classroom = Classroom(db_path, today=lambda: TODAY)
+        assert classroom.stats('alice')['pending'] == 2
+        classroom.close()
+    print("✅ 导入学员数据测试完成！")
+
+
+def test_review_rules():
+    """测试作答后按复习规则更新单个用户的进度"""
+    print("🧪 测试多用户复习规则...")
+    with tempfile.TemporaryDirectory() as tmp:
+        classroom = _classroom(tmp)
+        classroom.import_user('alice', {
+            'all_words': [
+                {'english': 'apple', 'chinese': '苹果', 'success_count': 7, 'review_count': 3,
+                 'next_review_date': '2025-01-01', 'review_round': 1},
+                {'english': 'pear', 'chinese': '梨', 'success_count': 2, 'review_count': 1,
+                 'next_review_date': '2025-01-10', 'review_round': 0},
+            ],
+            'mastered_words': [{'english': 'plum', 'chinese': '李子', 'success_count': 8,
+                                'next_review_date': '2024-12-01'}],
+        })
+        classroom.add_user('bob')
+        classroom.add_words([{'english': 'pear', 'chinese': '梨'}], users=['bob'])
+
+        word = classroom.next_word('alice')  # 轮次低的单词优先
+        assert word['due'] == 2 and word['success_count'] == 2
+        result = classroom.submit('alice', word['word_id'], ' Pear ')
+        assert result['correct'] and result['success_count'] == 3
+        assert result['next_review_date'] == (TODAY + timedelta(days=4)).isoformat()
+
+        word = classroom.next_word('alice')
+        result = classroom.submit('alice', word['word_id'], 'appel')
+        assert not result['correct'] and result['next_review_date'] == TODAY.isoformat()
+        result = classroom.submit('alice', word['word_id'], 'apple')
+        assert result['mastered'] and result['next_review_date'] is None
+
+        assert classroom.next_word('alice') == {'word_id': None, 'due': 0}
+        assert classroom.stats('alice') == {'pending': 1, 'mastered': 2, 'due': 0}
+        assert classroom.stats('bob') == {'pending': 1, 'mastered': 0, 'due': 1}  # 不受alice影响
+        classroom.close()
+    print("✅ 多用户复习规则测试完成！")
+
+
+def test_http_api():
+    """测试HTTP接口"""
+    print("🧪 测试HTTP接口...")
+    backend, cache_dir = Config.TTS_BACKEND, Config.TTS_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.TTS_BACKEND, Config.TTS_CACHE_DIR = 'null', os.path.join(tmp, 'tts')
+        classroom = _classroom(tmp)
+        server = make_server(classroom, '127.0.0.1', 0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        def call(method, path, body=None):
+            data = json.dumps(body).encode() if body is not None else None
+            request = urllib.request.Request(base + path, data=data, method=method)
+            try:
+                with urllib.request.urlopen(request) as response:
+                    return response.status, response.read()
+            except urllib.error.HTTPError as e:
+                return e.code, e.read()
+
+        try:
+            assert call('POST', '/users', {'name': 'alice'})[0] == 200
+            status, body = call('POST', '/words', {'words': [{'english': 'apple', 'chinese': '苹果',
+                                                               'example': 'I ate an apple._我吃了一个苹果。'}]})
+            assert json.loads(body) == {'added': 1}
+            word = json.loads(call('GET', '/users/alice/next')[1])
+            assert word['example'] == 'I ate an _____(5).' and word['translation'] == '我吃了一个苹果。'
+            result = json.loads(call('POST', '/users/alice/answer', {'word_id': word['word_id'], 'answer': 'apple'})[1])
+            assert result['correct']
+            assert json.loads(call('GET', '/users/alice/stats')[1])['due'] == 0
+
+            status, audio = call('GET', f"/audio/{word['word_id']}")
+            assert status == 200 and audio[:4] == b'RIFF'
+            assert call('GET', '/users/carol/next')[0] == 404
+            assert call('POST', '/users/alice/answer', {'answer': 'x'})[0] == 400
+            assert call('GET', '/nothing')[0] == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+            classroom.close()
+            Config.TTS_BACKEND, Config.TTS_CACHE_DIR = backend, cache_dir
+    print("✅ HTTP接口测试完成！")
+
+
+def test_load_test():
+    """测试本机压测：并发用户全部请求成功"""
+    print("🧪 测试本机压测...")
+    result = load_test(users=10, words=30, requests_per_user=5)
+    assert result['errors'] == 0 and result['requests'] == 100
+    print(f"✅ 本机压测测试完成！{result['requests_per_s']:.0f} 请求/秒")
+
+
+if __name__ == "__main__":
+    test_shared_catalog()
+    test_stored_templates()
+    test_import_user_read_only()
+    test_review_rules()
+    test_http_api()
+    test_load_test()
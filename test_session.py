@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""测试复习会话引擎的脚本（用脚本前端代替终端输入）"""
+
+import sys
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_suite import isolated_config, make_deck, new_reciter, quiet
+from events import CORRECT, HINT, REPLAY, WRONG, iter_events
+from reciter import Config, Word
+from session import Feedback, Prompt, ReviewSession, Result, RoundAdvanced, WordAttempt
+from srs import create_algorithm
+
+TODAY = date(2025, 1, 1)
+
+
+class ScriptFrontend:
+    """按单词给出预设的输入序列，记录收到的事件"""
+
+    def __init__(self, script=None, default=None):
+        self.script = {key: list(replies) for key, replies in (script or {}).items()}
+        self.default = default
+        self.events = []
+
+    def show(self, event):
+        self.events.append(event)
+
+    async def answer(self, prompt):
+        replies = self.script.get(prompt.word.english)
+        if replies:
+            return replies.pop(0)
+        return prompt.word.english if self.default is None else self.default
+
+    def outcomes(self):
+        return [event.outcome for event in self.events if isinstance(event, Feedback)]
+
+
+def test_word_attempt():
+    """测试单个单词的作答状态机"""
+    print("🧪 测试作答状态机...")
+    state = WordAttempt(Word("Apple", "苹果"), "An apple a day._一天一个苹果。")
+    assert state.cloze == "An _____(5) a day." and state.translation == "一天一个苹果。"
+    assert [state.submit(text) for text in ("s", "pear", "peach")] == ['replay', 'wrong', 'wrong']
+    assert state.success is None and state.attempts_left == 1
+    assert state.submit("apple") == 'correct' and state.success is True
+
+    state = WordAttempt(Word("Apple", "苹果"), "")
+    assert [state.submit(text) for text in ("a", "b", "c")] == ['wrong', 'wrong', 'failed']
+    assert state.success is False
+
+    state = WordAttempt(Word("Apple", "苹果"), "")
+    assert state.submit("h") == 'reveal' and state.success is False
+    print("✅ 作答状态机测试完成！")
+
+
+def test_daily_session():
+    """测试每日复习会话：事件顺序、进度更新和事件日志"""
+    print("🧪 测试每日复习会话...")
+    with tempfile.TemporaryDirectory() as tmp, isolated_config(tmp, 'sqlite'), quiet():
+        reciter = new_reciter(TODAY)
+        words = [Word("apple", "苹果", success_count=2, next_review_date=TODAY),
+                 Word("pear", "梨", success_count=Config.MAX_SUCCESS_COUNT - 1, next_review_date=TODAY),
+                 Word("plum", "李子", success_count=1, next_review_date=TODAY)]
+        reciter.all_words = words
+        reciter._save_data()
+        frontend = ScriptFrontend({"apple": ["s", "aple", "apple"], "plum": ["h"]})
+        report = ReviewSession(reciter, words).run_sync(frontend)
+        reciter.close()
+
+        assert report == (3, 2, 1, 1), report
+        assert frontend.outcomes() == ['replay', 'wrong', 'correct', 'correct', 'reveal']
+        prompts = [event for event in frontend.events if isinstance(event, Prompt)]
+        assert [prompt.remaining for prompt in prompts] == [3, 2, 1]
+        assert all(f"({prompt.length})" in prompt.example for prompt in prompts)
+        results = {event.word.english: event for event in frontend.events if isinstance(event, Result)}
+        assert results['apple'].success and results['apple'].delta_days == 4
+        assert results['pear'].mastered and not results['plum'].success
+        assert words[0].success_count == 3 and words[0].next_review_date == date(2025, 1, 5)
+        assert words[2].success_count == 1 and all(word.review_count == 1 for word in words)
+
+        kinds = [row[3] for row in iter_events(Config.EVENT_LOG)]
+        assert kinds == [REPLAY, WRONG, CORRECT, CORRECT, HINT], kinds
+    print("✅ 每日复习会话测试完成！")
+
+
+def test_mastered_session():
+    """测试复习已掌握词汇：只记录复习次数，不改变复习计划"""
+    print("🧪 测试已掌握词汇复习...")
+    with tempfile.TemporaryDirectory() as tmp, isolated_config(tmp, 'json'), quiet():
+        reciter = new_reciter(TODAY)
+        words = [Word(f"word{i}", f"释义{i}", success_count=Config.MAX_SUCCESS_COUNT) for i in range(3)]
+        reciter.mastered_words = words
+        frontend = ScriptFrontend({"word1": ["x", "y", "z"]})
+        report = ReviewSession(reciter, words, mastered=True).run_sync(frontend)
+        reciter.close()
+
+    assert report == (3, 2, 1, 0), report
+    assert all(prompt.remaining is None for prompt in frontend.events if isinstance(prompt, Prompt))
+    assert not any(isinstance(event, Result) for event in frontend.events)
+    assert [word.review_count for word in words] == [1, 1, 1]
+    assert all(word.success_count == Config.MAX_SUCCESS_COUNT for word in words)
+    print("✅ 已掌握词汇复习测试完成！")
+
+
+def test_mastered_selection():
+    """测试已掌握词汇的选择策略和会话结束时的批量写入"""
+    print("🧪 测试已掌握词汇选择...")
+    saved = Config.MASTERED_REVIEW_POLICY, Config.MASTERED_REVIEW_BATCH
+    with tempfile.TemporaryDirectory() as tmp, isolated_config(tmp, 'json'), quiet():
+        try:
+            Config.MASTERED_REVIEW_BATCH = 2
+            reciter = new_reciter(TODAY)
+            # 间隔90天：fresh刚复习过，old在200天前、risky在120天前复习过但稳定性低
+            words = [Word("fresh", "新", success_count=Config.MAX_SUCCESS_COUNT, review_count=0,
+                          next_review_date=TODAY + timedelta(days=90)),
+                     Word("old", "旧", success_count=Config.MAX_SUCCESS_COUNT, review_count=3,
+                          next_review_date=TODAY - timedelta(days=110)),
+                     Word("risky", "险", success_count=Config.MAX_SUCCESS_COUNT, review_count=5,
+                          next_review_date=TODAY - timedelta(days=30), stability=10.0)]
+            reciter.mastered_words = words
+            calls = []
+            record_many = reciter.storage.record_many
+            reciter.storage.record_many = lambda entries: calls.append(entries) or record_many(entries)
+
+            Config.MASTERED_REVIEW_POLICY = 'count'
+            assert reciter._get_mastered_selector().select(2) == [words[0], words[1]]
+            Config.MASTERED_REVIEW_POLICY = 'decay'
+            reciter._mastered_selector = None
+            assert reciter._get_mastered_selector().select(2) == [words[2], words[1]]
+
+            reciter.review_mastered_words(ScriptFrontend())
+            assert len(calls) == 1 and [data['english'] for data, _ in calls[0]] == ['risky', 'old']
+            assert words[2].review_count == 6 and words[2].next_review_date > TODAY
+            # 复习过的单词排到后面
+            assert reciter._get_mastered_selector().select(1) == [words[0]]
+            reciter.close()
+
+            # 建立选择索引只读取记忆状态，不为未复习的单词补写
+            for name in ('sm2', 'fsrs'):
+                reciter = new_reciter(TODAY)
+                reciter.algorithm = create_algorithm(name, Config.REVIEW_INTERVAL_DAYS)
+                reciter.mastered_words = words = [Word(f"word{i}", "词", success_count=Config.MAX_SUCCESS_COUNT)
+                                                  for i in range(3)]
+                before = [word.to_dict() for word in words]
+                reciter._get_mastered_selector().select(2)
+                assert [word.to_dict() for word in words] == before, name
+                reciter.close()
+        finally:
+            Config.MASTERED_REVIEW_POLICY, Config.MASTERED_REVIEW_BATCH = saved
+    print("✅ 已掌握词汇选择测试完成！")
+
+
+def test_round_advance():
+    """测试当前轮次的最后一个单词掌握后进入新轮次"""
+    print("🧪 测试轮次推进事件...")
+    with tempfile.TemporaryDirectory() as tmp, isolated_config(tmp, 'json'), quiet():
+        reciter = new_reciter(TODAY)
+        word = Word("apple", "苹果", success_count=Config.MAX_SUCCESS_COUNT - 1, next_review_date=TODAY)
+        reciter.all_words = [word, Word("pear", "梨", next_review_date=date(2025, 2, 1), review_round=1)]
+        frontend = ScriptFrontend()
+        ReviewSession(reciter, [word]).run_sync(frontend)
+        reciter.close()
+
+    assert isinstance(frontend.events[-1], RoundAdvanced)
+    assert frontend.events[-1].review_round == reciter.current_review_round == 1
+    print("✅ 轮次推进事件测试完成！")
+
+
+def test_round_advance_indexed():
+    """测试SQLite索引模式下掌握单词、推进轮次都不整体加载词库"""
+    print("🧪 测试索引模式轮次推进...")
+    with tempfile.TemporaryDirectory() as tmp, isolated_config(tmp, 'sqlite'), quiet():
+        reciter = new_reciter(TODAY)
+        reciter.all_words = [Word("apple", "苹果", success_count=Config.MAX_SUCCESS_COUNT - 1,
+                                  next_review_date=TODAY, review_round=1),
+                             Word("pear", "梨", success_count=1, next_review_date=date(2025, 2, 1)),
+                             Word("plum", "李子", next_review_date=date(2025, 2, 1), review_round=2)]
+        reciter._save_data()
+        reciter.close()
+
+        reciter = new_reciter(TODAY)
+        reciter._load_data = None  # 整体加载会在这里报错
+        reciter.current_review_round = 1  # 本轮中途新增的单词停留在第1轮
+        review_list = reciter._get_today_review_list()
+        assert [w.english for w in review_list] == ["apple"]
+        frontend = ScriptFrontend()
+        ReviewSession(reciter, review_list).run_sync(frontend)
+        assert reciter._all_words is None and reciter._mastered_words is None
+        assert isinstance(frontend.events[-1], RoundAdvanced) and reciter.current_review_round == 2
+        assert reciter._word_counts() == (2, 1)
+        reciter.close()
+
+        reciter = new_reciter(TODAY)
+        assert [w.english for w in reciter.mastered_words] == ["apple"]
+        rounds = {w.english: (w.review_round, w.next_review_date) for w in reciter.all_words}
+        assert rounds == {"pear": (2, TODAY + timedelta(days=1)), "plum": (2, date(2025, 2, 1))}, rounds
+        reciter.close()
+    print("✅ 索引模式轮次推进测试完成！")
+
+
+def test_scripted_throughput():
+    """测试脚本驱动的复习速度（单词之间没有阻塞等待）"""
+    print("🧪 测试脚本复习速度...")
+    with tempfile.TemporaryDirectory() as tmp, isolated_config(tmp, 'sqlite'), quiet():
+        all_words, _ = make_deck(3000, TODAY, due_today=2000, mastered_ratio=0)
+        reciter = new_reciter(TODAY)
+        reciter.all_words = [Word.from_dict(data) for data in all_words]
+        reciter._save_data()
+        review_list = reciter._get_today_review_list()
+        frontend = ScriptFrontend(default="wrong")
+        start = time.perf_counter()
+        report = ReviewSession(reciter, review_list).run_sync(frontend)
+        per_second = report.total / (time.perf_counter() - start)
+        reciter.close()
+
+    assert report.total == len(review_list) >= 1000 and report.wrong == report.total
+    assert per_second > 500, per_second
+    print(f"✅ 脚本复习速度测试完成！每秒 {per_second:.0f} 个单词（每个单词三次作答）")
+
+
+if __name__ == "__main__":
+    test_word_attempt()
+    test_daily_session()
+    test_mastered_session()
+    test_mastered_selection()
+    test_round_advance()
+    test_round_advance_indexed()
+    test_scripted_throughput()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""测试二进制快照存储的脚本"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date, timedelta
+from bench_suite import isolated_config, make_deck, new_reciter, quiet
+from reciter import Word
+from snapshot import BinaryStorage, SnapshotError, binary_to_json, json_to_binary, write_snapshot
+from storage import JsonStorage, SqliteStorage
+
+TODAY = date(2025, 1, 1)
+
+
+def _deck(size=300, seed=0, sparse=False):
+    """带各种可选字段的词库：记忆模型字段、空例句、Unicode释义
+
+    sparse=True 时部分单词缺少例句、轮次等键（旧版数据文件），SQLite会补上默认值，只用于转换测试。
+    """
+    rng = random.Random(seed)
+    pending, mastered = [], []
+    for i in range(size):
+        data = {
+            'english': f"Word{i}" if i % 7 else f"ice cream {i}",
+            'chinese': f"释义{i}",
+            'success_count': rng.randint(0, 7),
+            'next_review_date': (TODAY + timedelta(days=rng.randint(-5, 20))).isoformat(),
+        }
+        if i % 3 or not sparse:
+            data['example'] = f"Word{i} is here._这里有单词{i}。" if i % 5 else None
+        if i % 4 or not sparse:
+            data['review_round'] = rng.randint(0, 3)
+            data['review_count'] = rng.randint(0, 9)
+        if i % 6 == 0:
+            data.update(ease=2.5, interval=None, stability=rng.random() * 30, difficulty=None)
+        (mastered if i % 10 == 0 else pending).append(data)
+    return pending, mastered
+
+
+def test_round_trip():
+    """测试JSON与二进制快照相互转换不丢失任何数据"""
+    print("🧪 测试快照转换...")
+    pending, mastered = _deck(sparse=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, binary_path = os.path.join(tmp, 'data.json'), os.path.join(tmp, 'data.bin')
+        JsonStorage(json_path).save_all(pending, mastered)
+        assert json_to_binary(json_path, binary_path) == (len(pending), len(mastered))
+
+        back_path = os.path.join(tmp, 'back.json')
+        binary_to_json(binary_path, back_path)
+        with open(json_path) as f, open(back_path) as g:
+            assert json.load(f) == json.load(g)
+
+        try:
+            write_snapshot(binary_path, [{**pending[0], 'unknown': 1}], [])
+            assert False, "未知字段应当报错"
+        except ValueError:
+            pass
+    print("✅ 快照转换测试完成！")
+
+
+def test_queries_match_sqlite():
+    """测试索引查询的结果与SQLite后端相同（含复习日志中的修改）"""
+    print("🧪 测试快照查询...")
+    pending, mastered = _deck()
+    with tempfile.TemporaryDirectory() as tmp:
+        binary = BinaryStorage(os.path.join(tmp, 'data.bin'))
+        sqlite = SqliteStorage(os.path.join(tmp, 'data.db'))
+        for storage in (binary, sqlite):
+            storage.save_all(pending, mastered)
+            # 复习、掌握、新增单词
+            storage.record_many([({**pending[1], 'review_count': 20}, False),
+                                 ({**pending[2], 'success_count': 8}, True),
+                                 ({'english': 'Brand', 'chinese': '新', 'success_count': 0,
+                                   'next_review_date': TODAY.isoformat(), 'example': None,
+                                   'review_round': 0, 'review_count': 0}, False)])
+        binary.close()
+        binary = BinaryStorage(binary.path)  # 重新打开：重放日志
+
+        assert binary.load() == sqlite.load()
+        assert binary.load(with_examples=False) == sqlite.load(with_examples=False)
+        assert binary.load_due(TODAY) == sqlite.load_due(TODAY)
+        assert binary.counts() == sqlite.counts() and binary.aggregate() == sqlite.aggregate()
+        assert binary.min_round() == sqlite.min_round()
+        assert [binary.has_round(r) for r in range(5)] == [sqlite.has_round(r) for r in range(5)]
+        for r in range(5):
+            assert binary.load_below_round(r) == sqlite.load_below_round(r), r
+        assert sorted(binary.pending_schedule()) == sorted(sqlite.pending_schedule())
+        keys = ['word1', 'word2', 'brand', 'missing', 'ice cream 7']
+        assert binary.lookup(keys) == sqlite.lookup(keys)
+        assert binary.load_example('WORD4') == sqlite.load_example('WORD4')
+        for query in ({}, {'review_round': 1}, {'due_before': TODAY}, {'text': '释义1'}, {'text': 'ICE'}):
+            for mastered_flag in (False, True):
+                for offset in (0, 15):
+                    assert binary.page(mastered_flag, 10, offset, **query) == \
+                        sqlite.page(mastered_flag, 10, offset, **query), query
+        binary.close()
+        sqlite.close()
+    print("✅ 快照查询测试完成！")
+
+
+def test_compaction_keeps_examples():
+    """测试未读取例句时压缩保留原有例句，损坏的快照被备份"""
+    print("🧪 测试快照压缩...")
+    pending, mastered = _deck(50)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.bin')
+        storage = BinaryStorage(path)
+        storage.save_all(pending, mastered)
+        storage.record({key: value for key, value in pending[1].items() if key != 'example'})
+        data = storage.load(with_examples=False)
+        storage.save_all(data['all_words'], data['mastered_words'])
+        assert storage.journal_size == 0
+        storage.close()
+        assert BinaryStorage(path).load() == {'all_words': pending, 'mastered_words': mastered}
+
+        # 快照损坏：日志中最近的复习记录原样备份
+        storage = BinaryStorage(path)
+        storage.record(pending[0])
+        storage.close()
+        with open(path + '.journal') as f:
+            journal = f.read()
+        with open(path, 'r+b') as f:
+            f.write(b'broken!!')
+        try:
+            BinaryStorage(path).load()
+            assert False, "损坏的快照应当报错"
+        except SnapshotError:
+            pass
+        assert os.path.exists(path + '.corrupt') and not os.path.exists(path)
+        assert not os.path.exists(path + '.journal')
+        with open(path + '.journal.corrupt') as f:
+            assert f.read() == journal
+    print("✅ 快照压缩测试完成！")
+
+
+def test_reciter_backend():
+    """测试复习程序使用二进制后端：复习后重新打开，数据一致"""
+    print("🧪 测试二进制后端...")
+    with tempfile.TemporaryDirectory() as tmp, isolated_config(tmp, 'binary'), quiet():
+        reciter = new_reciter(TODAY)
+        reciter.all_words = [Word("apple", "苹果", next_review_date=TODAY, example="An apple._一个苹果。"),
+                             Word("pear", "梨", next_review_date=TODAY + timedelta(days=3))]
+        reciter._save_data()
+        reciter.close()
+
+        reciter = new_reciter(TODAY)
+        due = reciter._get_today_review_list()
+        assert [word.english for word in due] == ['apple'] and due[0].example == "An apple._一个苹果。"
+        due[0].review_count += 1
+        reciter._record_word(due[0])
+        reciter.close()
+
+        reciter = new_reciter(TODAY)
+        assert [(w.english, w.review_count) for w in reciter.all_words] == [('apple', 1), ('pear', 0)]
+        reciter.close()
+    print("✅ 二进制后端测试完成！")
+
+
+def test_open_speed():
+    """测试打开快照后查询今日复习队列不需要解码全部单词"""
+    print("🧪 测试快照打开速度...")
+    all_words, mastered_words = make_deck(100000, TODAY)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.bin')
+        write_snapshot(path, all_words, mastered_words)
+        storage = BinaryStorage(path)
+        start = time.perf_counter()
+        due = storage.load_due(TODAY)
+        counts = storage.counts()
+        seconds = time.perf_counter() - start
+        storage.close()
+    assert counts == (len(all_words), len(mastered_words)) and due
+    assert seconds < 0.5, seconds
+    print(f"✅ 快照打开速度测试完成！10万个单词打开并查询 {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_queries_match_sqlite()
+    test_compaction_keeps_examples()
+    test_reciter_backend()
+    test_open_speed()
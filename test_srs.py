@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""测试复习间隔算法的脚本"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from reciter import Word
+from srs import (EbbinghausAlgorithm, FSRSAlgorithm, SM2Algorithm, ScaledAlgorithm, create_algorithm,
+                 match_retention, simulate)
+from storage import SqliteStorage
+
+INTERVALS = [1, 2, 4, 7, 15, 30, 60, 90]
+
+
+def test_ebbinghaus_matches_table():
+    """测试默认算法与原有的间隔表一致"""
+    print("🧪 测试艾宾浩斯间隔表...")
+    algorithm = EbbinghausAlgorithm(INTERVALS)
+    word = Word("apple", "苹果")
+    assert algorithm.current_interval(word) == 0
+    for success_count in range(1, 11):
+        word.success_count = success_count
+        assert algorithm.review(word, True) == INTERVALS[min(success_count - 1, 7)]
+    assert algorithm.review(word, False) is None  # 答错保持原复习计划
+    assert word.to_dict().keys() == Word("pear", "梨").to_dict().keys()
+    print("✅ 艾宾浩斯间隔表测试完成！")
+
+
+def test_sm2():
+    """测试SM-2的间隔增长与答错重置"""
+    print("🧪 测试SM-2...")
+    algorithm = SM2Algorithm(INTERVALS)
+    word = Word("apple", "苹果")
+    assert [algorithm.review(word, True) for _ in range(3)] == [1, 6, 15]
+    assert algorithm.review(word, False) == 1
+    assert word.ease < 2.5 and word.interval == 0
+    assert algorithm.review(word, True) == 1
+
+    # 旧数据：由success_count推算当前间隔
+    legacy = Word("pear", "梨", success_count=4)
+    assert algorithm.current_interval(legacy) == 7
+    assert algorithm.review(legacy, True) == round(7 * 2.5)
+    print("✅ SM-2测试完成！")
+
+
+def test_fsrs():
+    """测试FSRS：答对间隔增长、答错稳定性下降，难词间隔增长更慢"""
+    print("🧪 测试FSRS...")
+    algorithm = FSRSAlgorithm(INTERVALS, desired_retention=0.9)
+    easy, hard = Word("apple", "苹果"), Word("pear", "梨")
+    easy_intervals = [algorithm.review(easy, True) for _ in range(4)]
+    assert easy_intervals == sorted(easy_intervals) and easy_intervals[-1] > easy_intervals[0]
+
+    algorithm.review(hard, False)
+    hard_intervals = [algorithm.review(hard, True) for _ in range(4)]
+    assert hard.difficulty > easy.difficulty
+    assert hard_intervals[-1] < easy_intervals[-1]
+
+    stability = easy.stability
+    assert algorithm.review(easy, False) == 1
+    assert easy.stability < stability
+
+    # 过期复习：按距上次复习的实际天数计算记忆保持率，回忆更吃力，稳定性增长更多
+    on_time, overdue = Word("plum", "李子"), Word("kiwi", "猕猴桃")
+    for word in (on_time, overdue):
+        word.stability, word.difficulty, word.interval = 10.0, 5.0, 10
+    today = on_time.review_day
+    overdue.review_day = today - 20
+    assert FSRSAlgorithm.elapsed_days(on_time, today) == 10
+    assert FSRSAlgorithm.elapsed_days(overdue, today) == 30
+    algorithm.review(on_time, True, today)
+    algorithm.review(overdue, True, today)
+    assert overdue.stability > on_time.stability
+
+    # 只读估计与补写记忆状态后的间隔相同，但不修改单词
+    for algorithm in (SM2Algorithm(INTERVALS), FSRSAlgorithm(INTERVALS), ScaledAlgorithm(SM2Algorithm(INTERVALS), 2)):
+        legacy = Word("fig", "无花果", success_count=4)
+        estimate = algorithm.estimated_interval(legacy)
+        assert (legacy.ease, legacy.interval, legacy.stability, legacy.difficulty) == (None,) * 4
+        assert estimate == algorithm.current_interval(legacy)
+
+    # 记忆状态随单词一起保存
+    data = easy.to_dict()
+    restored = Word.from_dict(dict(data))
+    assert (restored.stability, restored.difficulty, restored.interval) == \
+        (easy.stability, easy.difficulty, easy.interval)
+    print("✅ FSRS测试完成！")
+
+
+def test_sqlite_memory_columns():
+    """测试旧版本数据库自动补充记忆状态列，读写与JSON格式一致"""
+    print("🧪 测试记忆状态存储...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'old.db')
+        conn = sqlite3.connect(path)
+        conn.execute('''CREATE TABLE words (key TEXT PRIMARY KEY, english TEXT NOT NULL, chinese TEXT,
+                        success_count INTEGER NOT NULL DEFAULT 0, next_review_date TEXT NOT NULL,
+                        example TEXT, review_round INTEGER NOT NULL DEFAULT 0,
+                        review_count INTEGER NOT NULL DEFAULT 0, mastered INTEGER NOT NULL DEFAULT 0,
+                        position INTEGER NOT NULL)''')
+        conn.execute("INSERT INTO words VALUES ('apple', 'apple', '苹果', 1, '2025-01-01', NULL, 0, 1, 0, 0)")
+        conn.commit()
+        conn.close()
+
+        storage = SqliteStorage(path)
+        row = storage.load()['all_words'][0]
+        assert 'ease' not in row and row['success_count'] == 1
+
+        word = Word.from_dict(row)
+        create_algorithm('sm2', INTERVALS).review(word, True)
+        storage.record(word.to_dict())
+        row = storage.load()['all_words'][0]
+        assert row['ease'] == 2.5 and row['interval'] == 6
+        storage.close()
+    print("✅ 记忆状态存储测试完成！")
+
+
+def test_simulate():
+    """测试离线模拟：同一seed结果可复现，各算法面对同一批单词"""
+    print("🧪 测试离线模拟...")
+    deck = [(0, 0)] * 50 + [(3, 2)] * 20
+    results = {}
+    for name in ('ebbinghaus', 'sm2', 'fsrs'):
+        first = simulate(create_algorithm(name, INTERVALS), deck, 90)
+        again = simulate(create_algorithm(name, INTERVALS), deck, 90)
+        assert first == again
+        assert first['reviews'] > 0 and 0 < first['retention'] < 1
+        results[name] = first
+    # 答错后第二天重新复习的算法，平均保持率高于答错保持原计划的间隔表
+    assert results['fsrs']['retention'] > results['ebbinghaus']['retention']
+    assert simulate(ScaledAlgorithm(create_algorithm('fsrs', INTERVALS), 1.0), deck, 90) == results['fsrs']
+
+    # 间隔按比例缩放到相同的平均保持率后比较复习次数
+    for name in ('ebbinghaus', 'sm2', 'fsrs'):
+        factor, matched = match_retention(create_algorithm(name, INTERVALS), deck, 90, 0.9)
+        assert abs(matched['retention'] - 0.9) < 0.02, (name, factor, matched)
+        assert matched == simulate(ScaledAlgorithm(create_algorithm(name, INTERVALS), factor), deck, 90)
+    print("✅ 离线模拟测试完成！")
+
+
+if __name__ == "__main__":
+    test_ebbinghaus_matches_table()
+    test_sm2()
+    test_fsrs()
+    test_sqlite_memory_columns()
+    test_simulate()
@@ -6,6 +6,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from reciter import WordReciter, Word
+from storage import SqliteStorage
 from datetime import datetime, timedelta
 
 def test_statistics():
@@ -33,9 +34,11 @@ def test_statistics():
     for word in test_words:
         word.next_review_date = today
     
-    # 创建单词背诵器实例
+    # 创建单词背诵器实例（使用内存数据库，不读取本地的学习数据）
     reciter = WordReciter()
+    reciter.storage = SqliteStorage(':memory:')
     reciter.all_words = test_words
+    reciter.mastered_words = []
     
     # 模拟复习过程
     print("\n📚 模拟复习过程...")
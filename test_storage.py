@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""测试快照 + 复习日志存储的脚本"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date
+from storage import JsonStorage, SqliteStorage, migrate_json_to_sqlite
+
+
+def _word(english, success_count=0, next_review_date='2025-01-01', review_round=0):
+    return {
+        'english': english,
+        'chinese': '测试',
+        'success_count': success_count,
+        'next_review_date': next_review_date,
+        'example': None,
+        'review_round': review_round,
+        'review_count': success_count
+    }
+
+
+def test_journal_replay():
+    """测试日志重放与压缩"""
+    print("🧪 测试日志重放...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.json')
+        storage = JsonStorage(path)
+        storage.save_all([_word('apple'), _word('banana')], [])
+
+        # 复习只追加日志，不改写快照
+        storage.record(_word('apple', 1))
+        storage.record(_word('banana', 8), mastered=True)
+        storage.close()
+        with open(path) as f:
+            assert json.load(f)['all_words'][0]['success_count'] == 0
+
+        data = JsonStorage(path).load()
+        assert [w['english'] for w in data['all_words']] == ['apple']
+        assert data['all_words'][0]['success_count'] == 1
+        assert [w['english'] for w in data['mastered_words']] == ['banana']
+
+        # 压缩后日志清空，数据保持一致
+        storage = JsonStorage(path)
+        data = storage.load()
+        storage.save_all(data['all_words'], data['mastered_words'])
+        assert storage.journal_size == 0
+        assert JsonStorage(path).load() == data
+    print("✅ 日志重放测试完成！")
+
+
+def test_torn_journal_and_stale_generation():
+    """测试崩溃后的日志恢复"""
+    print("🧪 测试崩溃恢复...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.json')
+        storage = JsonStorage(path)
+        storage.save_all([_word('apple')], [])
+        storage.record(_word('apple', 1))
+        storage.close()
+
+        # 模拟写了一半的日志记录
+        with open(path + '.journal', 'a') as f:
+            f.write('{"mastered": false, "word": {"engl')
+        storage = JsonStorage(path)
+        assert storage.load()['all_words'][0]['success_count'] == 1
+        storage.record(_word('apple', 2))
+        storage.close()
+        assert JsonStorage(path).load()['all_words'][0]['success_count'] == 2
+
+        # 模拟压缩时快照已替换但日志未清空：旧日志不能覆盖新快照
+        with open(path + '.journal') as f:
+            stale_journal = f.read()
+        storage = JsonStorage(path)
+        storage.load()
+        storage.save_all([_word('apple', 5)], [])
+        with open(path + '.journal', 'w') as f:
+            f.write(stale_journal)
+        assert JsonStorage(path).load()['all_words'][0]['success_count'] == 5
+
+        # 损坏的快照会被备份而不是被覆盖，日志中最近的复习记录原样保留
+        storage = JsonStorage(path)
+        storage.load()
+        storage.record(_word('apple', 6))
+        storage.close()
+        with open(path + '.journal') as f:
+            journal = f.read()
+        with open(path, 'w') as f:
+            f.write('{"all_words": [')
+        try:
+            JsonStorage(path).load()
+            assert False, "应当抛出JSONDecodeError"
+        except json.JSONDecodeError:
+            pass
+        assert os.path.exists(path + '.corrupt')
+        assert not os.path.exists(path + '.journal')
+        with open(path + '.journal.corrupt') as f:
+            assert f.read() == journal
+    print("✅ 崩溃恢复测试完成！")
+
+
+def test_sqlite_due_query():
+    """测试SQLite到期单词查询"""
+    print("🧪 测试SQLite到期查询...")
+    storage = SqliteStorage(':memory:')
+    storage.save_all([
+        _word('apple', 2, '2025-01-01'),
+        _word('banana', 1, '2025-01-03'),
+        _word('orange', 0, '2025-01-02', review_round=1),
+        _word('grape', 1, '2025-01-01'),
+    ], [_word('pear', 8, '2024-12-01')])
+
+    due = storage.load_due(date(2025, 1, 2))
+    assert [w['english'] for w in due] == ['grape', 'apple', 'orange']
+    assert storage.min_round() == 0
+    assert storage.has_round(1) and not storage.has_round(2)
+
+    # 单词转入已掌握列表后排在末尾，并且不再出现在到期查询中
+    storage.record(_word('apple', 8, '2025-01-02'), mastered=True)
+    data = storage.load()
+    assert [w['english'] for w in data['mastered_words']] == ['pear', 'apple']
+    assert [w['english'] for w in data['all_words']] == ['banana', 'orange', 'grape']
+    assert storage.counts() == (3, 2)
+
+    storage.close()
+    print("✅ SQLite到期查询测试完成！")
+
+
+def test_sqlite_lazy_examples():
+    """测试不读取例句时整体保存不会丢失例句"""
+    print("🧪 测试SQLite例句延迟读取...")
+    storage = SqliteStorage(':memory:')
+    apple = dict(_word('apple'), example='An apple a day_一天一苹果')
+    storage.save_all([apple, _word('banana')], [])
+
+    data = storage.load(with_examples=False)
+    assert 'example' not in data['all_words'][0]
+    data['all_words'][0]['success_count'] = 1
+    storage.save_all(data['all_words'][::-1], [])
+    storage.record(data['all_words'][0], mastered=True)
+
+    assert storage.load_example('Apple') == 'An apple a day_一天一苹果'
+    data = storage.load()
+    assert [w['english'] for w in data['all_words']] == ['banana']
+    assert data['mastered_words'][0]['example'] == 'An apple a day_一天一苹果'
+    storage.close()
+    print("✅ SQLite例句延迟读取测试完成！")
+
+
+def test_migrate_json_to_sqlite():
+    """测试JSON数据迁移到SQLite"""
+    print("🧪 测试数据迁移...")
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'data.json')
+        deck_path = os.path.join(tmp, 'words.txt')
+        db_path = os.path.join(tmp, 'data.db')
+        JsonStorage(json_path).save_all([_word('apple', 3)], [])
+        with open(deck_path, 'w') as f:
+            json.dump({'all_words': [_word('Apple'), _word('banana')], 'mastered_words': []}, f)
+
+        assert migrate_json_to_sqlite([json_path, deck_path], db_path) == (2, 0)
+        storage = SqliteStorage(db_path)
+        words = storage.load()['all_words']
+        storage.close()
+        # 重复单词以带学习进度的文件为准
+        assert [(w['english'], w['success_count']) for w in words] == [('apple', 3), ('banana', 0)]
+
+        # 源文件只读：日志中的复习记录参与迁移，但不会为源文件创建或修改日志
+        storage = JsonStorage(json_path)
+        storage.record(_word('cherry', 2))
+        storage.close()
+        before = {name: os.path.getmtime(os.path.join(tmp, name)) for name in os.listdir(tmp)}
+        other_db = os.path.join(tmp, 'other.db')
+        assert migrate_json_to_sqlite([json_path, deck_path], other_db) == (3, 0)
+        os.remove(other_db)
+        assert {name: os.path.getmtime(os.path.join(tmp, name)) for name in os.listdir(tmp)} == before
+
+        # 格式错误的源文件只报告，不改名、不清空日志，也不写入数据库
+        bad_path = os.path.join(tmp, 'bad.json')
+        with open(bad_path, 'w') as f:
+            f.write('{"all_words": [')
+        try:
+            migrate_json_to_sqlite([json_path, bad_path, os.path.join(tmp, 'missing.json')], other_db)
+            assert False, "应当报告无法读取的文件"
+        except ValueError as e:
+            assert 'bad.json' in str(e) and 'missing.json' in str(e)
+        assert sorted(os.listdir(tmp)) == sorted(list(before) + ['bad.json'])
+
+        # 顶层不是对象的JSON文件同样报告为格式错误
+        with open(bad_path, 'w') as f:
+            json.dump([_word('apple')], f)
+        try:
+            migrate_json_to_sqlite([bad_path], other_db)
+            assert False, "应当报告无法读取的文件"
+        except ValueError as e:
+            assert 'bad.json' in str(e)
+    print("✅ 数据迁移测试完成！")
+
+
+if __name__ == "__main__":
+    test_journal_replay()
+    test_torn_journal_and_stale_generation()
+    test_sqlite_due_query()
+    test_sqlite_lazy_examples()
+    test_migrate_json_to_sqlite()
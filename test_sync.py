@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""测试多设备同步学习进度的脚本（两个本地目录模拟两台设备）"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from storage import JsonStorage
+from sync import export_delta, import_delta, merge_files, merge_word, open_local, read_delta, word_hash
+
+
+def _word(english, success_count=0, next_review_date='2025-01-01', review_count=0, example=None):
+    return {'english': english, 'chinese': '测试', 'success_count': success_count,
+            'next_review_date': next_review_date, 'example': example,
+            'review_round': 0, 'review_count': review_count}
+
+
+def _sync(source_dir, target_dir, delta_path, backend='json'):
+    """source导出给target（按对端水位）并合并，返回 (导出的单词数, 合并结果)"""
+    storage, state = open_local(source_dir, backend)
+    _, target_state = open_local(target_dir, backend)
+    target_state.save()  # 对端首次同步前先固定设备编号（相当于在对端运行 status）
+    try:
+        count = export_delta(storage, state, delta_path, peer=target_state.device)
+    finally:
+        storage.close()
+    storage, state = open_local(target_dir, backend)
+    try:
+        return count, import_delta(storage, state, delta_path)
+    finally:
+        storage.close()
+
+
+def _load(directory, backend='json'):
+    storage, _ = open_local(directory, backend)
+    try:
+        return storage.load()
+    finally:
+        storage.close()
+
+
+def _record(directory, word_data, mastered=False, backend='json'):
+    storage, _ = open_local(directory, backend)
+    try:
+        storage.record(word_data, mastered)
+    finally:
+        storage.close()
+
+
+def test_merge_word():
+    """测试合并规则：进度取较大值、日期取较晚的、与合并顺序无关"""
+    print("🧪 测试单词合并规则...")
+    a = (_word('apple', 3, '2025-01-10', 5, example="An apple._一个苹果。"), False, 4, 'aa')
+    b = (_word('apple', 2, '2025-02-01', 7), True, 6, 'bb')
+    merged = merge_word(a, b)
+    assert merged == merge_word(b, a)
+    data, mastered = merged
+    assert (data['success_count'], data['next_review_date'], data['review_count']) == (3, '2025-02-01', 7)
+    assert mastered and data['example'] == "An apple._一个苹果。"
+    assert word_hash({'a': 1, 'b': 2}, False) == word_hash({'b': 2, 'a': 1}, False)
+    print("✅ 单词合并规则测试完成！")
+
+
+def test_two_devices():
+    """测试两台设备互相同步：首次全量，之后只传改动的单词，两边最终一致"""
+    print("🧪 测试两台设备同步...")
+    with tempfile.TemporaryDirectory() as tmp:
+        laptop, desktop = os.path.join(tmp, 'laptop'), os.path.join(tmp, 'desktop')
+        os.makedirs(laptop)
+        os.makedirs(desktop)
+        words = [_word(f"word{i}", i % 4, example=f"Use word{i} here._在这里用单词{i}。") for i in range(3000)]
+        JsonStorage(os.path.join(laptop, 'learning_data.json')).save_all(words, [])
+        delta = os.path.join(tmp, 'sync.delta')
+
+        # 首次同步：笔记本的全部单词传到台式机，台式机回传确认（没有改动的单词）
+        assert _sync(laptop, desktop, delta) == (3000, (3000, 0, 3000))
+        assert _sync(desktop, laptop, delta)[0] == 0
+        assert _load(laptop) == _load(desktop)
+        _, state = open_local(laptop)
+        assert len(state.peers) == 1 and all(info['acked'] for info in state.peers.values())
+
+        # 两边各复习了一些单词，其中word5两边都复习过
+        _record(laptop, _word('word5', 2, '2025-01-05', 1, example="Use word5 here._在这里用单词5。"))
+        _record(laptop, _word('word7', 4, '2025-03-01', 3, example="Use word7 here._在这里用单词7。"), mastered=True)
+        _record(desktop, _word('word5', 1, '2025-01-09', 2, example="Use word5 here._在这里用单词5。"))
+        _record(desktop, _word('word9', 2, '2025-01-20', 1, example="Use word9 here._在这里用单词9。"))
+        _record(desktop, _word('fresh', example="A fresh start._新的开始。"))
+
+        count, (received, updated, added) = _sync(laptop, desktop, delta)
+        assert count == 2 and (received, updated, added) == (2, 2, 0)
+        assert os.path.getsize(delta) < 2048
+        count, _ = _sync(desktop, laptop, delta)
+        assert count == 3  # word5（合并后与笔记本不同）、word9、fresh；word7原样收到不发回
+        assert read_delta(delta)['words'][0]['word']['english'] == 'word5'
+
+        laptop_data, desktop_data = _load(laptop), _load(desktop)
+        pending = {w['english']: w for w in laptop_data['all_words']}
+        assert (pending['word5']['success_count'], pending['word5']['next_review_date'],
+                pending['word5']['review_count']) == (2, '2025-01-09', 2)
+        assert [w['english'] for w in laptop_data['mastered_words']] == ['word7']
+        assert 'fresh' in pending and pending['word9']['success_count'] == 2
+        # 台式机合并后word5与笔记本相同：再同步一轮没有单词需要传输，两边数据一致
+        assert _sync(laptop, desktop, delta)[0] == 0
+        assert _sync(desktop, laptop, delta)[0] == 0
+        key = lambda data: {section: sorted(words, key=lambda w: w['english']) for section, words in data.items()}
+        assert key(_load(laptop)) == key(_load(desktop))
+    print("✅ 两台设备同步测试完成！")
+
+
+def test_merge_files():
+    """测试直接合并两个学习数据文件"""
+    print("🧪 测试合并数据文件...")
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b, out = (os.path.join(tmp, name) for name in ('a.json', 'b.json', 'merged.json'))
+        JsonStorage(a).save_all([_word('apple', 1, '2025-01-03'), _word('pear')], [])
+        storage = JsonStorage(b)
+        storage.save_all([_word('apple', 2, '2025-01-02')], [_word('plum', 5)])
+        storage.record(_word('kiwi'))  # 日志中的单词也参与合并
+        storage.close()
+
+        sources = {name: os.path.getmtime(os.path.join(tmp, name)) for name in os.listdir(tmp)}
+        counts = merge_files(a, b, out)
+        # 源文件只读取，日志不会被重放后改写或清空
+        assert {name: os.path.getmtime(os.path.join(tmp, name)) for name in os.listdir(tmp)
+                if not name.startswith('merged')} == sources
+        assert counts == {'merged': 1, 'base_only': 1, 'other_only': 2}
+        data = JsonStorage(out).load()
+        assert [w['english'] for w in data['all_words']] == ['apple', 'pear', 'kiwi']
+        assert data['all_words'][0]['success_count'] == 2 and data['all_words'][0]['next_review_date'] == '2025-01-03'
+        assert [w['english'] for w in data['mastered_words']] == ['plum']
+        with open(out, encoding='utf-8') as f:
+            json.load(f)
+        merge_files(b, a, out)
+        assert sorted(JsonStorage(out).load()['all_words'], key=lambda w: w['english']) == \
+            sorted(data['all_words'], key=lambda w: w['english'])
+    print("✅ 合并数据文件测试完成！")
+
+
+if __name__ == "__main__":
+    test_merge_word()
+    test_two_devices()
+    test_merge_files()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""测试语音朗读引擎的脚本"""
+
+import sys
+import os
+import tempfile
+import time
+import wave
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tts import NullBackend, TTSEngine
+
+
+class SlowBackend(NullBackend):
+    """播放耗时固定的静音后端"""
+
+    def __init__(self, delay=0.2):
+        super().__init__()
+        self.delay = delay
+
+    def play(self, path):
+        time.sleep(self.delay)
+        super().play(path)
+
+
+def test_speak_is_cached():
+    """测试同一句子只合成一次，音频按内容哈希缓存"""
+    print("🧪 测试语音缓存...")
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = NullBackend()
+        engine = TTSEngine(backend, os.path.join(tmp, 'tts_cache'))
+        engine.speak("an apple a day")
+        engine.speak("an apple a day")
+        engine.wait()
+
+        assert backend.rendered == ["an apple a day"]
+        assert len(backend.played) == 2
+        path = engine.audio_path("an apple a day")
+        assert backend.played == [path, path]
+        with wave.open(path) as f:
+            assert f.getnframes() > 0
+
+        # 新的引擎实例直接使用磁盘上的缓存
+        backend2 = NullBackend()
+        engine2 = TTSEngine(backend2, os.path.join(tmp, 'tts_cache'))
+        engine2.speak("an apple a day")
+        engine2.wait()
+        assert backend2.rendered == []
+        engine.close()
+        engine2.close()
+    print("✅ 语音缓存测试完成！")
+
+
+def test_speak_does_not_block():
+    """测试播放在后台进行，speak() 立即返回"""
+    print("🧪 测试非阻塞播放...")
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SlowBackend(delay=0.2)
+        engine = TTSEngine(backend, tmp)
+        start = time.perf_counter()
+        engine.speak("hello world")
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.1, elapsed
+        engine.wait()
+        assert len(backend.played) == 1
+        engine.close()
+    print(f"✅ 非阻塞播放测试完成！speak() 耗时 {elapsed * 1000:.1f}ms")
+
+
+def test_prerender():
+    """测试预先合成的音频不会播放，之后朗读直接命中缓存"""
+    print("🧪 测试预先合成...")
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = NullBackend()
+        engine = TTSEngine(backend, tmp)
+        engine.prerender(["first sentence", "second sentence", "first sentence", ""])
+        engine.wait()
+        assert backend.rendered == ["first sentence", "second sentence"]
+        assert backend.played == []
+
+        engine.speak("second sentence")
+        engine.wait()
+        assert backend.rendered == ["first sentence", "second sentence"]
+        assert backend.played == [engine.audio_path("second sentence")]
+        engine.close()
+    print("✅ 预先合成测试完成！")
+
+
+def test_close_waits_for_render():
+    """测试 close() 等待正在进行的合成结束，之后不再写入缓存目录"""
+    print("🧪 测试关闭引擎...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, 'tts_cache')
+        backend = SlowBackend(delay=0.2)
+        engine = TTSEngine(backend, cache_dir)
+        engine.speak("still playing")
+        engine.speak("never started")
+        time.sleep(0.05)
+        engine.close()
+        assert backend.rendered == ["still playing"]
+        assert len(backend.played) == 1
+        assert os.listdir(cache_dir) == [os.path.basename(engine.audio_path("still playing"))]
+
+        # 关闭时丢弃的预合成请求，重新打开后可以再次提交
+        engine.speak("busy")
+        time.sleep(0.05)
+        engine.prerender(["dropped"])
+        engine.close()
+        engine.prerender(["dropped"])
+        engine.wait()
+        engine.close()
+        assert backend.rendered == ["still playing", "busy", "dropped"]
+    print("✅ 关闭引擎测试完成！")
+
+
+if __name__ == "__main__":
+    test_speak_is_cached()
+    test_speak_does_not_block()
+    test_prerender()
+    test_close_waits_for_render()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""测试单词数据结构的脚本"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from reciter import Word
+from datetime import date
+
+
+def test_round_trip():
+    """测试to_dict/from_dict兼容原有数据格式"""
+    print("🧪 测试单词序列化...")
+    data = {
+        'english': 'apple',
+        'chinese': '苹果',
+        'success_count': 3,
+        'next_review_date': '2025-01-02',
+        'example': 'An apple a day_一天一苹果',
+        'review_round': 1,
+        'review_count': 4
+    }
+    word = Word.from_dict(dict(data))
+    assert word.next_review_date == date(2025, 1, 2)
+    assert word.to_dict() == data
+
+    # 旧版本数据没有复习轮次和复习次数
+    legacy = {k: v for k, v in data.items() if k not in ('review_round', 'review_count')}
+    word = Word.from_dict(legacy)
+    assert word.review_round == 0 and word.review_count == 0
+
+    # 紧凑表示：没有__dict__，日期保存为序数，中文释义被驻留
+    assert not hasattr(word, '__dict__')
+    assert word.review_day == date(2025, 1, 2).toordinal()
+    assert Word('pear', ''.join(['梨'])).chinese is Word('pear', '梨').chinese
+    print("✅ 单词序列化测试完成！")
+
+
+def test_lazy_example():
+    """测试例句延迟加载"""
+    print("🧪 测试例句延迟加载...")
+    calls = []
+
+    def loader(english):
+        calls.append(english)
+        return f"I like {english}_我喜欢{english}"
+
+    word = Word.from_dict({'english': 'tea', 'chinese': '茶', 'success_count': 0,
+                           'next_review_date': '2025-01-01'}, loader)
+    # 未读取例句时序列化不会触发加载，也不会输出空例句
+    assert 'example' not in word.to_dict()
+    assert calls == []
+    assert word.example == "I like tea_我喜欢tea"
+    assert word.example == "I like tea_我喜欢tea"
+    assert calls == ['tea']
+    assert word.to_dict()['example'] == "I like tea_我喜欢tea"
+    print("✅ 例句延迟加载测试完成！")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_lazy_example()
@@ -0,0 +1,174 @@
+"""语音朗读：可替换的TTS后端 + 按内容哈希缓存的音频 + 后台播放线程"""
+
+import hashlib
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import wave
+
+
+class NullBackend:
+    """静音后端：写入一段静音WAV，不实际播放（用于测试或没有可用语音引擎时）"""
+
+    name = 'null'
+    extension = 'wav'
+
+    def __init__(self):
+        self.rendered = []
+        self.played = []
+
+    def render(self, text, path):
+        with wave.open(path, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(8000)
+            f.writeframes(b'\x00\x00' * 800)
+        self.rendered.append(text)
+
+    def play(self, path):
+        self.played.append(path)
+
+
+class SayBackend:
+    """macOS 自带的 say 命令"""
+
+    name = 'say'
+    extension = 'aiff'
+
+    def render(self, text, path):
+        subprocess.run(['say', '-o', path, text], check=True)
+
+    def play(self, path):
+        subprocess.run(['afplay', path], check=True)
+
+
+class EspeakBackend:
+    """Linux 下的 espeak-ng / espeak，播放使用 paplay / aplay / afplay 中可用的一个"""
+
+    name = 'espeak'
+    extension = 'wav'
+
+    def __init__(self):
+        self.command = shutil.which('espeak-ng') or shutil.which('espeak')
+        self.player = next((p for p in ('paplay', 'aplay', 'afplay') if shutil.which(p)), None)
+
+    def render(self, text, path):
+        subprocess.run([self.command, '-v', 'en', '-w', path, text], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def play(self, path):
+        if self.player:
+            subprocess.run([self.player, path], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def create_backend(name='auto'):
+    """按名称创建后端；auto 依次尝试 say、espeak，都不可用时使用静音后端"""
+    if name == 'say' or (name == 'auto' and sys.platform == 'darwin' and shutil.which('say')):
+        return SayBackend()
+    if name == 'espeak' or (name == 'auto' and (shutil.which('espeak-ng') or shutil.which('espeak'))):
+        return EspeakBackend()
+    return NullBackend()
+
+
+class TTSEngine:
+    """非阻塞的语音朗读
+
+    - speak() 只把请求放入队列，由后台线程合成并播放，输入不会被阻塞
+    - 合成结果按 (后端, 文本) 的哈希缓存在磁盘上，同一句子只合成一次
+    - prerender() 提前为即将复习的例句合成音频，优先级低于播放
+    """
+
+    PLAY, PRERENDER = 0, 1  # 队列优先级：播放优先
+
+    def __init__(self, backend, cache_dir):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self._queue = queue.PriorityQueue()
+        self._seq = 0  # 同优先级按提交顺序处理
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pending_prerender = set()  # 已提交、尚未合成完的预合成文本（与队列一起由_lock保护）
+
+    def audio_path(self, text):
+        """文本对应的缓存音频文件"""
+        digest = hashlib.sha1(f"{self.backend.name}\0{text}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.{self.backend.extension}")
+
+    def render(self, text):
+        """合成音频（已缓存时直接返回），返回音频文件路径"""
+        path = self.audio_path(text)
+        if not os.path.exists(path):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp.{self.backend.extension}"
+            self.backend.render(text, tmp_path)
+            os.replace(tmp_path, path)
+        return path
+
+    def _submit(self, priority, text):
+        with self._lock:
+            self._enqueue(priority, text)
+
+    def _enqueue(self, priority, text):
+        """放入队列，需持有_lock"""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='tts', daemon=True)
+            self._worker.start()
+        self._seq += 1
+        self._queue.put((priority, self._seq, text))
+
+    def speak(self, text):
+        """在后台合成并播放，立即返回"""
+        if text:
+            self._submit(self.PLAY, text)
+
+    def prerender(self, texts):
+        """在后台提前合成音频（不播放）"""
+        for text in texts:
+            if not text or os.path.exists(self.audio_path(text)):
+                continue
+            with self._lock:
+                if text not in self._pending_prerender:
+                    self._pending_prerender.add(text)
+                    self._enqueue(self.PRERENDER, text)
+
+    def _run(self):
+        while True:
+            priority, _, text = self._queue.get()
+            try:
+                if text is None:
+                    return
+                path = self.render(text)
+                if priority == self.PLAY:
+                    self.backend.play(path)
+            except Exception as e:
+                print(f"⚠️ 语音生成过程中发生错误: {str(e)}")
+            finally:
+                with self._lock:
+                    self._pending_prerender.discard(text)
+                self._queue.task_done()
+
+    def wait(self):
+        """等待队列中的请求全部完成（测试用）"""
+        if self._worker is not None:
+            self._queue.join()
+
+    def close(self):
+        """丢弃尚未开始的请求，等待正在进行的合成结束后停止后台线程"""
+        with self._lock:
+            worker = self._worker
+            if worker is None:
+                return
+            while True:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    break
+            self._pending_prerender.clear()  # 丢弃的请求不再等待合成
+            self._queue.put((-1, 0, None))
+            self._worker = None
+        worker.join()